@@ -0,0 +1,58 @@
+"""
+Benchmark of the conversion of MongoDB documents to JSON objects (see DAO.to_json). Compares the former round trip
+via json_util.dumps and json.loads with the single-pass converter in src/util/converter.py on a large list of
+populated tasks, i.e., the payload of /tasks/ofuser/<id>.
+
+Run from the backend folder with
+
+> python -m benchmark.bench_to_json [number of tasks]
+
+or directly as a script (e.g., python benchmark/bench_to_json.py from the backend folder or the repository root).
+"""
+
+import os
+import json
+import sys
+import timeit
+from datetime import datetime
+
+from bson import json_util
+from bson.objectid import ObjectId
+
+# make the src package importable when the file is run as a script, which puts only the benchmark folder on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.util.converter import toJson
+
+def make_task(todos: int = 10):
+    """Create a populated task document as it is returned by TaskController.populate_task (before conversion)."""
+    return {
+        '_id': ObjectId(),
+        'title': 'Introduction to software testing',
+        'description': '(add a description here)',
+        'startdate': datetime.today(),
+        'duedate': datetime.today(),
+        'categories': ['testing', 'education'],
+        'requires': [ObjectId(), ObjectId()],
+        'video': {'_id': ObjectId(), 'url': 'dQw4w9WgXcQ'},
+        'todos': [{'_id': ObjectId(), 'description': f'Todo item {i}', 'done': i % 2 == 0} for i in range(todos)]
+    }
+
+def roundtrip(tasks):
+    return [json.loads(json_util.dumps(task)) for task in tasks]
+
+def singlepass(tasks):
+    return [toJson(task) for task in tasks]
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    tasks = [make_task() for _ in range(n)]
+    assert roundtrip(tasks) == singlepass(tasks)
+
+    repetitions = 10
+    before = min(timeit.repeat(lambda: roundtrip(tasks), number=1, repeat=repetitions))
+    after = min(timeit.repeat(lambda: singlepass(tasks), number=1, repeat=repetitions))
+
+    print(f'{n} populated tasks, best of {repetitions} runs')
+    print(f'json_util.dumps + json.loads: {before * 1000:8.2f} ms')
+    print(f'toJson (single pass):         {after * 1000:8.2f} ms')
+    print(f'speedup:                      {before / after:8.2f}x')
@@ -0,0 +1,17 @@
+import pytest
+
+from src.util.querybudget import register, queryBudget
+
+# record the database commands of all clients (which are created lazily, i.e., after the collection of the tests)
+register()
+
+@pytest.fixture
+def query_budget():
+    """Fixture providing query budgets, which fail a test if the code executed within them issues more database
+    commands than allowed (see src.util.querybudget), e.g.:
+
+        def test_get(query_budget):
+            with query_budget(1, explain=True):
+                controller.get(id)
+    """
+    return queryBudget
@@ -0,0 +1,58 @@
+# coding=utf-8
+# configuration of the pre-fork production server (see https://docs.gunicorn.org/en/stable/settings.html), which is
+# started with: gunicorn --config gunicorn.conf.py wsgi:app
+import os
+
+from dotenv import load_dotenv
+load_dotenv()
+
+def cores():
+    """Number of cores available to this process (respecting the CPU set of a container)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+# listen on the same address as the development server (see main.py)
+bind = f'{os.environ.get("FLASK_BIND_IP", "0.0.0.0")}:{os.environ.get("PORT", "5000")}'
+
+# one worker process per core, each serving GUNICORN_THREADS requests concurrently (gthread), or many concurrent
+# requests with a cooperative worker class (gevent, which has to be installed separately)
+workers = int(os.environ.get('GUNICORN_WORKERS', os.environ.get('WEB_CONCURRENCY', cores())))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# load the app once in the master process: creating the app does not connect to the database, and every worker
+# connects with a MongoClient of its own after the fork (see src.util.clients.resetClient)
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# finish the requests in progress before a worker exits (e.g., on SIGTERM of the container)
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# restart the workers from time to time to contain memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+
+def post_fork(server, worker):
+    # the client inherited from the master process must not be used by the worker
+    from src.util.clients import resetClient
+    resetClient()
+
+def post_worker_init(worker):
+    # optionally connect to the database and bootstrap the collections before the worker accepts requests
+    if os.environ.get('GUNICORN_WARMUP', 'false').lower() == 'true':
+        from src.util.daos import warmup
+        warmup()
+    # continue the background jobs abandoned by exited processes (see src.controllers.jobcontroller)
+    from src.blueprints.userblueprint import jobcontroller
+    jobcontroller.startWorker()
+
+def worker_exit(server, worker):
+    # close the connection pool of the worker
+    from src.util.clients import closeClient
+    closeClient()
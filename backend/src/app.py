@@ -0,0 +1,102 @@
+# coding=utf-8
+import json
+
+from flask import Flask, jsonify, current_app
+from flask_cors import CORS, cross_origin
+
+from src.blueprints.userblueprint import user_blueprint
+from src.blueprints.taskblueprint import task_blueprint
+from src.blueprints.todoblueprint import todo_blueprint
+from src.blueprints.monitorblueprint import monitor_blueprint
+from src.blueprints.batchblueprint import batch_blueprint
+
+from src.controllers.usercontroller import UserController
+from src.controllers.taskcontroller import TaskController
+from src.util.config import getSetting
+from src.util.daos import getDao, warmup
+from src.util.compression import initCompression
+from src.util.jsonprovider import BSONJSONProvider
+from src.util.metrics import initMetrics
+from src.util.slowlog import getSlowLog
+from src.util.profiling import initProfiling
+
+def create_app():
+    """Create and configure the flask app. The configuration is read once while creating the app. Creating the app does
+    not connect to the database: the collections are bootstrapped on the first request that accesses them, or
+    explicitly with the command 'flask warmup' (see src.util.daos.warmup).
+
+    returns:
+        app -- the flask app
+    """
+    app = Flask('todoapp')
+    app.config['VERSION'] = getSetting('VERSION')
+    # serialize MongoDB documents directly (in the same format as DAO.to_json)
+    app.json = BSONJSONProvider(app)
+
+    # configure CORS for cross-origin resource sharing (between the frontend and backend)
+    CORS(app)
+    app.config['CORS_HEADERS'] = 'Content-Type'
+
+    # record the latency and the database commands of the requests per route (see /metrics)
+    initMetrics(app)
+    # record slow database operations (see /admin/slowops)
+    getSlowLog()
+
+    # compress the JSON responses depending on the encodings accepted by the client
+    initCompression(app)
+
+    # profile single requests on demand, if enabled by the configuration
+    initProfiling(app)
+
+    # register blueprints
+    app.register_blueprint(blueprint=user_blueprint, url_prefix='/users')
+    app.register_blueprint(blueprint=task_blueprint, url_prefix='/tasks')
+    app.register_blueprint(blueprint=todo_blueprint, url_prefix='/todos')
+    app.register_blueprint(blueprint=monitor_blueprint)
+    app.register_blueprint(blueprint=batch_blueprint)
+
+    app.add_url_rule('/', view_func=ping)
+    app.add_url_rule('/populate', view_func=populate, methods=['POST'])
+
+    @app.cli.command('warmup')
+    def warmup_command():
+        """Connect to the database and bootstrap all collections."""
+        for collection_name, indexreport in warmup().items():
+            print(f'Bootstrapped collection {collection_name}: {indexreport}')
+
+    return app
+
+# simple heartbeat method to check if the server is running
+@cross_origin()
+def ping():
+    return jsonify({'version': current_app.config['VERSION']}), 200
+
+# simple population method that adds initial data to the database
+@cross_origin()
+def populate():
+    usercontroller = UserController(getDao(collection_name='user'))
+    taskcontroller = TaskController(tasks_dao=getDao(collection_name='task'), videos_dao=getDao(collection_name='video'), todos_dao=getDao(collection_name='todo'), users_dao=getDao(collection_name='user'))
+
+    response = {'users': []}
+    with open(f'./src/static/data/dummy.json', 'r') as f:
+        dummydata = json.load(f)
+
+        for userdata in dummydata:
+            user = usercontroller.create({
+                'firstName': userdata['firstName'],
+                'lastName': userdata['lastName'],
+                'email': userdata['email']
+            })
+
+            for taskdata in userdata['tasks']:
+                taskcontroller.create({
+                    'userid': user['_id']['$oid'],
+                    'title': taskdata['title'],
+                    'description': taskdata['description'],
+                    'url': taskdata['url'],
+                    'todos': taskdata['todos']
+                })
+
+            response['users'].append(user['_id']['$oid'])
+
+    return jsonify(response), 200
@@ -0,0 +1,190 @@
+from flask import Blueprint, jsonify, abort, request
+from flask_cors import cross_origin
+
+import json
+
+from bson.errors import InvalidId
+from pymongo.errors import WriteError
+
+from src.controllers.usercontroller import UserController
+from src.controllers.taskcontroller import TaskController
+from src.controllers.todocontroller import TodoController
+from src.util.config import getSetting
+from src.util.daos import getDao
+from src.util.pagination import MAX_LIMIT, getDone as parseDone
+usercontroller = UserController(getDao(collection_name='user'))
+taskcontroller = TaskController(tasks_dao=getDao(collection_name='task'), videos_dao=getDao(collection_name='video'), todos_dao=getDao(collection_name='todo'), users_dao=getDao(collection_name='user'))
+todocontroller = TodoController(todo_dao=getDao(collection_name='todo'), tasks_dao=getDao(collection_name='task'))
+
+# registry of the operations which can be executed in a batch, by name (e.g., 'todo.update')
+OPERATIONS = {}
+
+# the json types of the fields of the operations
+FIELD_TYPES = {'id': str, 'taskid': str, 'data': dict, 'ids': list, 'done': (bool, str)}
+
+class InvalidOperation(Exception):
+    """Raised by an operation whose fields are invalid, the message is returned to the client."""
+
+def operation(name: str, fields: list):
+    """Register a function as a batch operation.
+
+    parameters:
+        name -- the name of the operation
+        fields -- the fields which every operation of this kind must contain (e.g., ['id', 'data'])
+    """
+    def register(func):
+        OPERATIONS[name] = (func, fields)
+        return func
+    return register
+
+def getIds(op: dict):
+    ids = op['ids']
+    if not isinstance(ids, list) or len(ids) > MAX_LIMIT or not all(isinstance(id, str) for id in ids):
+        raise InvalidOperation(f'Error: at most {MAX_LIMIT} ids must be given as a list')
+    return ids
+
+def getDone(op: dict):
+    # the same flag as in the form of PUT /todos/oftask/<taskid>/done
+    try:
+        return parseDone(op['done'])
+    except ValueError as e:
+        raise InvalidOperation(str(e))
+
+@operation('user.get', ['id'])
+def get_user(op):
+    return usercontroller.get(op['id'])
+
+@operation('user.update', ['id', 'data'])
+def update_user(op):
+    return usercontroller.update_and_get(op['id'], op['data'])
+
+@operation('task.get', ['id'])
+def get_task(op):
+    return taskcontroller.get(op['id'])
+
+@operation('task.getmany', ['ids'])
+def get_tasks(op):
+    return taskcontroller.get_many(getIds(op))
+
+@operation('task.ofuser', ['id'])
+def get_tasks_of_user(op):
+    return taskcontroller.get_tasks_of_user(op['id'])
+
+@operation('task.update', ['id', 'data'])
+def update_task(op):
+    return taskcontroller.update_and_get(op['id'], op['data'])
+
+@operation('task.delete', ['id'])
+def delete_task(op):
+    return {'success': taskcontroller.delete(op['id'])}
+
+@operation('todo.create', ['data'])
+def create_todo(op):
+    if not isinstance(op['data'].get('taskid', ''), str):
+        raise InvalidOperation('Error: invalid id')
+    # None if there is no task with the given taskid
+    return todocontroller.create(dict(op['data']))
+
+@operation('todo.get', ['id'])
+def get_todo(op):
+    return todocontroller.get(op['id'])
+
+@operation('todo.getmany', ['ids'])
+def get_todos(op):
+    return todocontroller.get_many(getIds(op))
+
+@operation('todo.update', ['id', 'data'])
+def update_todo(op):
+    return todocontroller.update_and_get(op['id'], op['data'])
+
+@operation('todo.delete', ['id'])
+def delete_todo(op):
+    todocontroller.delete(op['id'])
+    return {'id': op['id']}
+
+@operation('todo.setdone', ['taskid', 'done'])
+def set_done(op):
+    n = todocontroller.set_done(op['taskid'], getDone(op), ids=getIds(op) if 'ids' in op else None)
+    return None if n is None else {'modified': n}
+
+@operation('todo.clearcompleted', ['taskid'])
+def clear_completed(op):
+    n = todocontroller.clear_completed(op['taskid'])
+    return None if n is None else {'deleted': n}
+
+@operation('todo.reorder', ['taskid', 'ids'])
+def reorder_todos(op):
+    try:
+        reordered = todocontroller.reorder(op['taskid'], getIds(op))
+    except ValueError:
+        raise InvalidOperation('Error: the ids must be distinct valid ids')
+    if not reordered:
+        raise InvalidOperation('Error: the ids do not match the todos of the task')
+    return {'success': True}
+
+def execute(op):
+    """Execute one operation of a batch.
+
+    parameters:
+        op -- dict containing the name of the operation under 'op' and its fields (e.g., {'op': 'todo.get', 'id': ...})
+
+    returns:
+        result -- dict containing the HTTP status code of the operation under 'status' and either its result under
+            'data' or an error message under 'error'
+    """
+    if not isinstance(op, dict) or op.get('op') not in OPERATIONS:
+        return {'status': 400, 'error': 'Unknown operation'}
+    func, fields = OPERATIONS[op['op']]
+    missing = [field for field in fields if field not in op]
+    if len(missing) > 0:
+        return {'status': 400, 'error': f'Missing fields: {", ".join(missing)}'}
+    invalid = [field for field in fields if not isinstance(op[field], FIELD_TYPES[field])]
+    if len(invalid) > 0:
+        return {'status': 400, 'error': f'Invalid fields: {", ".join(invalid)}'}
+
+    try:
+        data = func(op)
+        if data is None:
+            return {'status': 404, 'error': 'Not found'}
+        return {'status': 200, 'data': data}
+    except WriteError as e:
+        return {'status': 400, 'error': 'Invalid input data'}
+    except InvalidId as e:
+        return {'status': 400, 'error': 'Error: invalid id'}
+    except InvalidOperation as e:
+        return {'status': 400, 'error': str(e)}
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        return {'status': 500, 'error': 'Unknown server error'}
+
+# instantiate the flask blueprint
+batch_blueprint = Blueprint('batch_blueprint', __name__)
+
+# execute a list of operations on users, tasks, and todos in one request
+@batch_blueprint.route('/batch', methods=['POST'])
+@cross_origin()
+def batch():
+    # the operations are sent either as json body or as json string in the form field 'operations' (which, unlike a
+    # json body, does not require a CORS preflight request)
+    body = request.get_json(silent=True)
+    try:
+        if body is None:
+            body = {'operations': json.loads(request.form['operations']), 'stopOnError': request.form.get('stopOnError') == 'true'}
+        elif isinstance(body, list):
+            body = {'operations': body}
+        operations = body['operations']
+    except (KeyError, ValueError, TypeError) as e:
+        abort(400, 'Invalid batch')
+
+    maxoperations = int(getSetting('BATCH_MAX_OPERATIONS', 100))
+    if not isinstance(operations, list) or len(operations) > maxoperations:
+        abort(400, f'A batch must be a list of at most {maxoperations} operations')
+
+    # the operations are executed in order, such that later operations observe the effects of earlier ones
+    results = []
+    for op in operations:
+        result = execute(op)
+        results.append(result)
+        if body.get('stopOnError') and result['status'] >= 400:
+            break
+    return jsonify({'results': results}), 200
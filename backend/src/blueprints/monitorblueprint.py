@@ -0,0 +1,51 @@
+import pymongo
+from flask import Blueprint, Response, jsonify, request, abort
+
+from src.util.clients import getClient
+from src.util.config import getSetting
+from src.util.metrics import getMetrics
+from src.util.slowlog import getSlowLog
+
+# instantiate the flask blueprint
+monitor_blueprint = Blueprint('monitor_blueprint', __name__)
+
+# expose the metrics of this process in the text format of Prometheus
+@monitor_blueprint.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(getMetrics().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# readiness check, which succeeds only if the database is reachable
+@monitor_blueprint.route('/ready', methods=['GET'])
+def ready():
+    try:
+        # fail fast instead of waiting for the server selection timeout of the client
+        with pymongo.timeout(float(getSetting('READY_TIMEOUT', 2))):
+            getClient().admin.command('ping')
+        return jsonify({'ready': True}), 200
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        return jsonify({'ready': False, 'error': e.__class__.__name__}), 503
+
+# list the slowest database operations of this process (and their query shapes), or clear the list
+@monitor_blueprint.route('/admin/slowops', methods=['GET', 'DELETE'])
+def slowops():
+    # the requests have to present the admin token, hence the endpoint is disabled unless a token is configured
+    token = getSetting('ADMIN_TOKEN')
+    if token is None or request.headers.get('X-Admin-Token') != token:
+        abort(403, 'Invalid admin token')
+
+    slowlog = getSlowLog()
+    if request.method == 'DELETE':
+        slowlog.clear()
+        return jsonify({'cleared': True}), 200
+
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        abort(400, 'Invalid limit')
+    return jsonify({
+        'thresholdMs': slowlog.threshold,
+        'recorded': slowlog.count,
+        'shapes': slowlog.getShapes()[:limit],
+        'operations': slowlog.getEntries()[:limit]
+    }), 200
@@ -2,11 +2,16 @@ from flask import Blueprint, jsonify, abort, request
 from flask_cors import cross_origin
 
 from pymongo.errors import WriteError
+from werkzeug.exceptions import HTTPException
 import json
 
 #import src.controllers.taskcontroller as controller
 from src.controllers.taskcontroller import TaskController
 from src.util.daos import getDao
+from src.util.pagination import getPagination, getIds
+from src.util.streaming import wantsStream, ndjsonResponse
+from src.util.etags import computeETag, notModified, withETag
+from src.util.jsonprovider import acceptsBSON
 controller = TaskController(tasks_dao=getDao(collection_name='task'), videos_dao=getDao(collection_name='video'), todos_dao=getDao(collection_name='todo'), users_dao=getDao(collection_name='user'))
 
 # instantiate the flask blueprint
@@ -24,9 +29,17 @@ def create():
             if key in data and isinstance(data[key], list):
                 data[key] = data[key][0]
 
+        # the full list of tasks of the user is only returned on request (all=true), otherwise only the new task
+        full = data.pop('all', [request.args.get('all', 'false')])[0].lower() == 'true'
+
         taskid = controller.create(data)
-        tasks = controller.get_tasks_of_user(userid)
-        return jsonify(tasks), 200
+        if taskid is None:
+            abort(404, 'User not found')
+        if full:
+            return jsonify(controller.get_tasks_of_user(userid)), 200
+        return jsonify(controller.get(taskid)), 200
+    except HTTPException:
+        raise
     except WriteError as e:
         abort(400, 'Invalid input data')
     except Exception as e:
@@ -39,13 +52,18 @@ def create():
 def get(id):
     try:
         if request.method == 'GET':
-            task = controller.get(id)
-            return jsonify(task), 200
+            # the entity tag is derived from the versions of the task and its references in the populated task itself
+            task = controller.get(id, raw=acceptsBSON())
+            etag = computeETag([task] if task is not None else [], request)
+            response = notModified(request, etag)
+            if response is None:
+                response = jsonify(task)
+            return withETag(response, etag)
         elif request.method == 'PUT':
             data = request.form.to_dict(flat=True)['data']
             data = json.loads(data.replace("'", "\""))
 
-            task = controller.update(id, data)
+            task = controller.update_and_get(id, data)
             return jsonify(task), 200
         elif request.method == 'DELETE':
             result = controller.delete(id=id)
@@ -59,8 +77,44 @@ def get(id):
 @cross_origin()
 def get_tasks_of_user(id):
     try:
-        tasks = controller.get_tasks_of_user(id)
+        pagination = getPagination(request.args)
+    except ValueError as e:
+        abort(400, str(e))
+
+    try:
+        if pagination is not None:
+            # the entity tag of a page only depends on the versions of the objects of the page
+            limit, after = pagination
+            etag = computeETag(controller.get_tasks_of_user_page_versions(id, limit=limit, after=after), request)
+            response = notModified(request, etag)
+            if response is None:
+                response = jsonify(controller.get_tasks_of_user_page(id, limit=limit, after=after, raw=acceptsBSON()))
+            return withETag(response, etag)
+        elif wantsStream(request):
+            # streamed responses are not tagged, such that the first object is sent without reading all versions first
+            return ndjsonResponse(controller.get_tasks_of_user_iter(id, raw=acceptsBSON()))
+
+        # answer conditional requests based on the versions of the tasks and their references before populating them
+        etag = computeETag(controller.get_tasks_of_user_versions(id), request)
+        response = notModified(request, etag)
+        if response is None:
+            response = jsonify(controller.get_tasks_of_user(id, raw=acceptsBSON()))
+        return withETag(response, etag)
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        abort(500, 'Unknown server error')
+# obtain multiple populated tasks by their ids (e.g., /tasks/byids?ids=a,b,c) with one database operation
+@task_blueprint.route('/byids', methods=['GET'])
+@cross_origin()
+def get_tasks_by_ids():
+    try:
+        ids = getIds(request.args)
+    except ValueError as e:
+        abort(400, str(e))
+
+    try:
+        tasks = controller.get_many(ids, raw=acceptsBSON())
         return jsonify(tasks), 200
     except Exception as e:
         print(f'{e.__class__.__name__}: {e}')
-        abort(500, 'Unknown server error')
\ No newline at end of file
+        abort(500, 'Unknown server error')
@@ -3,10 +3,15 @@ from flask_cors import cross_origin
 
 import json
 
+from bson.errors import InvalidId
 from pymongo.errors import WriteError
+from werkzeug.exceptions import HTTPException
 
 from src.controllers.todocontroller import TodoController
 from src.util.daos import getDao
+from src.util.etags import computeETag, notModified, withETag
+from src.util.pagination import getDone, getIds
+from src.util.jsonprovider import acceptsBSON
 controller = TodoController(todo_dao=getDao(collection_name='todo'), tasks_dao=getDao(collection_name='task'))
 
 # instantiate the flask blueprint
@@ -19,7 +24,11 @@ def create():
     try:
         data = request.form.to_dict(flat=True)
         todo = controller.create(data)
+        if todo is None:
+            abort(404, 'Task not found')
         return jsonify(todo), 200
+    except HTTPException:
+        raise
     except WriteError as e:
         abort(400, 'Invalid input data')
     except Exception as e:
@@ -33,14 +42,19 @@ def get_todo(id):
     try:
         # get a specific todo
         if request.method == 'GET':
+            # the entity tag is derived from the version of the returned document, which may be served by the document cache
             todo = controller.get(id)
-            return jsonify(todo), 200
+            etag = computeETag([todo] if todo is not None else [], request)
+            response = notModified(request, etag)
+            if response is None:
+                response = jsonify(todo)
+            return withETag(response, etag)
         # update the todo
         elif request.method == 'PUT':
             data = request.form.to_dict(flat=True)['data']
             data = json.loads(data.replace("'", "\""))
 
-            todo = controller.update(id, data)
+            todo = controller.update_and_get(id, data)
             return jsonify(todo), 200
         # delete an existing todo
         elif request.method == 'DELETE':
@@ -48,4 +62,80 @@ def get_todo(id):
             return jsonify({'id': id}), 200
     except Exception as e:
         print(f'{e.__class__.__name__}: {e}')
-        abort(500, 'Unknown server error')
\ No newline at end of file
+        abort(500, 'Unknown server error')
+# obtain multiple todos by their ids (e.g., /todos/byids?ids=a,b,c) with one database operation
+@todo_blueprint.route('/byids', methods=['GET'])
+@cross_origin()
+def get_todos_by_ids():
+    try:
+        ids = getIds(request.args)
+    except ValueError as e:
+        abort(400, str(e))
+
+    try:
+        todos = controller.get_many(ids, raw=acceptsBSON())
+        return jsonify(todos), 200
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        abort(500, 'Unknown server error')
+
+# mark many (or, without ids, all) todos of a task as done or undone
+@todo_blueprint.route('/oftask/<taskid>/done', methods=['PUT'])
+@cross_origin()
+def set_done(taskid):
+    try:
+        done = getDone(request.form['done'])
+        ids = getIds(request.form) if 'ids' in request.form else None
+    except KeyError as e:
+        abort(400, 'Invalid input data')
+    except ValueError as e:
+        abort(400, str(e))
+
+    try:
+        n = controller.set_done(taskid, done, ids=ids)
+        if n is None:
+            abort(404, 'Task not found')
+        return jsonify({'modified': n}), 200
+    except HTTPException:
+        raise
+    except InvalidId as e:
+        abort(400, 'Error: invalid id')
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        abort(500, 'Unknown server error')
+
+# delete all completed todos of a task
+@todo_blueprint.route('/oftask/<taskid>/completed', methods=['DELETE'])
+@cross_origin()
+def clear_completed(taskid):
+    try:
+        n = controller.clear_completed(taskid)
+        if n is None:
+            abort(404, 'Task not found')
+        return jsonify({'deleted': n}), 200
+    except HTTPException:
+        raise
+    except InvalidId as e:
+        abort(400, 'Error: invalid id')
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        abort(500, 'Unknown server error')
+
+# change the order of the todos of a task (the ids of all its todos in the new order)
+@todo_blueprint.route('/oftask/<taskid>/order', methods=['PUT'])
+@cross_origin()
+def reorder(taskid):
+    ids = [id.strip() for value in request.form.getlist('ids') for id in value.split(',') if id.strip()]
+    try:
+        reordered = controller.reorder(taskid, ids)
+    except ValueError as e:
+        abort(400, str(e))
+    except InvalidId as e:
+        abort(400, 'Error: invalid id')
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        abort(500, 'Unknown server error')
+
+    if not reordered:
+        abort(409, 'The ids do not match the todos of the task')
+    return jsonify({'success': True}), 200
@@ -2,12 +2,19 @@ from flask import Blueprint, jsonify, abort, request
 from flask_cors import cross_origin
 
 from pymongo.errors import WriteError
+from werkzeug.exceptions import HTTPException
 
 from src.util.daos import getDao
+from src.util.pagination import getPagination
+from src.util.streaming import wantsStream, ndjsonResponse
+from src.util.etags import computeETag, notModified, withETag
+from src.util.jsonprovider import acceptsBSON
 from src.controllers.usercontroller import UserController
 from src.controllers.taskcontroller import TaskController
+from src.controllers.jobcontroller import JobController
 controller = UserController(getDao(collection_name='user'))
 taskcontroller = TaskController(tasks_dao=getDao(collection_name='task'), videos_dao=getDao(collection_name='video'), todos_dao=getDao(collection_name='todo'), users_dao=getDao(collection_name='user'))
+jobcontroller = JobController(jobs_dao=getDao(collection_name='job'), users_dao=getDao(collection_name='user'), taskcontroller=taskcontroller)
 
 # instantiate the flask blueprint
 user_blueprint = Blueprint('user_blueprint', __name__)
@@ -34,19 +41,30 @@ def get_user(id):
     try:
         # get a specific user
         if request.method == 'GET':
+            # the entity tag is derived from the version of the returned document, which may be served by the document cache
             user = controller.get(id)
-            return jsonify(user), 200
+            etag = computeETag([user] if user is not None else [], request)
+            response = notModified(request, etag)
+            if response is None:
+                response = jsonify(user)
+            return withETag(response, etag)
         # update the user
         elif request.method == 'PUT':
             data = request.form
-            update_result = controller.update(id, data)
-            user = controller.get(id)
+            user = controller.update_and_get(id, data)
             return jsonify(user), 200
-        # delete a user
+        # delete a user including all tasks, either immediately or in the background (async=true)
         elif request.method == 'DELETE':
-            taskcontroller.delete_of_user(id=id)
-            result = controller.delete(id=id)
-            return jsonify({"success": result}), 200
+            if request.values.get('async', 'false').lower() == 'true':
+                job = jobcontroller.start_user_deletion(id)
+                if job is None:
+                    abort(404, 'User not found')
+                jobid = job['_id']['$oid']
+                return jsonify({'job': jobid}), 202, {'Location': f'/users/jobs/{jobid}'}
+            result = jobcontroller.delete_user(id)
+            return jsonify({"success": result is not None}), 200
+    except HTTPException:
+        raise
     except Exception as e:
         print(f'{e.__class__.__name__}: {e}')
         abort(500, 'Unknown server error')
@@ -56,8 +74,12 @@ def get_user(id):
 @cross_origin()
 def get_user_by_mail(email):
     try:
-        user = controller.get_user_by_email(email)
-        return jsonify(user), 200
+        etag = computeETag(controller.get_versions_by_email(email), request)
+        response = notModified(request, etag)
+        if response is None:
+            user = controller.get_user_by_email(email)
+            response = jsonify(user)
+        return withETag(response, etag)
     except Exception as e:
         print(f'{e.__class__.__name__}: {e}')
         abort(500, 'Unknown server error')
@@ -67,8 +89,40 @@ def get_user_by_mail(email):
 @cross_origin()
 def get_users():
     try:
-        users = controller.get_all()
-        return jsonify(users), 200
+        pagination = getPagination(request.args)
+    except ValueError as e:
+        abort(400, str(e))
+
+    try:
+        if pagination is not None:
+            # the entity tag of a page only depends on the versions of the objects of the page
+            limit, after = pagination
+            etag = computeETag(controller.get_page_versions(limit=limit, after=after), request)
+            response = notModified(request, etag)
+            if response is None:
+                response = jsonify(controller.get_page(limit=limit, after=after, raw=acceptsBSON()))
+            return withETag(response, etag)
+        elif wantsStream(request):
+            # streamed responses are not tagged, such that the first object is sent without reading all versions first
+            return ndjsonResponse(controller.get_all_iter(raw=acceptsBSON()))
+
+        etag = computeETag(controller.get_all_versions(), request)
+        response = notModified(request, etag)
+        if response is None:
+            response = jsonify(controller.get_all(raw=acceptsBSON()))
+        return withETag(response, etag)
     except Exception as e:
         print(f'{e.__class__.__name__}: {e}')
-        abort(500, 'Unknown server error')
\ No newline at end of file
+        abort(500, 'Unknown server error')
+# obtain the status and progress of a background job (e.g., the deletion of a user)
+@user_blueprint.route('/jobs/<jobid>', methods=['GET'])
+@cross_origin()
+def get_job(jobid):
+    try:
+        job = jobcontroller.get(jobid)
+    except Exception as e:
+        print(f'{e.__class__.__name__}: {e}')
+        abort(500, 'Unknown server error')
+    if job is None:
+        abort(404, 'Job not found')
+    return jsonify(job), 200
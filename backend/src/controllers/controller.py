@@ -1,4 +1,4 @@
-from  src.util.dao import DAO
+from  src.util.dao import DAO, VERSION
 
 class Controller:
     def __init__(self, dao: DAO):
@@ -46,10 +46,47 @@ class Controller:
         except Exception as e:
             raise
 
-    def get_all(self):
+    def get_many(self, ids: list, raw: bool = False):
+        """Search for multiple objects by id with one database operation and return them in the order of the given ids.
+        Ids which are not associated to any object are skipped.
+
+        parameters:
+            ids -- list of unique identifiers of objects
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
+        returns:
+            objects -- list of the objects associated to the given ids
+
+        raises:
+            Exception -- in case the database operation fails, raise an exception
+        """
+        try:
+            objs = self.dao.find(filter={'_id': [{'$oid': id} for id in ids]}, toid=['_id'], raw=raw)
+            return orderByIds(objs, ids, raw)
+        except Exception as e:
+            raise
+
+    def get_all_versions(self):
+        """Obtain the versions of all objects in the respective collection of the database (see DAO.findVersions).
+
+        returns:
+            versions -- list of all objects with only their ids and versions
+
+        raises:
+            Exception -- in case the database operation fails, raise an exception
+        """
+        try:
+            return self.dao.findVersions()
+        except Exception as e:
+            raise
+
+    def get_all(self, raw: bool = False):
         """Gathers all object in the respective collection of the database. The database object will contain
         a unique id, which is accessible at ob['_id']['$oid] in the jsonified form.
-        
+
+        parameters:
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
         returns:
             users -- array of all objects in the respective collection in the database
 
@@ -57,7 +94,63 @@ class Controller:
             Exception -- in case the database operation fails, raise an exception
         """
         try:
-            return self.dao.find()
+            return self.dao.find(raw=raw)
+        except Exception as e:
+            raise
+
+    def get_all_iter(self, raw: bool = False):
+        """Lazily iterate over all objects in the respective collection of the database. In contrast to get_all, the
+        objects are read from the database while iterating, such that they never need to be held in memory at once.
+
+        parameters:
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
+        returns:
+            generator -- yielding all objects in the respective collection in the database
+
+        raises:
+            Exception -- in case the database operation fails, raise an exception
+        """
+        try:
+            return self.dao.findIter(raw=raw)
+        except Exception as e:
+            raise
+
+    def get_page(self, limit: int, after: str = None, raw: bool = False):
+        """Gathers one page of the objects in the respective collection of the database, ordered by their id.
+
+        parameters:
+            limit -- maximum number of objects on the page
+            after -- cursor of the page as returned with the previous page, or None for the first page
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
+        returns:
+            page -- dict containing the list of objects under 'data' and the cursor of the next page under 'next' (None if this is the last page)
+
+        raises:
+            Exception -- in case the database operation fails, raise an exception
+        """
+        try:
+            return self.dao.findPage(limit=limit, after=after, raw=raw)
+        except Exception as e:
+            raise
+
+    def get_page_versions(self, limit: int, after: str = None):
+        """Obtain the versions of the objects of one page (see get_page and DAO.findVersions), including the first object
+        of the next page, which determines the cursor of the page.
+
+        parameters:
+            limit -- maximum number of objects on the page
+            after -- cursor of the page as returned with the previous page, or None for the first page
+
+        returns:
+            versions -- list of at most limit + 1 objects with only their ids and versions
+
+        raises:
+            Exception -- in case the database operation fails, raise an exception
+        """
+        try:
+            return self.dao.findPage(projection={VERSION: 1}, limit=limit + 1, after=after)['data']
         except Exception as e:
             raise
 
@@ -83,6 +176,27 @@ class Controller:
         except Exception as e:
             raise
 
+    def update_and_get(self, id: str, data: dict):
+        """Locates an object in the respective collection of the database, updates it with the given data values
+        and returns the updated object in one database operation.
+
+        parameters:
+            id -- the unique identifier of the object
+            data -- a dict where the top level keys are valid MongoDB update operators (e.g., $set, $push), 
+                and the values of those keys again dicts where the keys are fieldnames and the values the new values.
+
+        returns: 
+            object -- the updated object
+            None -- if no object associated to the given id can be found
+            
+        raises:
+            Exception -- in case the database operation fails, raise an exception
+        """
+        try:
+            return self.dao.findOneAndUpdate(id=id, update_data=data)
+        except Exception as e:
+            raise
+
     def delete(self, id: str):
         """Delete an object from the respective collection of the database
 
@@ -100,4 +214,18 @@ class Controller:
             result = self.dao.delete(id=id)
             return result
         except Exception as e:
-            raise
\ No newline at end of file
+            raise
+
+def orderByIds(objs: list, ids: list, raw: bool = False):
+    """Order database objects by a list of ids (e.g., the ids of a request), skipping ids without object.
+
+    parameters:
+        objs -- list of database objects (in any order)
+        ids -- list of unique identifiers of the objects
+        raw -- if True, the objects are raw MongoDB documents instead of json objects
+
+    returns:
+        objects -- list of the objects in the order of the ids
+    """
+    byid = {(str(obj['_id']) if raw else obj['_id']['$oid']): obj for obj in objs}
+    return [byid[id] for id in ids if id in byid]
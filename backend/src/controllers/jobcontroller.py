@@ -0,0 +1,205 @@
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+
+from bson.objectid import ObjectId
+
+from src.controllers.controller import Controller
+from src.controllers.taskcontroller import TaskController
+from src.util.config import getSetting
+from src.util.dao import DAO
+from src.util.transactions import runInTransaction
+
+class JobController(Controller):
+    def __init__(self, jobs_dao: DAO, users_dao: DAO, taskcontroller: TaskController):
+        """Instantiate a controller of background jobs, which delete users including all their tasks. A job is stored in
+        the job collection (which expires finished jobs, see job.indexes.json) and executed on a background thread,
+        such that its progress can be queried while it runs. A running job holds a lease, which it renews after every
+        batch (see purge). If the process executing a job exits, the job is claimed again by the worker of any process
+        (see recover) once its lease has expired, and continues with the remaining tasks.
+
+        parameters:
+            jobs_dao -- data access object of the job collection
+            users_dao -- data access object of the user collection
+            taskcontroller -- controller of the tasks of the users
+        """
+        super().__init__(dao=jobs_dao)
+        self.users_dao = users_dao
+        self.taskcontroller = taskcontroller
+        self.lock = threading.Lock()
+        # ids of the jobs waiting to be executed by the worker
+        self.jobs = queue.Queue()
+        self.worker = None
+
+    def delete_user(self, id: str):
+        """Delete a user including all tasks, videos, and todos of the user with one delete operation per collection.
+        The deletion is one transaction where the server supports it (see src.util.transactions).
+
+        parameters:
+            id -- the unique identifier of the user
+
+        returns:
+            n -- number of deleted tasks
+            None -- if no user is associated to the given id
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        def write(session):
+            if self.users_dao.findOne(id, projection={'_id': 1}, session=session) is None:
+                return None
+            n = self.taskcontroller.delete_of_user(id, session=session)
+            self.users_dao.delete(id, session=session)
+            return n
+
+        try:
+            return runInTransaction(write)
+        except Exception as e:
+            raise
+
+    def start_user_deletion(self, id: str):
+        """Delete a user in the background: the user is marked as deleted immediately (and hence no longer returned by
+        the UserController), whereas the tasks of the user are deleted in batches by a background worker (see purge).
+        The batch size can be configured via the environment variable PURGE_BATCH_SIZE (default 100 tasks).
+
+        parameters:
+            id -- the unique identifier of the user
+
+        returns:
+            job -- the newly created job
+            None -- if no user is associated to the given id
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            # a user which is already marked as deleted is deleted again (e.g., if the previous job was interrupted)
+            user = self.users_dao.findOneAndUpdate(id, {'$set': {'deleted': now}})
+            if user is None:
+                return None
+
+            job = self.dao.create({
+                'type': 'user.delete',
+                'target': ObjectId(id),
+                'status': 'pending',
+                'created': now,
+                'total': len(user.get('tasks', [])),
+                'deleted': 0
+            })
+            self.jobs.put(job['_id']['$oid'])
+            self.startWorker()
+            return job
+        except Exception as e:
+            raise
+
+    def lease(self):
+        """Return the duration after which the job of a worker which did not renew its lease is considered abandoned, as
+        configured by the environment variable JOB_LEASE_SECONDS (default 60 seconds)."""
+        return timedelta(seconds=float(getSetting('JOB_LEASE_SECONDS', 60)))
+
+    def claimable(self, now: datetime):
+        """Return the filter of the jobs which can be claimed: pending jobs and running jobs whose lease has expired."""
+        return {'$or': [
+            {'status': 'pending'},
+            {'status': 'running', 'heartbeat': {'$lt': now - self.lease()}}
+        ]}
+
+    def recover(self):
+        """Queue the jobs which are pending or whose worker abandoned them (e.g., because its process exited), such that
+        the worker of this process claims and continues them. The worker recovers jobs when it starts and whenever it
+        has been idle for the duration of a lease.
+
+        returns:
+            n -- number of queued jobs
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            jobs = self.dao.find(filter=self.claimable(datetime.now(timezone.utc)), projection={'_id': 1})
+            for job in jobs:
+                self.jobs.put(job['_id']['$oid'])
+            return len(jobs)
+        except Exception as e:
+            raise
+
+    def startWorker(self):
+        if self.worker is None or not self.worker.is_alive():
+            with self.lock:
+                if self.worker is None or not self.worker.is_alive():
+                    self.worker = threading.Thread(target=self.work, name='jobs', daemon=True)
+                    self.worker.start()
+
+    def work(self):
+        """Execute the queued jobs one after another, and recover abandoned jobs while idle (executed on the background
+        thread)."""
+        idle = True
+        while True:
+            if idle:
+                try:
+                    self.recover()
+                except Exception as e:
+                    print(f'{e.__class__.__name__}: {e}')
+            try:
+                jobid = self.jobs.get(timeout=self.lease().total_seconds())
+            except queue.Empty:
+                idle = True
+                continue
+            idle = False
+            try:
+                self.purge(jobid)
+            except Exception as e:
+                print(f'{e.__class__.__name__}: {e}')
+            finally:
+                self.jobs.task_done()
+
+    def purge(self, jobid: str):
+        """Execute a job deleting a user: the tasks of the user are deleted in batches (see TaskController.delete_many),
+        each batch in one transaction together with the removal of its references from the user and the progress of the
+        job, such that an interrupted job continues with the remaining tasks once it is claimed again. Finally, the user
+        is deleted. The job records its progress in the attributes total and deleted, its lease in the attribute
+        heartbeat, and its outcome in status ('done' or 'failed') and error.
+
+        parameters:
+            jobid -- the unique identifier of the job
+
+        returns:
+            True -- if the job was executed
+            False -- if the job cannot be claimed (e.g., already executed, or running with a valid lease)
+
+        raises:
+            Exception -- in case updating the job fails
+        """
+        # claim the job, such that it is executed by one worker at a time
+        now = datetime.now(timezone.utc)
+        if self.dao.update_many([jobid], {'$set': {'status': 'running', 'heartbeat': now}}, filter=self.claimable(now)) == 0:
+            return False
+        job = self.dao.findOne(jobid)
+        userid = job['target']['$oid']
+        batchsize = int(getSetting('PURGE_BATCH_SIZE', 100))
+
+        def purgeBatch(tasks):
+            def write(session):
+                n = self.taskcontroller.delete_many(tasks, session=session)
+                self.users_dao.update(userid, {'$pullAll': {'tasks': self.dao.to_objectids(tasks)}}, session=session)
+                # record the progress and renew the lease of the job
+                self.dao.update(jobid, {'$inc': {'deleted': n}, '$set': {'heartbeat': datetime.now(timezone.utc)}}, session=session)
+                return n
+            return runInTransaction(write)
+
+        try:
+            while True:
+                user = self.users_dao.findOne(userid, projection={'_id': 1, 'tasks': {'$slice': batchsize}})
+                tasks = user.get('tasks', []) if user is not None else []
+                if len(tasks) == 0:
+                    break
+                purgeBatch(tasks)
+
+            if user is not None:
+                self.users_dao.delete(userid)
+            self.dao.update(jobid, {'$set': {'status': 'done', 'finished': datetime.now(timezone.utc)}})
+        except Exception as e:
+            self.dao.update(jobid, {'$set': {'status': 'failed', 'error': f'{e.__class__.__name__}: {e}', 'finished': datetime.now(timezone.utc)}})
+            raise
+        return True
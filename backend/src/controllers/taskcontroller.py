@@ -1,8 +1,11 @@
 from bson.objectid import ObjectId
+from pymongo.errors import WriteError
 from datetime import datetime
 
-from src.controllers.controller import Controller
-from src.util.dao import DAO
+from src.controllers.controller import Controller, orderByIds
+from src.controllers.usercontroller import ACTIVE
+from src.util.dao import DAO, VERSION
+from src.util.transactions import runInTransaction
 
 class TaskController(Controller):
     def __init__(self, tasks_dao: DAO, videos_dao: DAO, todos_dao: DAO, users_dao: DAO):
@@ -12,13 +15,14 @@ class TaskController(Controller):
         self.users_dao = users_dao
 
     def create(self, data: dict):
-        """Create a new task object based on the data contained in the dict. The data must contain at least a userid, a video url and a title. If todos are contained in the data, create todo objects and associate them to the task
+        """Create a new task object based on the data contained in the dict. The data must contain at least a userid, a video url and a title. If todos are contained in the data, create todo objects and associate them to the task. The video, the todos (with one bulk operation), the task, and finally its assignment to the user are written in one multi-document transaction where the server supports it (see src.util.transactions). Without transaction, the objects written so far are deleted again when a later write fails, such that no partially created task remains.
 
         attributes:
             data -- dict containing the data of the new task (at least a title, url, and userid)
 
         returns:
-            task -- newly created task object
+            taskid -- the unique identifier of the newly created task object
+            None -- if no user is associated to the userid or the user is marked as deleted (see src.controllers.jobcontroller)
         
         raises:
             KeyError -- in case an important key is missing in the data dict
@@ -37,42 +41,109 @@ class TaskController(Controller):
             data['startdate'] = datetime.today()
         if 'categories' not in data:
             data['categories'] = []
+        url = data.pop('url')
+        descriptions = data.get('todos', [])
 
-        try:
-            # add the video url
-            video = self.videos_dao.create({'url': data['url']})
-            del data['url']
-            data['video'] = ObjectId(video['_id']['$oid'])
-
-            # create and add todos
-            todos = []
-            for todo in data['todos']:
-                todoobj = self.todos_dao.create({'description': todo, 'done': False})
-                todos.append(ObjectId(todoobj['_id']['$oid']))
-            data['todos'] = todos
-
-            # create the task object and assign it to the user
-            task = self.dao.create(data)
-            self.users_dao.update(
-                uid, {'$push': {'tasks': ObjectId(task['_id']['$oid'])}})
+        def write(session):
+            # the transaction may be retried as a whole, hence every attempt starts from a fresh copy of the data
+            taskid = ObjectId()
+            task = dict(data, _id=taskid)
+
+            # nothing is written for a user which is missing or being deleted
+            user = self.users_dao.findOne(uid, projection={'deleted': 1}, session=session)
+            if user is None or 'deleted' in user:
+                return None
+
+            # the objects written so far, which are removed again if the task cannot be completed without transaction
+            created = []
+            def discard():
+                for dao, ids in reversed(created):
+                    dao.delete_many(ids, session=session)
+
+            try:
+                # add the video url
+                video = self.videos_dao.create({'url': url}, session=session)
+                created.append((self.videos_dao, [video['_id']]))
+                task['video'] = ObjectId(video['_id']['$oid'])
+
+                # create and add todos
+                todos = self.todos_dao.create_many([{'description': todo, 'done': False} for todo in descriptions], session=session)
+                created.append((self.todos_dao, [todoobj['_id'] for todoobj in todos['results'] if todoobj is not None]))
+                if len(todos['errors']) > 0:
+                    error = todos['errors'][0]
+                    raise WriteError(error['message'], error['code'])
+                task['todos'] = [ObjectId(todoobj['_id']['$oid']) for todoobj in todos['results']]
+
+                # create the task object
+                task = self.dao.create(task, session=session)
+                created.append((self.dao, [task['_id']]))
+            except Exception as e:
+                # an aborted transaction discards the writes by itself
+                if session is None:
+                    discard()
+                raise
+
+            # assign the task to the user last, such that a user never references an incomplete task, unless the user has been marked as deleted in the meantime
+            if self.users_dao.update_many([uid], {'$push': {'tasks': taskid}}, filter=ACTIVE, session=session) == 0:
+                discard()
+                return None
             return task['_id']['$oid']
+
+        try:
+            return runInTransaction(write)
         except Exception as e:
             raise
 
-    def get(self, id: str):
+    def get(self, id: str, raw: bool = False):
         try:
-            task = super().get(id)
-            return self.populate_task(task)
+            tasks = self.dao.aggregate([{'$match': {'_id': ObjectId(id)}}] + self.population_stages(), raw=raw)
+            return tasks[0] if len(tasks) > 0 else None
         except Exception as e:
             raise
 
+    def get_many(self, ids: list, raw: bool = False):
+        """Return multiple populated tasks (see get) resolved with one database operation, in the order of the given ids.
+
+        parameters:
+            ids -- list of unique identifiers of tasks
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
+        returns:
+            tasks -- list of the populated tasks associated to the given ids (ids without task are skipped)
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            tasks = self.dao.aggregate([{'$match': {'_id': {'$in': [ObjectId(id) for id in ids]}}}] + self.population_stages(), raw=raw)
+            return orderByIds(tasks, ids, raw)
+        except Exception as e:
+            raise
 
-    def get_tasks_of_user(self, id: str):
-        """Return all task objects that are associated to a specific user.
+    def get_tasks_of_user_versions(self, id: str):
+        """Obtain the versions of all tasks associated to a user and of all objects they are populated with (see version_stages).
 
         attributes:
             id -- the unique identifier of a user object
 
+        returns:
+            versions -- list of tasks with only the ids and versions of themselves and their references
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            return self.users_dao.aggregate(self.tasks_of_user_stages(id) + self.population_stages() + self.version_stages())
+        except Exception as e:
+            raise
+
+    def get_tasks_of_user(self, id: str, raw: bool = False):
+        """Return all task objects that are associated to a specific user. The user, the tasks, and their videos and todos are resolved in one database operation.
+
+        attributes:
+            id -- the unique identifier of a user object
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
         returns:
             tasks -- list of tasks associated to that user
 
@@ -80,16 +151,137 @@ class TaskController(Controller):
             Exception -- in case any database operation fails
         """
         try:
-            user = self.users_dao.findOne(id)
-            tasks = self.dao.find(filter={'_id': user['tasks']}, toid=['_id'])
+            return self.users_dao.aggregate(self.tasks_of_user_stages(id) + self.population_stages(), raw=raw)
+        except Exception as e:
+            raise
+
+    def get_tasks_of_user_iter(self, id: str, raw: bool = False):
+        """Lazily iterate over all task objects that are associated to a specific user. The populated tasks are read from the database in batches while iterating.
+
+        attributes:
+            id -- the unique identifier of a user object
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
+        returns:
+            generator -- yielding the populated tasks associated to that user
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            return self.users_dao.aggregateIter(self.tasks_of_user_stages(id) + self.population_stages(), raw=raw)
+        except Exception as e:
+            raise
+
+    def get_tasks_of_user_page(self, id: str, limit: int, after: str = None, raw: bool = False):
+        """Return one page of the task objects that are associated to a specific user, ordered by their id (see DAO.findPage). Only the tasks of the page are populated.
+
+        attributes:
+            id -- the unique identifier of a user object
+            limit -- maximum number of tasks on the page
+            after -- cursor of the page as returned with the previous page, or None for the first page
+            raw -- if True, return raw MongoDB documents instead of json objects (see DAO.findIter)
+
+        returns:
+            page -- dict containing the list of populated tasks under 'data' and the cursor of the next page under 'next' (None if this is the last page)
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        # fetch one additional task to determine whether there is a next page
+        pipeline = self.tasks_of_user_page_stages(id, limit + 1, after) + self.population_stages()
+
+        try:
+            tasks = self.users_dao.aggregate(pipeline, raw=raw)
+            cursor = None
+            if len(tasks) > limit:
+                cursor = str(tasks[limit - 1]['_id']) if raw else tasks[limit - 1]['_id']['$oid']
+            return {'data': tasks[:limit], 'next': cursor}
+        except Exception as e:
+            raise
 
-            for task in tasks:
-                self.populate_task(task)
+    def get_tasks_of_user_page_versions(self, id: str, limit: int, after: str = None):
+        """Obtain the versions of the tasks of one page (see get_tasks_of_user_page) and of all objects they are populated with (see version_stages), including the first task of the next page, which determines the cursor of the page.
 
-            return tasks
+        attributes:
+            id -- the unique identifier of a user object
+            limit -- maximum number of tasks on the page
+            after -- cursor of the page as returned with the previous page, or None for the first page
+
+        returns:
+            versions -- list of at most limit + 1 tasks with only the ids and versions of themselves and their references
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            return self.users_dao.aggregate(self.tasks_of_user_page_stages(id, limit + 1, after) + self.population_stages() + self.version_stages())
         except Exception as e:
             raise
 
+    def tasks_of_user_page_stages(self, id: str, limit: int, after: str = None):
+        """Aggregation stages on the user collection which replace the user with the given id by at most limit of its (unpopulated) tasks following the cursor after, ordered by their id.
+
+        parameters:
+            id -- the unique identifier of a user object
+            limit -- maximum number of tasks
+            after -- id of the task after which the tasks start, or None
+
+        returns:
+            [stage] -- list of aggregation stages
+        """
+        pipeline = self.tasks_of_user_stages(id)
+        if after is not None:
+            pipeline.append({'$match': {'_id': {'$gt': ObjectId(after)}}})
+        return pipeline + [{'$sort': {'_id': 1}}, {'$limit': limit}]
+
+    def tasks_of_user_stages(self, id: str):
+        """Aggregation stages on the user collection which replace the user with the given id by its (unpopulated) tasks. A user which is marked as deleted (see src.controllers.jobcontroller) has no tasks.
+
+        parameters:
+            id -- the unique identifier of a user object
+
+        returns:
+            [stage] -- list of aggregation stages
+        """
+        return [
+            {'$match': dict(ACTIVE, _id=ObjectId(id))},
+            {'$lookup': {'from': self.dao.collection_name, 'localField': 'tasks', 'foreignField': '_id', 'as': 'task'}},
+            {'$unwind': '$task'},
+            {'$replaceRoot': {'newRoot': '$task'}}
+        ]
+
+    def population_stages(self):
+        """Aggregation stages on tasks which populate each task server-side in the same way as populate_task: the id contained in the video attribute is replaced by the video object (or None), and the todo ids contained in the todos attribute by the todo objects (in the order of the ids).
+
+        returns:
+            [stage] -- list of aggregation stages
+        """
+        return [
+            # $lookup returns the todos in the order of the collection, hence the order of the task is kept aside
+            {'$addFields': {'todoids': {'$ifNull': ['$todos', []]}}},
+            {'$lookup': {'from': self.videos_dao.collection_name, 'localField': 'video', 'foreignField': '_id', 'as': 'video'}},
+            {'$lookup': {'from': self.todos_dao.collection_name, 'localField': 'todos', 'foreignField': '_id', 'as': 'todos'}},
+            {'$addFields': {
+                'video': {'$ifNull': [{'$arrayElemAt': ['$video', 0]}, None]},
+                # the todos in the order of their ids in the task (see TodoController.reorder), skipping missing todos
+                'todos': {'$map': {
+                    'input': {'$filter': {'input': '$todoids', 'as': 'id', 'cond': {'$in': ['$$id', '$todos._id']}}},
+                    'as': 'id',
+                    'in': {'$arrayElemAt': ['$todos', {'$indexOfArray': ['$todos._id', '$$id']}]}
+                }}
+            }},
+            {'$unset': 'todoids'}
+        ]
+
+    def version_stages(self):
+        """Aggregation stages on populated tasks which reduce the tasks and their references to their ids and versions, such that only the versions are transferred.
+
+        returns:
+            [stage] -- list of aggregation stages
+        """
+        return [{'$project': {field: 1 for reference in ['', 'video.', 'todos.'] for field in [f'{reference}_id', f'{reference}{VERSION}']}}]
+
     def populate_task(self, task):
         """Populate a given task object by resolving dependencies: replace the id contained in the video attribute by the actual video object and replace each todo id contained in the todos attribute by all actual todo objects
 
@@ -109,11 +301,12 @@ class TaskController(Controller):
 
         return task
 
-    def delete_of_user(self, id: str):
+    def delete_of_user(self, id: str, session=None):
         """Delete all tasks that are associated to a user with the given ID. This includes each video and all todo items associated to each of the tasks.
         
         parameters:
             id -- the unique identifier of a user object
+            session -- optional pymongo ClientSession, e.g., to delete the tasks as part of a transaction (see src.util.transactions)
             
         returns:
             n -- number of deleted tasks
@@ -122,18 +315,37 @@ class TaskController(Controller):
             Exception -- in case any database operation fails
         """
         try:
-            user = self.users_dao.findOne(id)
+            user = self.users_dao.findOne(id, projection={'tasks': 1}, session=session)
             if 'tasks' in user:
-                tasks = self.dao.find(filter={'_id': user['tasks']}, toid=['_id'])
+                return self.delete_many(user['tasks'], session=session)
+            else:
+                return 0
+        except Exception as e:
+            raise
 
-                for task in tasks:
-                    self.videos_dao.delete(id=task['video']['$oid'])
-                    for todo in task['todos']:
-                        self.todos_dao.delete(id=todo['$oid'])
-                    self.dao.delete(id=task['_id']['$oid'])
+    def delete_many(self, ids: list, session=None):
+        """Delete the tasks with the given ids including their videos and todo items, with one delete operation per collection independent of the number of tasks. The references of users to the tasks are not removed.
 
-                return len(tasks)
-            else:
+        parameters:
+            ids -- list of unique identifiers of tasks (as strings or {'$oid': ...} objects)
+            session -- optional pymongo ClientSession, e.g., to delete the tasks as part of a transaction (see src.util.transactions)
+
+        returns:
+            n -- number of deleted tasks
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            if len(ids) == 0:
                 return 0
+            tasks = self.dao.find(filter={'_id': ids}, toid=['_id'], projection={'video': 1, 'todos': 1}, session=session)
+
+            # collect all dependent ids and delete them with one operation per collection
+            self.videos_dao.delete_many([task['video'] for task in tasks if 'video' in task], session=session)
+            self.todos_dao.delete_many([todo for task in tasks for todo in task.get('todos', [])], session=session)
+            self.dao.delete_many([task['_id'] for task in tasks], session=session)
+
+            return len(tasks)
         except Exception as e:
-            raise
\ No newline at end of file
+            raise
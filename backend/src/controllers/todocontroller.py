@@ -16,6 +16,7 @@ class TodoController(Controller):
 
         returns:
             todo -- created todo object upon success
+            None -- if a taskid is given, but no task is associated to it
         
         raises:
             Exception -- in case any database operation fails
@@ -24,6 +25,8 @@ class TodoController(Controller):
         try:
             if 'taskid' in data:
                 task = self.tasks_dao.findOne(id=data['taskid'])
+                if task is None:
+                    return None
                 del data['taskid']
 
                 if 'done' in data:
@@ -37,4 +40,102 @@ class TodoController(Controller):
             else:
                 return self.dao.create(data)
         except Exception as e:
-            raise
\ No newline at end of file
+            raise
+    def get_todo_ids(self, taskid: str):
+        """Return the ids of the todos of a task (in the order of the task), or None if there is no task with the given id."""
+        task = self.tasks_dao.findOne(id=taskid, projection={'todos': 1})
+        if task is None:
+            return None
+        return [todo['$oid'] for todo in task.get('todos', [])]
+
+    def set_done(self, taskid: str, done: bool, ids: list = None):
+        """Mark many (or all) todos of a task as done or undone with one database operation. Todos which already have
+        the given status are not updated.
+
+        parameters:
+            taskid -- the unique identifier of the task
+            done -- the new status of the todos
+            ids -- optional list of ids of todos of the task (default: all todos of the task), ids of todos of other tasks are ignored
+
+        returns:
+            n -- number of todos whose status changed
+            None -- if there is no task with the given id
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            todos = self.get_todo_ids(taskid)
+            if todos is None:
+                return None
+            if ids is not None:
+                ids = set(ids)
+                todos = [id for id in todos if id in ids]
+
+            n = self.dao.update_many(todos, {'$set': {'done': done}}, filter={'done': {'$ne': done}})
+            return n
+        except Exception as e:
+            raise
+
+    def clear_completed(self, taskid: str):
+        """Delete all todos of a task which are done with one database operation, and remove them from the todos of the
+        task with one more. Only the todos which are still done when they are deleted are deleted and removed.
+
+        parameters:
+            taskid -- the unique identifier of the task
+
+        returns:
+            n -- number of deleted todos
+            None -- if there is no task with the given id
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            todos = self.get_todo_ids(taskid)
+            if todos is None:
+                return None
+            completed = self.dao.find(filter={'_id': [{'$oid': id} for id in todos], 'done': True}, toid=['_id'], projection={'_id': 1})
+            if len(completed) == 0:
+                return 0
+
+            ids = [ObjectId(todo['_id']['$oid']) for todo in completed]
+            # a todo which was marked as undone in the meantime is not deleted
+            n = self.dao.delete_many(ids, filter={'done': True})
+            if n < len(ids):
+                remaining = self.dao.find(filter={'_id': [{'$oid': str(id)} for id in ids]}, toid=['_id'], projection={'_id': 1})
+                remaining = {todo['_id']['$oid'] for todo in remaining}
+                ids = [id for id in ids if str(id) not in remaining]
+            self.tasks_dao.update(id=taskid, update_data={'$pull': {'todos': {'$in': ids}}})
+            return n
+        except Exception as e:
+            raise
+
+    def reorder(self, taskid: str, ids: list):
+        """Change the order of the todos of a task with one database operation. The task is only updated if the given
+        ids are exactly the ids of its todos (in any order), such that concurrent changes of the todos are not lost.
+
+        parameters:
+            taskid -- the unique identifier of the task
+            ids -- the ids of all todos of the task in the new order
+
+        returns:
+            True -- if the todos were reordered
+            False -- if there is no task with the given id or the ids do not match its todos
+
+        raises:
+            ValueError -- in case the ids contain duplicates or invalid ids
+            Exception -- in case any database operation fails
+        """
+        if len(set(ids)) != len(ids) or not all(ObjectId.is_valid(id) for id in ids):
+            raise ValueError('Error: the ids must be distinct valid ids')
+
+        try:
+            if len(ids) == 0:
+                # an empty list only matches a task without todos
+                return self.get_todo_ids(taskid) == []
+            todos = [ObjectId(id) for id in ids]
+            n = self.tasks_dao.update_many([taskid], {'$set': {'todos': todos}}, filter={'todos': {'$all': todos, '$size': len(todos)}})
+            return n == 1
+        except Exception as e:
+            raise
@@ -1,9 +1,12 @@
 from src.controllers.controller import Controller
-from src.util.dao import DAO
+from src.util.dao import DAO, VERSION
 
 import re
 emailValidator = re.compile(r'.*@.*')
 
+# filter excluding the users which are marked as deleted while their deletion is running in the background (see src.controllers.jobcontroller)
+ACTIVE = {'deleted': {'$exists': False}}
+
 class UserController(Controller):
     def __init__(self, dao: DAO):
         super().__init__(dao=dao)
@@ -29,7 +32,8 @@ class UserController(Controller):
             raise ValueError('Error: invalid email address')
 
         try:
-            users = self.dao.find({'email': email})
+            # two matches suffice to detect that the email address is not unique
+            users = self.dao.find(dict(ACTIVE, email=email), limit=2)
             if len(users) == 1:
                 return users[0]
             else:
@@ -38,9 +42,74 @@ class UserController(Controller):
         except Exception as e:
             raise
 
+    def get_versions_by_email(self, email: str):
+        """Obtain the versions of the users associated to the given email address (see DAO.findVersions).
+
+        parameters:
+            email -- an email address string
+
+        returns:
+            versions -- list of (at most two) users with only their ids and versions
+
+        raises:
+            ValueError -- in case the email parameter is not valid
+            Exception -- in case any database operation fails
+        """
+        if not re.fullmatch(emailValidator, email):
+            raise ValueError('Error: invalid email address')
+
+        try:
+            return self.dao.findVersions(dict(ACTIVE, email=email), limit=2)
+        except Exception as e:
+            raise
+
+    def get(self, id: str):
+        """Obtain the user with the given id (see Controller.get), unless the user is marked as deleted."""
+        try:
+            user = super().get(id)
+            return None if user is None or 'deleted' in user else user
+        except Exception as e:
+            raise
+
+    def get_all_versions(self):
+        try:
+            return self.dao.findVersions(filter=ACTIVE)
+        except Exception as e:
+            raise
+
+    def get_all(self, raw: bool = False):
+        try:
+            return self.dao.find(filter=ACTIVE, raw=raw)
+        except Exception as e:
+            raise
+
+    def get_all_iter(self, raw: bool = False):
+        try:
+            return self.dao.findIter(filter=ACTIVE, raw=raw)
+        except Exception as e:
+            raise
+
+    def get_page(self, limit: int, after: str = None, raw: bool = False):
+        try:
+            return self.dao.findPage(filter=ACTIVE, limit=limit, after=after, raw=raw)
+        except Exception as e:
+            raise
+
+    def get_page_versions(self, limit: int, after: str = None):
+        try:
+            return self.dao.findPage(filter=ACTIVE, projection={VERSION: 1}, limit=limit + 1, after=after)['data']
+        except Exception as e:
+            raise
+
     def update(self, id, data):
         try:
             update_result = super().update(id=id, data={'$set': data})
             return update_result
+        except Exception as e:
+            raise
+
+    def update_and_get(self, id, data):
+        try:
+            return super().update_and_get(id=id, data={'$set': data})
         except Exception as e:
             raise
\ No newline at end of file
@@ -0,0 +1,184 @@
+import os
+import copy
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+
+from src.util.config import getSetting
+
+class MemoryCache:
+    def __init__(self, maxsize: int = 1000, ttl: float = 60):
+        """Instantiate an in-process document cache with least-recently-used eviction and a time to live. The cache
+        holds deep copies of the documents, such that callers may modify the returned objects.
+
+        parameters:
+            maxsize -- maximum number of cached documents
+            ttl -- number of seconds after which a cached document expires
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: str):
+        """Return a copy of the cached document of the key, or None if it is not cached (or expired)."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.counters['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, key: str, value: dict):
+        """Cache a copy of the document under the key, evicting the least recently used documents if the cache is full."""
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def delete(self, keys: list):
+        """Remove the documents of the given keys from the cache."""
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Return the hit, miss, and eviction counters as well as the current number of cached documents."""
+        with self.lock:
+            return dict(self.counters, size=len(self.entries), backend='memory')
+
+class SQLiteCache:
+    def __init__(self, path: str, maxsize: int = 1000, ttl: float = 60):
+        """Instantiate a document cache in a local SQLite database, which is shared by all worker processes on the
+        same machine. Hence, a write in one worker invalidates the cached document for all workers. The documents
+        expire after their time to live and are evicted approximately least-recently-used first: a hit does not write
+        to the database, but the access times of the hits of a process are written together with its next insert.
+        Documents are only evicted once the cache holds more than maxsize documents. The hit, miss, and eviction
+        counters are kept per process.
+
+        parameters:
+            path -- the file of the SQLite database
+            maxsize -- maximum number of cached documents
+            ttl -- number of seconds after which a cached document expires
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # the access times of the keys hit since the last insert of this process
+        self.accessed = {}
+
+        with self.connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS documents (key TEXT PRIMARY KEY, value TEXT, expires REAL, accessed REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS documents_accessed ON documents (accessed)')
+
+    def connection(self):
+        """Return the SQLite connection of the current thread (and process)."""
+        if getattr(self.local, 'pid', None) != os.getpid():
+            self.local.connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self.local.connection.execute('PRAGMA journal_mode=WAL')
+            self.local.pid = os.getpid()
+        return self.local.connection
+
+    def count(self, counter: str, n: int = 1):
+        with self.lock:
+            self.counters[counter] += n
+
+    def get(self, key: str):
+        now = time.time()
+        connection = self.connection()
+        row = connection.execute('SELECT value FROM documents WHERE key = ? AND expires > ?', (key, now)).fetchone()
+        if row is None:
+            self.count('misses')
+            return None
+        with self.lock:
+            self.accessed[key] = now
+            self.counters['hits'] += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict):
+        now = time.time()
+        connection = self.connection()
+        with self.lock:
+            accessed, self.accessed = self.accessed, {}
+        # one write transaction for the access times, the insert, and the eviction
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.executemany('UPDATE documents SET accessed = ? WHERE key = ?', [(when, other) for other, when in accessed.items()])
+            connection.execute('INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)', (key, json.dumps(value), now + self.ttl, now))
+            excess = connection.execute('SELECT COUNT(*) FROM documents').fetchone()[0] - self.maxsize
+            if excess > 0:
+                evicted = connection.execute(
+                    'DELETE FROM documents WHERE key IN (SELECT key FROM documents ORDER BY accessed LIMIT ?)', (excess,)).rowcount
+                self.count('evictions', evicted)
+            connection.execute('COMMIT')
+        except Exception as e:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+
+    def delete(self, keys: list):
+        self.connection().executemany('DELETE FROM documents WHERE key = ?', [(key,) for key in keys])
+
+    def clear(self):
+        self.connection().execute('DELETE FROM documents')
+
+    def stats(self):
+        size = self.connection().execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+        with self.lock:
+            return dict(self.counters, size=size, backend='sqlite')
+
+def getCacheConfig():
+    """Read the configuration of the document cache from the environment or the local .env file.
+
+    returns:
+        config -- dict containing the backend ('none', 'memory', or 'sqlite'), size, ttl, and path
+    """
+    return {
+        'backend': getSetting('DOC_CACHE', 'none'),
+        'size': int(getSetting('DOC_CACHE_SIZE', 1000)),
+        'ttl': float(getSetting('DOC_CACHE_TTL', 60)),
+        'path': getSetting('DOC_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'edutask-doccache.sqlite'))
+    }
+
+cache = None
+configured = False
+lock = threading.Lock()
+
+def getCache():
+    """Obtain the document cache of this process as configured by the environment variable DOC_CACHE (none, memory,
+    or sqlite). The purpose of the realization using the singleton pattern is that all data access objects share
+    the same bounded cache.
+
+    returns:
+        cache -- the MemoryCache or SQLiteCache
+        None -- if caching is disabled
+    """
+    global cache, configured
+
+    if not configured:
+        with lock:
+            if not configured:
+                config = getCacheConfig()
+                if config['backend'] == 'memory':
+                    cache = MemoryCache(maxsize=config['size'], ttl=config['ttl'])
+                elif config['backend'] == 'sqlite':
+                    cache = SQLiteCache(config['path'], maxsize=config['size'], ttl=config['ttl'])
+                configured = True
+    return cache
@@ -0,0 +1,148 @@
+import os
+import threading
+
+import pymongo
+from pymongo import monitoring
+
+from src.util.config import getSetting
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Connection pool listener, which keeps track of the number of connections that are currently open and checked out
+    of the pool of the shared MongoClient, as well as how often a checkout had to wait or failed.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {
+            'pools': 0,
+            'open': 0,
+            'checkedOut': 0,
+            'created': 0,
+            'closed': 0,
+            'checkoutsStarted': 0,
+            'checkoutsFailed': 0
+        }
+
+    def _inc(self, key: str, value: int = 1):
+        with self.lock:
+            self.stats[key] += value
+
+    def pool_created(self, event):
+        self._inc('pools')
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        self._inc('pools', -1)
+
+    def connection_created(self, event):
+        self._inc('created')
+        self._inc('open')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._inc('closed')
+        self._inc('open', -1)
+
+    def connection_check_out_started(self, event):
+        self._inc('checkoutsStarted')
+
+    def connection_check_out_failed(self, event):
+        self._inc('checkoutsFailed')
+
+    def connection_checked_out(self, event):
+        self._inc('checkedOut')
+
+    def connection_checked_in(self, event):
+        self._inc('checkedOut', -1)
+
+# options of the MongoClient which can be configured via environment variables (or the .env file)
+POOL_OPTIONS = {
+    'maxPoolSize': ('MONGO_MAX_POOL_SIZE', 100),
+    'minPoolSize': ('MONGO_MIN_POOL_SIZE', 0),
+    'maxIdleTimeMS': ('MONGO_MAX_IDLE_TIME_MS', None),
+    'waitQueueTimeoutMS': ('MONGO_WAIT_QUEUE_TIMEOUT_MS', None)
+}
+
+client = None
+poolstats = None
+lock = threading.Lock()
+
+def getPoolOptions():
+    """Read the connection pool options of the shared MongoClient from the environment (which can be overridden by the
+    docker-compose file) or the local .env file.
+
+    returns:
+        options -- dict of MongoClient keyword arguments (unset options are omitted)
+    """
+    options = {}
+    for option, (variable, default) in POOL_OPTIONS.items():
+        value = getSetting(variable, default)
+        if value is not None:
+            options[option] = int(value)
+    return options
+
+def getClient():
+    """Obtain the MongoClient shared by all data access objects of this process. The purpose of the realization using
+    the singleton pattern is to maintain one single connection pool (including its monitor threads and sockets)
+    instead of one pool per data access object.
+
+    returns:
+        client -- the shared pymongo.MongoClient
+    """
+    global client, poolstats
+
+    if client is None:
+        with lock:
+            if client is None:
+                # the mongo URL (something like mongodb://localhost:27017) of the environment or the local .env file
+                MONGO_URL = getSetting('MONGO_URL')
+
+                options = getPoolOptions()
+                print(f'Connecting to MongoDB at url {MONGO_URL} with pool options {options}')
+
+                poolstats = PoolStatsListener()
+                client = pymongo.MongoClient(MONGO_URL, event_listeners=[poolstats], **options)
+    return client
+
+def getPoolStats():
+    """Obtain the current statistics of the connection pool of the shared MongoClient.
+
+    returns:
+        stats -- dict containing the configured pool options and the connection counters (empty counters if no client has been created yet)
+    """
+    stats = {'options': getPoolOptions()}
+    if poolstats is not None:
+        with poolstats.lock:
+            stats.update(poolstats.stats)
+    return stats
+
+def closeClient():
+    """Close the shared MongoClient (if any), such that the next call to getClient creates a new one.
+    """
+    global client, poolstats
+
+    with lock:
+        if client is not None:
+            client.close()
+        client = None
+        poolstats = None
+
+def resetClient():
+    """Forget the shared MongoClient without closing it. This is called in a forked child process (e.g., a worker of a
+    pre-fork server), which must not use the client of its parent: MongoClient is not fork-safe, and closing it would
+    also affect the sockets of the parent. The child creates a client of its own on the next call to getClient.
+    """
+    global client, poolstats, lock
+
+    client = None
+    poolstats = None
+    # the lock may have been held by another thread of the parent at the time of the fork
+    lock = threading.Lock()
+
+os.register_at_fork(after_in_child=resetClient)
@@ -0,0 +1,168 @@
+import zlib
+
+from flask import request
+
+from src.util.config import getSetting
+
+# optional compression libraries: the encodings are only offered if the library is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# media types of the responses which are compressed
+COMPRESSIBLE = ['application/json', 'application/x-ndjson']
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self.compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self.compressor.flush()
+
+def getEncodings():
+    """Obtain the supported content encodings in the order of preference of the server, together with their
+    compressor and compression level (configurable via the environment or the local .env file).
+
+    returns:
+        encodings -- dict mapping each available encoding to a (compressor class, level) tuple
+    """
+    def level(variable, default):
+        return int(getSetting(variable, default))
+
+    encodings = {}
+    if zstandard is not None:
+        encodings['zstd'] = (ZstdCompressor, level('COMPRESSION_ZSTD_LEVEL', 3))
+    if brotli is not None:
+        encodings['br'] = (BrotliCompressor, level('COMPRESSION_BROTLI_LEVEL', 4))
+    encodings['gzip'] = (GzipCompressor, level('COMPRESSION_GZIP_LEVEL', 6))
+    return encodings
+
+# content encodings which can possibly be negotiated (see src.util.etags)
+ENCODINGS = ['zstd', 'br', 'gzip']
+
+def negotiateEncoding(request, encodings: dict):
+    """Choose the content encoding of a response: the encoding with the highest quality in the Accept-Encoding header
+    of the request, where ties are resolved by the order of preference of the server.
+
+    parameters:
+        request -- the flask request
+        encodings -- the supported encodings (see getEncodings)
+
+    returns:
+        encoding -- the chosen encoding
+        None -- if the client accepts none of the supported encodings
+    """
+    best, quality = None, 0
+    for encoding in encodings:
+        q = request.accept_encodings[encoding]
+        if q > quality:
+            best, quality = encoding, q
+    return best
+
+def compressStream(chunks, compressor, flushsize: int):
+    """Compress a streamed response body incrementally. The compressor is flushed after the first chunk and whenever
+    flushsize bytes have been passed to it, such that the client receives the data while it is produced.
+
+    parameters:
+        chunks -- iterable of str or bytes chunks of the response body
+        compressor -- the compressor of the encoding
+        flushsize -- number of uncompressed bytes after which the compressor is flushed
+
+    returns:
+        generator -- yielding the compressed chunks
+    """
+    pending = 0
+    first = True
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+
+        pending += len(chunk)
+        if first or pending >= flushsize:
+            data += compressor.flush()
+            pending, first = 0, False
+        if data:
+            yield data
+    yield compressor.finish()
+
+def initCompression(app):
+    """Register content-negotiated compression (zstd, brotli, or gzip, depending on the installed libraries) of the
+    JSON responses of the app. Responses below a size threshold are sent uncompressed, streamed responses are
+    compressed incrementally. The threshold (COMPRESSION_MIN_SIZE), the flush size of streamed responses
+    (COMPRESSION_FLUSH_SIZE), and the compression levels (COMPRESSION_ZSTD_LEVEL, COMPRESSION_BROTLI_LEVEL,
+    COMPRESSION_GZIP_LEVEL) can be configured via the environment.
+
+    parameters:
+        app -- the flask app
+    """
+    minsize = int(getSetting('COMPRESSION_MIN_SIZE', 500))
+    flushsize = int(getSetting('COMPRESSION_FLUSH_SIZE', 16384))
+    encodings = getEncodings()
+
+    @app.after_request
+    def compress(response):
+        if response.mimetype not in COMPRESSIBLE or response.status_code < 200 or response.status_code in (204, 304):
+            return response
+        if 'Content-Encoding' in response.headers or response.direct_passthrough:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = negotiateEncoding(request, encodings)
+        if encoding is None:
+            return response
+
+        compressorclass, level = encodings[encoding]
+        if response.is_streamed:
+            response.response = compressStream(response.response, compressorclass(level), flushsize)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < minsize:
+                return response
+            compressor = compressorclass(level)
+            response.set_data(compressor.compress(data) + compressor.finish())
+
+        response.headers['Content-Encoding'] = encoding
+        # the encoded representation needs an entity tag of its own (see src.util.etags.notModified)
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            response.set_etag(f'{etag}-{encoding}')
+        return response
@@ -0,0 +1,42 @@
+import os
+import threading
+
+from dotenv import dotenv_values
+
+localconfig = None
+lock = threading.Lock()
+
+def getLocalConfig():
+    """Obtain the values of the local .env file. The file is read once per process, such that reading a setting does
+    not cause any file I/O (e.g., on the heartbeat of the server).
+
+    returns:
+        localconfig -- dict of the variables defined in the .env file (empty if there is no such file)
+    """
+    global localconfig
+
+    if localconfig is None:
+        with lock:
+            if localconfig is None:
+                localconfig = dict(dotenv_values('.env'))
+    return localconfig
+
+def getSetting(variable: str, default=None):
+    """Read a setting from the environment (which can be overridden by the docker-compose file) or, if it is not set
+    there, from the local .env file.
+
+    parameters:
+        variable -- the name of the environment variable
+        default -- the value if the variable is set neither in the environment nor in the .env file
+
+    returns:
+        value -- the value of the setting (a string unless it is the default)
+    """
+    return os.environ.get(variable, getLocalConfig().get(variable, default))
+
+def reloadConfig():
+    """Discard the values read from the local .env file, such that the next call to getSetting reads it again."""
+    global localconfig
+
+    with lock:
+        localconfig = None
@@ -0,0 +1,61 @@
+import json
+import math
+from datetime import datetime, timezone
+
+from bson import json_util
+from bson.objectid import ObjectId
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def convertDate(value: datetime):
+    """Convert a datetime into its relaxed extended JSON representation, which is identical to the output of
+    bson.json_util (e.g., {'$date': '2023-04-22T10:00:00.123Z'}).
+
+    parameters:
+        value -- a datetime object (naive datetimes are interpreted as UTC, like pymongo does)
+
+    returns:
+        dict -- the extended JSON representation of the date
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    if value < EPOCH:
+        # dates before the epoch are represented as milliseconds by json_util
+        return json.loads(json_util.dumps(value))
+
+    offset = value.utcoffset()
+    if not offset:
+        tz_string = 'Z'
+    else:
+        tz_string = value.strftime('%z')
+    millis = value.microsecond // 1000
+    fracsecs = '.%03d' % millis if millis else ''
+    return {'$date': f'{value.strftime("%Y-%m-%dT%H:%M:%S")}{fracsecs}{tz_string}'}
+
+def toJson(data):
+    """Transform a MongoDB document into a json object in a single pass. The result is identical to
+    json.loads(json_util.dumps(data)), but the document is walked directly instead of being serialized to a string
+    and parsed again. Types which do not occur in the collections of this application (e.g., Binary, Regex, Decimal128)
+    are delegated to json_util.
+
+    parameters:
+        data -- the MongoDB document (or any value contained in it)
+
+    returns:
+        object -- the document converted to JSON
+    """
+    cls = type(data)
+    if cls is dict:
+        return {key: toJson(value) for key, value in data.items()}
+    if cls is list or cls is tuple:
+        return [toJson(value) for value in data]
+    if cls is str or cls is bool or cls is int or data is None:
+        return data
+    if cls is ObjectId:
+        return {'$oid': str(data)}
+    if cls is datetime:
+        return convertDate(data)
+    if cls is float and math.isfinite(data):
+        return data
+    # everything else (subclasses like SON or Int64, non-finite floats, and the remaining BSON types) takes the slow path
+    return json.loads(json_util.dumps(data))
@@ -1,49 +1,88 @@
 # coding=utf-8
+# create a data access object
 import os
+import threading
 
-import pymongo
-from dotenv import dotenv_values
-
-# create a data access object
 from src.util.validators import getValidator
-
-import json
-from bson import json_util
+from src.util.indexes import ensureIndexes
+from src.util.clients import getClient
+from src.util.converter import toJson
+from src.util.cache import getCache
+from src.util.transactions import afterCommit
+
+from pymongo import ReturnDocument, InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
 from bson.objectid import ObjectId
 
 
+# name of the property containing the version of a document, which is incremented by every update
+VERSION = '_version'
+
 class DAO:
+    # optional read-through cache of documents by id (see src.util.cache)
+    cache = None
 
     def __init__(self, collection_name: str):
-        """Establish a data access object to a collection of the given name in the MongoDB database as specified in the environment variables. When the collection is first creted, it will be associated to a validator (see https://www.mongodb.com/docs/manual/core/schema-validation/) to ensure some basic data compliance.
+        """Establish a data access object to a collection of the given name in the MongoDB database as specified in the environment variables. All data access objects share the connection pool of one MongoClient (see src.util.clients). The connection is established lazily on the first access to the collection (or explicitly with bootstrap), such that data access objects can be instantiated without a running database. When the collection is first creted, it will be associated to a validator (see https://www.mongodb.com/docs/manual/core/schema-validation/) to ensure some basic data compliance. The indexes declared next to the validator are created when they do not yet exist.
 
         parameters:
             collection_name -- the name of the collection (a collection validator of the same name must be available)
         """
+        self.collection_name = collection_name
+        self.cache = getCache()
+        self.lock = threading.Lock()
+
+    @property
+    def collection(self):
+        """The pymongo collection of this data access object, which is bootstrapped on first access in every process."""
+        collection = getattr(self, '_collection', None)
+        if collection is None or self._pid != os.getpid():
+            collection = self.bootstrap()
+        return collection
+
+    @collection.setter
+    def collection(self, collection):
+        self._collection = collection
+        self._pid = os.getpid()
+
+    def bootstrap(self):
+        """Connect to the collection, create it (with its validator) if it does not yet exist, and create its declared indexes. A forked child process bootstraps the collection again with a client of its own (see src.util.clients.resetClient).
 
-        # load the local mongo URL (something like mongodb://localhost:27017)
-        LOCAL_MONGO_URL = dotenv_values('.env').get('MONGO_URL')
-        # check out of the environment (which can be overridden by the docker-compose file) also specifies an URL, and use that instead if it exists
-        MONGO_URL = os.environ.get('MONGO_URL', LOCAL_MONGO_URL)
-
-        # connect to the MongoDB and select the appropriate database
-        print(
-            f'Connecting to collection {collection_name} on MongoDB at url {MONGO_URL}')
-        client = pymongo.MongoClient(MONGO_URL)
-        database = client.edutask
-
-        # create the collection if it does not yet exist
-        if collection_name not in database.list_collection_names():
-            validator = getValidator(collection_name)
-            database.create_collection(collection_name, validator=validator)
-
-        self.collection = database[collection_name]
+        returns:
+            collection -- the pymongo collection
 
-    def create(self, data: dict):
+        raises:
+            Exception -- in case any database operation fails
+        """
+        with self.lock:
+            collection = getattr(self, '_collection', None)
+            if collection is not None and self._pid == os.getpid():
+                return collection
+
+            try:
+                # connect to the MongoDB via the client shared by all data access objects and select the appropriate database
+                print(f'Connecting to collection {self.collection_name}')
+                database = getClient().edutask
+
+                # create the collection if it does not yet exist
+                if not database.list_collection_names(filter={'name': self.collection_name}):
+                    validator = getValidator(self.collection_name)
+                    database.create_collection(self.collection_name, validator=validator)
+
+                collection = database[self.collection_name]
+                # create the declared indexes of the collection if they do not yet exist
+                self.indexreport = ensureIndexes(collection, self.collection_name)
+                self.collection = collection
+                return collection
+            except Exception as e:
+                raise
+
+    def create(self, data: dict, session=None):
         """Creates a new document in the collection associated to this data access object. The creation of a new document must comply to the corresponding validator, which defines the data structure of the collection. In particular, the validator has to make sure that: (1) the data for the new object contains all required properties, (2) every property complies to the bson data type constraint (see https://www.mongodb.com/docs/manual/reference/bson-types/, though we currently only consider Strings and Booleans), (3) and the values of a property flagged with 'uniqueItems' are unique among all documents of the collection.
 
         parameters:
             data -- a dict containing key-value pairs compliant to the validator
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
 
         returns:
             object -- the newly created MongoDB document (parsed to a JSON object) containing the input data and an _id attribute
@@ -52,23 +91,25 @@ class DAO:
             WriteError - in case at least one of the validator criteria is violated
         """
         localdata = dict(data)
+        localdata[VERSION] = 1
 
         try:
-            # insert the object into the database
-            inserted_id = self.collection.insert_one(localdata).inserted_id
+            # insert the object into the database (insert_one adds the generated _id to localdata)
+            self.collection.insert_one(localdata, session=session)
 
-            # fetch and return the created object
-            obj = self.collection.find_one({'_id': inserted_id})
-            return self.to_json(obj)
+            # return the created object without reading it back from the database
+            return self.to_json(localdata)
         except Exception as e:
             # forward any pymongo.errors.WriteError that occurs during insert_one
             raise
 
-    def findOne(self, id: str):
+    def findOne(self, id: str, projection: dict = None, session=None):
         """Find one specific object in the collection with the _id property equal to the given id.
 
         parameters: 
             id -- id value of the requested object
+            projection -- optional dict of the fields to include (e.g., {'tasks': 1}) or exclude (e.g., {'todos': 0}), see https://www.mongodb.com/docs/manual/tutorial/project-fields-from-query-results/
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
 
         returns:
             object -- MongoDB document (parsed to json object)
@@ -76,19 +117,32 @@ class DAO:
         raises:
             Exception -- in case any database operation fails
         """
+        # only complete documents are cached (and the cache is bypassed within sessions, which must observe their own writes)
+        cached = self.cache is not None and projection is None and session is None
+        if cached:
+            obj = self.read_cache(id)
+            if obj is not None:
+                return obj
+
         try:
-            obj = self.collection.find_one({'_id': ObjectId(id)})
-            return self.to_json(obj)
+            obj = self.to_json(self.collection.find_one({'_id': ObjectId(id)}, projection, session=session))
+            if cached and obj is not None:
+                self.write_cache(id, obj)
+            return obj
         except Exception as e:
             raise
 
     # find all objects that comply to the optional filter
-    def find(self, filter=None, toid: list = None):
+    def find(self, filter=None, toid: list = None, projection: dict = None, limit: int = 0, raw: bool = False, session=None):
         """Find all objects contained in the collection which comply to the given filter. 
 
         parameters: 
             filter -- dict containing key value pairs of properties and applicable filters
             toid -- list of properties (contained in the filter) which are MongoDB ObjectIDs and hence need to be converted
+            projection -- optional dict of the fields to include or exclude (see findOne)
+            limit -- maximum number of returned objects (0 for no limit)
+            raw -- if True, the objects are returned as raw MongoDB documents (see findIter)
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
 
         returns:
             [object] -- list of objects compliant to the given filter
@@ -96,33 +150,145 @@ class DAO:
         raises:
             Exception -- in case any database operation fails
         """
+        try:
+            return list(self.findIter(filter=filter, toid=toid, projection=projection, limit=limit, raw=raw, session=session))
+        except Exception as e:
+            raise
 
-        # if the filter contains attributes that are IDs, then they need to be converted
-        if toid and len(toid) > 0:
-            for i in toid:
-                converted = []
-                for element in filter[i]:
-                    conv = ObjectId(element['$oid'])
-                    converted.append(conv)
-                filter[i] = {'$in': converted}
+    def findIter(self, filter=None, toid: list = None, projection: dict = None, limit: int = 0, batch_size: int = 100, raw: bool = False, session=None):
+        """Lazily iterate over all objects contained in the collection which comply to the given filter. In contrast to find, the objects are fetched from the database in batches while iterating, such that large collections can be processed in constant memory.
 
-        objs = []
-        try:
-            dbobjs = self.collection.find(filter)
+        parameters: 
+            filter -- dict containing key value pairs of properties and applicable filters
+            toid -- list of properties (contained in the filter) which are MongoDB ObjectIDs and hence need to be converted
+            projection -- optional dict of the fields to include or exclude (see findOne)
+            limit -- maximum number of returned objects (0 for no limit)
+            batch_size -- number of objects fetched from the database per round trip
+            raw -- if True, the objects are returned as raw MongoDB documents (e.g., for a JSON provider which serializes them directly, see src.util.jsonprovider) instead of being parsed to json objects
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
 
+        returns:
+            generator -- yielding the objects compliant to the given filter
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        filter = self.convert_filter(filter, toid)
+
+        with self.collection.find(filter, projection, limit=limit, batch_size=batch_size, session=session) as dbobjs:
             for obj in dbobjs:
-                objs.append(self.to_json(obj))
+                yield obj if raw else self.to_json(obj)
+
+    def findVersions(self, filter=None, toid: list = None, limit: int = 0):
+        """Find the ids and versions of all objects contained in the collection which comply to the given filter. Every create sets the version of an object to 1 and every update through this data access object increments it, such that the versions identify the current state of the objects without transferring them.
+
+        parameters: 
+            filter -- dict containing key value pairs of properties and applicable filters
+            toid -- list of properties (contained in the filter) which are MongoDB ObjectIDs and hence need to be converted
+            limit -- maximum number of returned objects (0 for no limit)
+
+        returns:
+            [object] -- list of objects containing only the _id and the version
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            return self.find(filter=filter, toid=toid, projection={VERSION: 1}, limit=limit)
+        except Exception as e:
+            raise
+
+    def findPage(self, filter=None, toid: list = None, projection: dict = None, limit: int = 20, after: str = None, raw: bool = False):
+        """Find one page of the objects contained in the collection which comply to the given filter, ordered by their _id. The pagination is keyset-based: instead of skipping a number of objects, the next page starts after the _id of the last object of the previous page, such that every page is served by the _id index regardless of its depth.
+
+        parameters: 
+            filter -- dict containing key value pairs of properties and applicable filters
+            toid -- list of properties (contained in the filter) which are MongoDB ObjectIDs and hence need to be converted
+            projection -- optional dict of the fields to include or exclude (see findOne)
+            limit -- maximum number of objects on the page
+            after -- cursor returned with the previous page (the id of its last object), or None for the first page
+            raw -- if True, the objects are returned as raw MongoDB documents (e.g., for a JSON provider which serializes them directly, see src.util.jsonprovider) instead of being parsed to json objects
+
+        returns:
+            page -- dict containing the list of objects under 'data' and the cursor of the next page under 'next' (None if this is the last page)
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        filter = self.convert_filter(filter, toid)
+        if after is not None:
+            keyset = {'_id': {'$gt': ObjectId(after)}}
+            filter = {'$and': [filter, keyset]} if filter else keyset
 
-            return objs
+        try:
+            # fetch one additional object to determine whether there is a next page
+            dbobjs = list(self.collection.find(filter, projection, sort=[('_id', 1)], limit=limit + 1))
+            cursor = str(dbobjs[limit - 1]['_id']) if len(dbobjs) > limit else None
+            return {'data': dbobjs[:limit] if raw else [self.to_json(obj) for obj in dbobjs[:limit]], 'next': cursor}
         except Exception as e:
             raise
 
-    def update(self, id: str, update_data: dict):
+    def aggregate(self, pipeline: list, raw: bool = False):
+        """Run an aggregation pipeline (see https://www.mongodb.com/docs/manual/core/aggregation-pipeline/) on the collection, e.g., to resolve references to other collections with $lookup in the same database operation.
+
+        parameters: 
+            pipeline -- list of aggregation stages
+            raw -- if True, the objects are returned as raw MongoDB documents (e.g., for a JSON provider which serializes them directly, see src.util.jsonprovider) instead of being parsed to json objects
+
+        returns:
+            [object] -- list of the resulting objects (parsed to json objects)
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            return list(self.aggregateIter(pipeline, raw=raw))
+        except Exception as e:
+            raise
+
+    def aggregateIter(self, pipeline: list, batch_size: int = 100, raw: bool = False):
+        """Lazily iterate over the results of an aggregation pipeline on the collection (see aggregate and findIter).
+
+        parameters: 
+            pipeline -- list of aggregation stages
+            batch_size -- number of objects fetched from the database per round trip
+            raw -- if True, the objects are returned as raw MongoDB documents (e.g., for a JSON provider which serializes them directly, see src.util.jsonprovider) instead of being parsed to json objects
+
+        returns:
+            generator -- yielding the resulting objects
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        with self.collection.aggregate(pipeline, batchSize=batch_size) as dbobjs:
+            for obj in dbobjs:
+                yield obj if raw else self.to_json(obj)
+
+    def convert_filter(self, filter, toid: list = None):
+        """Convert the attributes of a filter that are IDs (given as lists of {'$oid': ...} json objects) into MongoDB $in filters on ObjectIds.
+
+        parameters: 
+            filter -- dict containing key value pairs of properties and applicable filters
+            toid -- list of properties (contained in the filter) which are MongoDB ObjectIDs and hence need to be converted
+
+        returns:
+            filter -- a copy of the filter with converted IDs
+        """
+        if not toid or len(toid) == 0:
+            return filter
+
+        filter = dict(filter)
+        for i in toid:
+            filter[i] = {'$in': self.to_objectids(filter[i])}
+        return filter
+
+    def update(self, id: str, update_data: dict, session=None):
         """Find one specific object in the collection with the _id property equal to the given id and update its data according to the update_data.
 
         parameters: 
             id -- id value of the requested object
             update_data -- dict containing the update operation (top-level key values must be valid MongoDB update operators, see https://www.mongodb.com/docs/manual/reference/operator/update/#std-label-update-operators)
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
 
         returns:
             True -- if the update was successful
@@ -134,17 +300,45 @@ class DAO:
         try:
             update_result = self.collection.update_one(
                 {'_id': ObjectId(id)},
-                update_data
+                self.versioned(update_data),
+                session=session
             )
+            self.invalidate([id], session=session)
             return update_result.acknowledged
         except Exception as e:
             raise
 
-    def delete(self, id: str):
+    def findOneAndUpdate(self, id: str, update_data: dict):
+        """Find one specific object in the collection with the _id property equal to the given id, update its data according to the update_data and return the updated object. In contrast to calling update and findOne, this requires only one database operation.
+
+        parameters: 
+            id -- id value of the requested object
+            update_data -- dict containing the update operation (top-level key values must be valid MongoDB update operators, see https://www.mongodb.com/docs/manual/reference/operator/update/#std-label-update-operators)
+
+        returns:
+            object -- the updated MongoDB document (parsed to json object)
+            None -- if no object associated to the given id can be found
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        try:
+            obj = self.collection.find_one_and_update(
+                {'_id': ObjectId(id)},
+                self.versioned(update_data),
+                return_document=ReturnDocument.AFTER
+            )
+            self.invalidate([id])
+            return self.to_json(obj)
+        except Exception as e:
+            raise
+
+    def delete(self, id: str, session=None):
         """Find one specific object in the collection with the _id property equal to the given id and remove it from the collection
 
         parameters: 
             id -- id value of the requested object
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
 
         returns:
             True -- if the deletion was successful
@@ -155,12 +349,148 @@ class DAO:
         """
         try:
             result = self.collection.delete_one(
-                {'_id': ObjectId(id)}
+                {'_id': ObjectId(id)},
+                session=session
             )
+            self.invalidate([id], session=session)
             return result.acknowledged
         except Exception as e:
             raise
 
+    def create_many(self, data: list, ordered: bool = True, session=None):
+        """Creates multiple new documents in the collection associated to this data access object with one database operation. Each document must comply to the corresponding validator (see create).
+
+        parameters:
+            data -- a list of dicts containing key-value pairs compliant to the validator
+            ordered -- if True, the documents are inserted in order and the insertion stops at the first failing document; if False, all documents are attempted
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
+
+        returns:
+            result -- dict containing the list 'results' with the newly created object (parsed to a JSON object) or None per item of data, and the list 'errors' with an {'index', 'code', 'message'} dict per failed item
+
+        raises:
+            Exception -- in case any database operation fails for another reason than a violated validator
+        """
+        return self.bulk_write([{'create': item} for item in data], ordered=ordered, session=session)
+
+    def update_many(self, ids: list, update_data: dict, filter: dict = None, session=None):
+        """Update all objects in the collection with an _id property contained in the given list of ids according to the update_data with one database operation.
+
+        parameters:
+            ids -- list of id values (strings, ObjectIds or {'$oid': ...} dicts) of the objects to update
+            update_data -- dict containing the update operation (top-level key values must be valid MongoDB update operators)
+            filter -- optional dict of further conditions the objects must fulfill to be updated (e.g., {'done': False})
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
+
+        returns:
+            n -- number of objects matched by the ids (and the filter)
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        if len(ids) == 0:
+            return 0
+        try:
+            result = self.collection.update_many(
+                dict(filter or {}, _id={'$in': self.to_objectids(ids)}),
+                self.versioned(update_data),
+                session=session
+            )
+            self.invalidate(ids, session=session)
+            return result.matched_count
+        except Exception as e:
+            raise
+
+    def delete_many(self, ids: list, filter: dict = None, session=None):
+        """Remove all objects from the collection with an _id property contained in the given list of ids with one database operation.
+
+        parameters:
+            ids -- list of id values (strings, ObjectIds or {'$oid': ...} dicts) of the objects to remove
+            filter -- optional dict of further conditions the objects must fulfill to be removed (e.g., {'done': True})
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
+
+        returns:
+            n -- number of removed objects
+
+        raises:
+            Exception -- in case any database operation fails
+        """
+        if len(ids) == 0:
+            return 0
+        try:
+            result = self.collection.delete_many(
+                dict(filter or {}, _id={'$in': self.to_objectids(ids)}),
+                session=session
+            )
+            self.invalidate(ids, session=session)
+            return result.deleted_count
+        except Exception as e:
+            raise
+
+    def bulk_write(self, operations: list, ordered: bool = True, session=None):
+        """Execute a mixed list of create, update, and delete operations with one database operation. Each operation is a dict of one of the following forms:
+            {'create': data} -- create a new document from the data dict
+            {'update': id, 'data': update_data} -- update the object with the given id according to the update_data
+            {'delete': id} -- remove the object with the given id
+
+        parameters:
+            operations -- list of operation dicts
+            ordered -- if True, the operations are executed in order and the execution stops at the first failing operation; if False, all operations are attempted
+            session -- optional pymongo ClientSession, e.g., to execute the operation as part of a transaction (see src.util.transactions)
+
+        returns:
+            result -- dict containing the list 'results' and the list 'errors'. The results contain per operation the newly created object (for create operations), True (for executed update and delete operations), or None (for failed or not executed operations). The errors contain an {'index', 'code', 'message'} dict per failed operation.
+
+        raises:
+            ValueError -- in case an operation dict has an unknown form
+            Exception -- in case any database operation fails for another reason than a failing write
+        """
+        requests = []
+        created = {}
+        for index, operation in enumerate(operations):
+            if 'create' in operation:
+                localdata = dict(operation['create'])
+                localdata[VERSION] = 1
+                created[index] = localdata
+                requests.append(InsertOne(localdata))
+            elif 'update' in operation:
+                requests.append(UpdateOne({'_id': self.to_objectid(operation['update'])}, self.versioned(operation['data'])))
+            elif 'delete' in operation:
+                requests.append(DeleteOne({'_id': self.to_objectid(operation['delete'])}))
+            else:
+                raise ValueError(f'Error: unknown bulk operation {operation}')
+
+        result = {'results': [None] * len(requests), 'errors': []}
+        if len(requests) == 0:
+            return result
+
+        try:
+            self.collection.bulk_write(requests, ordered=ordered, session=session)
+            executed = range(len(requests))
+        except BulkWriteError as e:
+            result['errors'] = [{
+                'index': error['index'],
+                'code': error.get('code'),
+                'message': error.get('errmsg')
+            } for error in e.details.get('writeErrors', [])]
+            failed = {error['index'] for error in result['errors']}
+
+            if ordered and len(failed) > 0:
+                # an ordered bulk write stops at the first failing operation
+                executed = range(min(failed))
+            else:
+                executed = [index for index in range(len(requests)) if index not in failed]
+        finally:
+            # invalidate the cached documents of all updated and deleted objects, whether the bulk write succeeded or not
+            self.invalidate([operation.get('update', operation.get('delete')) for operation in operations if 'create' not in operation], session=session)
+
+        for index in executed:
+            if index in created:
+                result['results'][index] = self.to_json(created[index])
+            else:
+                result['results'][index] = True
+        return result
+
     def drop(self):
         """Remove the entire collection
 
@@ -169,6 +499,8 @@ class DAO:
         """
         try:
             self.collection.drop()
+            if self.cache is not None:
+                self.cache.clear()
         except Exception as e:
             raise
 
@@ -181,4 +513,80 @@ class DAO:
         returns:
             dict -- the document converted to JSON
         """
-        return json.loads(json_util.dumps(data))
+        return toJson(data)
+
+    def to_objectid(self, id):
+        """Transform an id into a MongoDB ObjectId.
+
+        parameters:
+            id -- id value, either a string, an ObjectId, or a json object of the form {'$oid': ...}
+
+        returns:
+            ObjectId -- the converted id
+        """
+        if isinstance(id, dict):
+            return ObjectId(id['$oid'])
+        return ObjectId(id)
+
+    def to_objectids(self, ids: list):
+        """Transform a list of ids into MongoDB ObjectIds (see to_objectid).
+
+        parameters:
+            ids -- list of id values
+
+        returns:
+            [ObjectId] -- the converted ids
+        """
+        return [self.to_objectid(id) for id in ids]
+
+    def cache_key(self, id):
+        """Return the key of the object with the given id in the document cache."""
+        return f'{self.collection_name}:{self.to_objectid(id)}'
+
+    def read_cache(self, id):
+        """Return the cached object with the given id, or None if it is not cached or the cache fails (e.g., a locked
+        SQLite file), such that the object is read from the database instead."""
+        try:
+            return self.cache.get(self.cache_key(id))
+        except Exception as e:
+            print(f'Document cache failed: {e.__class__.__name__}: {e}')
+            return None
+
+    def write_cache(self, id, obj: dict):
+        """Cache the object with the given id, ignoring failures of the cache."""
+        try:
+            self.cache.set(self.cache_key(id), obj)
+        except Exception as e:
+            print(f'Document cache failed: {e.__class__.__name__}: {e}')
+
+    def uncache(self, keys: list):
+        """Remove the given keys from the cache. A failure is reported, but does not fail the write, whose objects then
+        remain cached until they expire."""
+        try:
+            self.cache.delete(keys)
+        except Exception as e:
+            print(f'Document cache failed: {e.__class__.__name__}: {e}')
+
+    def invalidate(self, ids: list, session=None):
+        """Remove the objects with the given ids from the document cache (if caching is enabled). The objects written in a transaction are only removed once the transaction has been committed, since a read before the commit would cache the previous version again (see src.util.transactions.afterCommit).
+
+        parameters:
+            ids -- list of id values (strings, ObjectIds or {'$oid': ...} dicts)
+            session -- the pymongo ClientSession of the write (if any)
+        """
+        if self.cache is not None and len(ids) > 0:
+            keys = [self.cache_key(id) for id in ids]
+            afterCommit(session, lambda: self.uncache(keys))
+
+    def versioned(self, update_data: dict):
+        """Add the increment of the document version to an update operation, such that every update of an object yields a new version (see findVersions).
+
+        parameters:
+            update_data -- dict containing the update operation
+
+        returns:
+            update_data -- a copy of the update operation which also increments the version
+        """
+        update_data = dict(update_data)
+        update_data['$inc'] = dict(update_data.get('$inc', {}), **{VERSION: 1})
+        return update_data
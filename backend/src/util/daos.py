@@ -13,4 +13,25 @@ def getDao(collection_name: str):
     """
     if collection_name not in daos:
         daos[collection_name] = DAO(collection_name=collection_name)
-    return daos[collection_name]
\ No newline at end of file
+    return daos[collection_name]
+
+# collections of the application, which are bootstrapped by warmup
+COLLECTIONS = ['user', 'task', 'video', 'todo', 'job']
+
+def warmup(collection_names: list = COLLECTIONS):
+    """Explicitly establish the connection to the database and bootstrap the collections (including their validators
+    and indexes), which otherwise happens lazily on the first request that accesses a collection. When called before a
+    pre-fork server forks its workers, every worker bootstraps the collections again with a client of its own.
+
+    parameters:
+        collection_names -- the names of the collections to bootstrap
+
+    returns:
+        indexreports -- dict mapping each collection name to the report of its indexes (see src.util.indexes.ensureIndexes)
+    """
+    indexreports = {}
+    for collection_name in collection_names:
+        dao = getDao(collection_name=collection_name)
+        dao.bootstrap()
+        indexreports[collection_name] = dao.indexreport
+    return indexreports
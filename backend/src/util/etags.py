@@ -0,0 +1,73 @@
+import hashlib
+from collections.abc import Mapping
+
+from flask import Response
+
+from src.util.dao import VERSION
+from src.util.compression import ENCODINGS
+
+def computeETag(versions: list, request):
+    """Compute a strong entity tag of a response from the ids and versions of all objects it contains (see
+    DAO.findVersions) and from the request variant (path, query string, and requested media type). Since every write
+    through a data access object increments the version of the written object, the tag changes whenever the response
+    would change, without building the response.
+
+    parameters:
+        versions -- list of (possibly nested) objects containing an _id and a version
+        request -- the flask request
+
+    returns:
+        etag -- the entity tag (without quotes)
+    """
+    parts = sorted(flattenVersions(versions))
+    parts.append(f'{request.full_path}|{request.accept_mimetypes}')
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+def flattenVersions(obj):
+    """Collect the '<id>:<version>' strings of all objects with an _id contained in the given object or list, which are
+    either json objects or raw MongoDB documents (see DAO.findIter)."""
+    parts = []
+    if isinstance(obj, list):
+        for element in obj:
+            parts += flattenVersions(element)
+    elif isinstance(obj, Mapping):
+        if '_id' in obj:
+            id = obj['_id']
+            parts.append(f"{id['$oid'] if isinstance(id, Mapping) else id}:{obj.get(VERSION)}")
+        for key, value in obj.items():
+            if key != '_id':
+                parts += flattenVersions(value)
+    return parts
+
+def notModified(request, etag: str):
+    """Answer a conditional GET request: if the request contains the given entity tag in its If-None-Match header, the
+    client already holds the current response.
+
+    parameters:
+        request -- the flask request
+        etag -- the entity tag of the current response
+
+    returns:
+        response -- an empty 304 (Not Modified) response if the client holds the current response
+        None -- if the full response has to be built
+    """
+    # the client holds either the identity representation or a compressed one (see src.util.compression)
+    for candidate in [etag] + [f'{etag}-{encoding}' for encoding in ENCODINGS]:
+        if candidate in request.if_none_match:
+            response = Response(status=304)
+            return withETag(response, candidate)
+    return None
+
+def withETag(response, etag: str):
+    """Attach the entity tag to a response and require clients to revalidate their copy before reusing it.
+
+    parameters:
+        response -- the flask response
+        etag -- the entity tag
+
+    returns:
+        response -- the same response
+    """
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
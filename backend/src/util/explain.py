@@ -0,0 +1,47 @@
+# commands which can be explained (see https://www.mongodb.com/docs/manual/reference/command/explain/)
+EXPLAINABLE_COMMANDS = {'find', 'aggregate', 'count', 'distinct', 'update', 'delete', 'findAndModify'}
+# fields of a command document which are added by the driver and are not accepted by explain
+DRIVER_FIELDS = {'lsid', 'txnNumber', 'autocommit', 'startTransaction', 'readConcern', 'writeConcern', 'cursor'}
+
+def explainCommand(database, command_name: str, document: dict, verbosity: str = 'queryPlanner'):
+    """Explain a command as it was sent by the driver (e.g., as recorded by a pymongo command listener).
+
+    parameters:
+        database -- the pymongo database of the command
+        command_name -- the name of the command (e.g., 'find')
+        document -- the command document
+        verbosity -- 'queryPlanner' (does not execute the command) or 'executionStats' (executes the winning plan)
+
+    returns:
+        plan -- the output of the explain command
+    """
+    document = {key: value for key, value in document.items() if not key.startswith('$') and key not in DRIVER_FIELDS}
+    if command_name == 'aggregate':
+        # explain requires the cursor option of an aggregation
+        document['cursor'] = {}
+    return database.command({'explain': document, 'verbosity': verbosity})
+
+def stages(plan):
+    """Collect the names of all stages contained in the winning plans of an explain output (including the plans of
+    the $cursor stages of aggregations).
+
+    parameters:
+        plan -- the output of an explain command (or any part of it)
+
+    returns:
+        stages -- set of stage names (e.g., {'FETCH', 'IXSCAN'})
+    """
+    found = set()
+    def walk(node, winning):
+        if isinstance(node, dict):
+            if winning and isinstance(node.get('stage'), str):
+                found.add(node['stage'])
+            for key, value in node.items():
+                # the rejected plans are not executed
+                if key != 'rejectedPlans':
+                    walk(value, winning or key in ('winningPlan', 'queryPlan'))
+        elif isinstance(node, list):
+            for value in node:
+                walk(value, winning)
+    walk(plan, False)
+    return found
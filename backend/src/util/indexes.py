@@ -0,0 +1,66 @@
+import os
+import json
+
+from src.util.validators import VALIDATORS_DIR
+
+# options of an index specification which are compared against the existing indexes to detect drift
+INDEX_OPTIONS = ['unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression']
+
+indexes = {}
+def getIndexes(collection_name: str):
+    """Obtain the index specifications of a collection which are stored as a json file named <collection_name>.indexes.json
+    next to the validator of the collection. Each specification is a dict containing the name of the index, its keys as a
+    list of [field, direction] pairs, and optionally the options unique, sparse, expireAfterSeconds (TTL indexes), and
+    partialFilterExpression (see https://www.mongodb.com/docs/manual/indexes/). Indexes on array fields are multikey
+    indexes automatically.
+
+    parameters:
+        collection_name -- the name of the collection
+
+    returns:
+        indexes -- list of index specifications (empty if the collection declares no indexes)
+    """
+    if collection_name not in indexes:
+        filename = os.path.join(VALIDATORS_DIR, f'{collection_name}.indexes.json')
+        if os.path.exists(filename):
+            with open(filename, 'r') as f:
+                indexes[collection_name] = json.load(f)
+        else:
+            indexes[collection_name] = []
+    return indexes[collection_name]
+
+def ensureIndexes(collection, collection_name: str):
+    """Create all declared indexes of a collection which do not exist yet and report drift between the declared and
+    the existing indexes. Existing indexes are never modified or dropped, so the operation is idempotent.
+
+    parameters:
+        collection -- the pymongo collection
+        collection_name -- the name of the collection (see getIndexes)
+
+    returns:
+        report -- dict containing the names of the 'created' indexes, of the 'drifted' indexes (declared, but existing
+            with different keys or options), and of the 'undeclared' indexes (existing, but not declared)
+    """
+    report = {'created': [], 'drifted': [], 'undeclared': []}
+    specs = getIndexes(collection_name)
+    existing = collection.index_information()
+
+    for spec in specs:
+        keys = [(field, direction) for field, direction in spec['keys']]
+        options = {option: spec[option] for option in INDEX_OPTIONS if option in spec}
+
+        if spec['name'] not in existing:
+            collection.create_index(keys, name=spec['name'], **options)
+            report['created'].append(spec['name'])
+            continue
+
+        index = existing[spec['name']]
+        if list(index['key']) != keys or any(index.get(option) != options.get(option) for option in INDEX_OPTIONS):
+            report['drifted'].append(spec['name'])
+
+    declared = {spec['name'] for spec in specs}
+    report['undeclared'] = [name for name in existing if name != '_id_' and name not in declared]
+
+    if len(report['drifted']) > 0 or len(report['undeclared']) > 0:
+        print(f'Warning: indexes of collection {collection_name} drifted from their declaration: {report}')
+    return report
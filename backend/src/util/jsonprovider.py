@@ -0,0 +1,75 @@
+import json
+from datetime import datetime
+
+from bson.objectid import ObjectId
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+from src.util.config import getSetting
+from src.util.converter import convertDate, toJson
+
+# optional fast JSON encoder: without it, the standard library encoder is used
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class BSONJSONProvider(DefaultJSONProvider):
+    """JSON provider of the flask app which serializes raw MongoDB documents directly, such that the documents do not
+    have to be converted with DAO.to_json before being serialized. It is backed by orjson if installed.
+
+    The representation of ObjectIds and dates is determined by the mode (environment variable JSON_BSON_MODE):
+        extended -- (default) the relaxed extended JSON of DAO.to_json, i.e., {'$oid': ...} and {'$date': ...}, which
+            is the format expected by the frontend (see frontend/src/Util/Converter.js)
+        native -- ObjectIds as hex strings and dates as ISO 8601 strings
+    """
+    # signals the blueprints that raw documents can be passed to jsonify (see acceptsBSON)
+    serializes_bson = True
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.mode = getSetting('JSON_BSON_MODE', 'extended')
+
+    def default(self, o):
+        if isinstance(o, ObjectId):
+            return {'$oid': str(o)} if self.mode == 'extended' else str(o)
+        if isinstance(o, datetime):
+            return convertDate(o) if self.mode == 'extended' else o.isoformat()
+        if self.mode == 'extended':
+            # the remaining BSON types (e.g., Binary or Decimal128) in their extended JSON representation
+            return toJson(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and set(kwargs) <= {'separators'}:
+            return self.dumpb(obj).decode('utf-8')
+
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def dumpb(self, obj):
+        """Serialize an object to compact JSON bytes with orjson."""
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def response(self, *args, **kwargs):
+        if orjson is None or self._app.debug or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        # build the response body without decoding the serialized bytes
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumpb(obj) + b'\n', mimetype=self.mimetype)
+
+def acceptsBSON():
+    """Check whether the JSON provider of the current app serializes raw MongoDB documents (see BSONJSONProvider), such
+    that the controllers can skip the conversion of the documents.
+
+    returns:
+        True -- if raw documents can be passed to jsonify
+        False -- otherwise
+    """
+    return getattr(current_app.json, 'serializes_bson', False)
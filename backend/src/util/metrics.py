@@ -0,0 +1,202 @@
+import time
+import bisect
+import threading
+import contextvars
+
+from flask import request, g
+from pymongo import monitoring
+
+from src.util.clients import getPoolStats
+from src.util.cache import getCache
+
+# upper bounds (in seconds) of the buckets of the latency histograms
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+# route template (e.g., /tasks/byid/<id>) of the request being served, to which database commands are attributed
+currentroute = contextvars.ContextVar('currentroute', default='none')
+
+class Histogram:
+    def __init__(self, buckets: list = BUCKETS):
+        """Instantiate a cumulative histogram of observed values in the format of Prometheus.
+
+        parameters:
+            buckets -- sorted upper bounds of the buckets (the bucket +Inf is implicit)
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Return the (upper bound, cumulative count) pairs of all buckets including +Inf."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + ['+Inf'], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+class Metrics:
+    def __init__(self):
+        """Instantiate the metrics of this process: the number and latency of the requests per route, and the number
+        and duration of the database commands per route and command.
+        """
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.latencies = {}
+        self.commands = {}
+
+    def observeRequest(self, method: str, route: str, status: int, duration: float):
+        with self.lock:
+            key = (method, route, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latencies.setdefault((method, route), Histogram()).observe(duration)
+
+    def observeCommand(self, route: str, command: str, duration: float, failed: bool):
+        with self.lock:
+            counters = self.commands.setdefault((route, command), {'count': 0, 'failures': 0, 'seconds': 0.0})
+            counters['count'] += 1
+            counters['seconds'] += duration
+            if failed:
+                counters['failures'] += 1
+
+    def reset(self):
+        with self.lock:
+            self.requests.clear()
+            self.latencies.clear()
+            self.commands.clear()
+
+    def render(self):
+        """Render all metrics (including the gauges of the connection pool and the document cache) in the text
+        exposition format of Prometheus.
+
+        returns:
+            text -- the metrics
+        """
+        lines = []
+        def metric(name: str, kind: str, description: str):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self.lock:
+            metric('edutask_http_requests_total', 'counter', 'Number of requests per route and status code.')
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'edutask_http_requests_total{labels(method=method, route=route, status=status)} {count}')
+
+            metric('edutask_http_request_duration_seconds', 'histogram', 'Latency of the requests per route.')
+            for (method, route), histogram in sorted(self.latencies.items()):
+                for bound, count in histogram.cumulative():
+                    lines.append(f'edutask_http_request_duration_seconds_bucket{labels(method=method, route=route, le=bound)} {count}')
+                lines.append(f'edutask_http_request_duration_seconds_sum{labels(method=method, route=route)} {histogram.sum}')
+                lines.append(f'edutask_http_request_duration_seconds_count{labels(method=method, route=route)} {histogram.cumulative()[-1][1]}')
+
+            for name, key, description in [
+                    ('edutask_mongo_commands_total', 'count', 'Number of database commands per route and command.'),
+                    ('edutask_mongo_command_failures_total', 'failures', 'Number of failed database commands per route and command.'),
+                    ('edutask_mongo_command_seconds_total', 'seconds', 'Time spent in database commands per route and command.')]:
+                metric(name, 'counter', description)
+                for (route, command), counters in sorted(self.commands.items()):
+                    lines.append(f'{name}{labels(route=route, command=command)} {counters[key]}')
+
+        poolstats = getPoolStats()
+        for stat, kind, description in [
+                ('open', 'gauge', 'Number of open connections of the connection pool.'),
+                ('checkedOut', 'gauge', 'Number of connections currently checked out of the connection pool.'),
+                ('created', 'counter', 'Number of connections created by the connection pool.'),
+                ('closed', 'counter', 'Number of connections closed by the connection pool.'),
+                ('checkoutsStarted', 'counter', 'Number of connection checkouts.'),
+                ('checkoutsFailed', 'counter', 'Number of failed connection checkouts.')]:
+            name = f'edutask_mongo_pool_{snakecase(stat)}'
+            metric(name, kind, description)
+            lines.append(f'{name} {poolstats.get(stat, 0)}')
+        if 'maxPoolSize' in poolstats['options']:
+            metric('edutask_mongo_pool_max_size', 'gauge', 'Configured maximum size of the connection pool.')
+            lines.append(f'edutask_mongo_pool_max_size {poolstats["options"]["maxPoolSize"]}')
+
+        cache = getCache()
+        if cache is not None:
+            cachestats = cache.stats()
+            for stat, kind in [('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'), ('size', 'gauge')]:
+                name = f'edutask_doc_cache_{stat}' + ('_total' if kind == 'counter' else '')
+                metric(name, kind, f'Document cache {stat}.')
+                lines.append(f'{name} {cachestats[stat]}')
+
+        return '\n'.join(lines) + '\n'
+
+def labels(**values):
+    """Format the labels of a metric sample, e.g., {method="GET",route="/tasks/byid/<id>"}."""
+    escaped = [(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for key, value in values.items()]
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+def snakecase(name: str):
+    return ''.join(f'_{c.lower()}' if c.isupper() else c for c in name)
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Command listener, which attributes every database command to the route of the request during which it is
+    executed (see currentroute), and records its duration.
+    """
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.metrics.observeCommand(currentroute.get(), event.command_name, event.duration_micros / 1e6, False)
+
+    def failed(self, event):
+        self.metrics.observeCommand(currentroute.get(), event.command_name, event.duration_micros / 1e6, True)
+
+metrics = None
+lock = threading.Lock()
+
+def getMetrics():
+    """Obtain the metrics of this process. The purpose of the realization using the singleton pattern is that the
+    command listener, which is registered once for all MongoClients, records into the same metrics as the requests.
+
+    returns:
+        metrics -- the Metrics of this process
+    """
+    global metrics
+
+    if metrics is None:
+        with lock:
+            if metrics is None:
+                metrics = Metrics()
+                # the listener applies to all MongoClients created afterwards (see src.util.clients.getClient)
+                monitoring.register(CommandMetricsListener(metrics))
+    return metrics
+
+def initMetrics(app):
+    """Register the instrumentation of the requests of the app, which records the latency and status code per route
+    and attributes the database commands executed while serving a request to its route.
+
+    parameters:
+        app -- the flask app
+    """
+    appmetrics = getMetrics()
+
+    @app.before_request
+    def start():
+        g.metricsstart = time.perf_counter()
+        g.metricsroute = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        g.metricstoken = currentroute.set(g.metricsroute)
+
+    @app.after_request
+    def record(response):
+        if 'metricsstart' in g:
+            appmetrics.observeRequest(request.method, g.metricsroute, response.status_code, time.perf_counter() - g.metricsstart)
+        return response
+
+    @app.teardown_request
+    def stop(exception):
+        # streamed responses are torn down after the stream is exhausted, such that their commands are attributed too
+        token = g.pop('metricstoken', None)
+        if token is not None:
+            try:
+                currentroute.reset(token)
+            except ValueError:
+                # the token was created in another context
+                currentroute.set('none')
@@ -0,0 +1,74 @@
+from bson.objectid import ObjectId
+
+MAX_LIMIT = 1000
+
+def getPagination(args: dict):
+    """Obtain the keyset pagination parameters of a request. Pagination is requested by the query parameter limit
+    (the page size) and optionally the query parameter after (the cursor returned with the previous page).
+
+    parameters:
+        args -- the query parameters of the request
+
+    returns:
+        (limit, after) -- tuple of the page size and the cursor (None for the first page)
+        None -- if the request does not ask for pagination
+
+    raises:
+        ValueError -- in case the limit is not a positive integer of at most MAX_LIMIT or the cursor is not a valid id
+    """
+    if 'limit' not in args:
+        return None
+
+    limit = int(args['limit'])
+    if limit < 1 or limit > MAX_LIMIT:
+        raise ValueError(f'Error: limit must be between 1 and {MAX_LIMIT}')
+
+    after = args.get('after') or None
+    if after is not None and not ObjectId.is_valid(after):
+        raise ValueError('Error: invalid cursor')
+
+    return limit, after
+
+def getIds(args: dict):
+    """Obtain the ids of a multi-get request, given by the query parameter ids either repeatedly (ids=a&ids=b) or as a
+    comma-separated list (ids=a,b). Duplicate ids are removed.
+
+    parameters:
+        args -- the query parameters of the request
+
+    returns:
+        ids -- list of ids in the order of the request
+
+    raises:
+        ValueError -- in case no ids, more than MAX_LIMIT ids, or invalid ids are given
+    """
+    ids = []
+    for value in args.getlist('ids'):
+        for id in value.split(','):
+            id = id.strip()
+            if id and id not in ids:
+                ids.append(id)
+
+    if len(ids) == 0 or len(ids) > MAX_LIMIT:
+        raise ValueError(f'Error: between 1 and {MAX_LIMIT} ids must be given')
+    if not all(ObjectId.is_valid(id) for id in ids):
+        raise ValueError('Error: invalid id')
+    return ids
+
+def getDone(value):
+    """Obtain the done flag of a request, given either as a json boolean or as the string 'true' or 'false' (in any case).
+
+    parameters:
+        value -- the given done flag
+
+    returns:
+        done -- the flag as a boolean
+
+    raises:
+        ValueError -- in case the flag is neither a boolean nor the string 'true' or 'false'
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', 'false'):
+        return value.strip().lower() == 'true'
+    raise ValueError('Error: done must be a boolean or the string \'true\' or \'false\'')
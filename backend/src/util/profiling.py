@@ -0,0 +1,115 @@
+import io
+import os
+import time
+import pstats
+import cProfile
+import tempfile
+import threading
+
+from flask import request, g, Response
+
+from src.util.config import getSetting
+
+# held while a request is being profiled, such that at most one request of the process is profiled at a time (since
+# Python 3.12, cProfile is based on sys.monitoring, which admits one active profiler per process only)
+profilerlock = threading.Lock()
+
+def getProfilingConfig():
+    """Read the configuration of the profiling hook from the environment or the local .env file.
+
+    returns:
+        config -- dict containing whether profiling is enabled, the directory of the profile files, the number of
+            functions listed in inline profiles, and the sort order
+    """
+    return {
+        'enabled': getSetting('PROFILING', 'off').lower() in ('on', 'true', '1'),
+        'directory': getSetting('PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'edutask-profiles')),
+        'limit': int(getSetting('PROFILING_LIMIT', 50)),
+        'sort': getSetting('PROFILING_SORT', 'cumulative')
+    }
+
+def requestedProfile():
+    """Determine whether the current request asks to be profiled, via the header X-Profile or the query parameter
+    profile, whose value is either 'inline' (return the profile instead of the response) or 'file' (dump the
+    profile to a file).
+
+    returns:
+        mode -- 'inline' or 'file'
+        None -- if the request does not ask to be profiled
+    """
+    mode = request.headers.get('X-Profile', request.args.get('profile'))
+    if mode is None:
+        return None
+    return 'inline' if mode.lower() == 'inline' else 'file'
+
+def initProfiling(app):
+    """Register an opt-in hook, which profiles single requests on demand (see requestedProfile). The hook is only
+    active if the environment variable PROFILING is set to 'on'. If ADMIN_TOKEN is set, the request additionally has
+    to present it in the header X-Admin-Token. The profiles are deterministic (cProfile) and cover the request thread. Only one
+    request of the process is profiled at a time: while another request is being profiled, a request asking to be
+    profiled is served without profile and the header X-Profile-Skipped.
+
+    parameters:
+        app -- the flask app
+    """
+    config = getProfilingConfig()
+    if not config['enabled']:
+        return
+
+    @app.before_request
+    def start():
+        mode = requestedProfile()
+        token = getSetting('ADMIN_TOKEN')
+        if mode is None or (token is not None and request.headers.get('X-Admin-Token') != token):
+            return
+
+        if not profilerlock.acquire(blocking=False):
+            g.profileskipped = 'Another request is being profiled'
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # another profiling tool is active (e.g., the process itself runs under a profiler)
+            profilerlock.release()
+            g.profileskipped = str(e)
+            return
+
+        g.profilelocked = True
+        g.profilemode = mode
+        g.profilestart = time.perf_counter()
+        g.profile = profile
+
+    @app.after_request
+    def stop(response):
+        if 'profileskipped' in g:
+            response.headers['X-Profile-Skipped'] = g.pop('profileskipped')
+        if 'profile' not in g:
+            return response
+        profile = g.pop('profile')
+        profile.disable()
+        duration = time.perf_counter() - g.profilestart
+        stats = pstats.Stats(profile)
+
+        if g.profilemode == 'inline':
+            output = io.StringIO()
+            stats.stream = output
+            output.write(f'{request.method} {request.full_path} -> {response.status_code} in {duration * 1000:.1f} ms\n')
+            stats.sort_stats(config['sort']).print_stats(config['limit'])
+            return Response(output.getvalue(), mimetype='text/plain', headers={'X-Profile-Status': str(response.status_code)})
+
+        os.makedirs(config['directory'], exist_ok=True)
+        filename = f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{request.method}-{request.endpoint}-{int(duration * 1000)}ms.prof'
+        path = os.path.join(config['directory'], filename)
+        stats.dump_stats(path)
+        response.headers['X-Profile-File'] = path
+        return response
+
+    @app.teardown_request
+    def cleanup(exception):
+        # the profiler is still enabled if the request failed before the after_request hooks
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile.disable()
+        if g.pop('profilelocked', False):
+            profilerlock.release()
@@ -0,0 +1,131 @@
+import threading
+
+from pymongo import monitoring
+
+from src.util.clients import getClient
+from src.util.explain import EXPLAINABLE_COMMANDS, explainCommand, stages
+
+# commands which are not caused by the operation under test (e.g., issued by the driver when a session ends)
+IGNORED_COMMANDS = {'endSessions'}
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when an operation issues more database commands than its budget allows, or when one of its commands is
+    not backed by an index."""
+
+class CommandRecorder(monitoring.CommandListener):
+    """Command listener, which records the commands issued while at least one query budget is active. The listener is
+    registered once for all MongoClients (see register), and records for all budgets which are currently active.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.budgets = []
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        with self.lock:
+            for budget in self.budgets:
+                budget.commands.append({
+                    'command': event.command_name,
+                    'database': event.database_name,
+                    'document': dict(event.command)
+                })
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+recorder = None
+lock = threading.Lock()
+
+def register():
+    """Register the command recorder with pymongo (once per process). Since pymongo only applies listeners to clients
+    created afterwards, this has to happen before the shared MongoClient is created (see src.util.clients.getClient),
+    e.g., when the test suite is collected (see backend/conftest.py).
+
+    returns:
+        recorder -- the CommandRecorder
+    """
+    global recorder
+
+    if recorder is None:
+        with lock:
+            if recorder is None:
+                recorder = CommandRecorder()
+                monitoring.register(recorder)
+    return recorder
+
+class QueryBudget:
+    def __init__(self, limit: int, explain: bool = False, allow_collscan: list = None, database=None):
+        """Instantiate a query budget, which is a context manager asserting that the code executed within it issues at
+        most the given number of database commands (i.e., round trips, including getMore commands of cursors). When
+        explain is True, the find, aggregate, count, distinct, update, and delete commands are also explained, and
+        the budget fails if a winning plan scans a whole collection (COLLSCAN).
+
+        parameters:
+            limit -- the maximum number of database commands
+            explain -- if True, require index-backed plans for all explainable commands
+            allow_collscan -- names of collections for which a collection scan is acceptable (e.g., tiny lookup collections)
+            database -- the pymongo database against which the commands are explained (default: the database of the shared client)
+        """
+        self.limit = limit
+        self.explain = explain
+        self.allow_collscan = set(allow_collscan or [])
+        self.database = database
+        self.commands = []
+        self.recorder = register()
+
+    def __enter__(self):
+        with self.recorder.lock:
+            self.recorder.budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        with self.recorder.lock:
+            self.recorder.budgets.remove(self)
+        if exc_type is not None:
+            # do not mask the failure of the operation itself
+            return False
+
+        if len(self.commands) > self.limit:
+            raise QueryBudgetExceeded(
+                f'{len(self.commands)} database commands issued, but the budget allows {self.limit}: {self.summary()}')
+        if self.explain:
+            self.checkPlans()
+        return False
+
+    def summary(self):
+        """Return a short description of the recorded commands, e.g., ['aggregate user', 'find task']."""
+        return [f'{command["command"]} {command["document"].get(command["command"], "")}' for command in self.commands]
+
+    def checkPlans(self):
+        """Explain the recorded commands and raise QueryBudgetExceeded if any winning plan contains a COLLSCAN stage."""
+        for command in self.commands:
+            if command['command'] not in EXPLAINABLE_COMMANDS:
+                continue
+            collection = command['document'].get(command['command'])
+            if collection in self.allow_collscan:
+                continue
+
+            plan = self.explainCommand(command)
+            if 'COLLSCAN' in stages(plan):
+                raise QueryBudgetExceeded(f'{command["command"]} on {collection} is not backed by an index: {command["document"]}')
+
+    def explainCommand(self, command: dict):
+        database = self.database
+        if database is None:
+            database = getClient()[command['database']]
+        return explainCommand(database, command['command'], command['document'])
+
+def queryBudget(limit: int, explain: bool = False, allow_collscan: list = None, database=None):
+    """Create a query budget (see QueryBudget), e.g.:
+
+        with queryBudget(1, explain=True) as budget:
+            controller.get_tasks_of_user(id)
+
+    returns:
+        budget -- the QueryBudget, whose recorded commands are available as budget.commands
+    """
+    return QueryBudget(limit, explain=explain, allow_collscan=allow_collscan, database=database)
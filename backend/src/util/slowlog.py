@@ -0,0 +1,219 @@
+import json
+import queue
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from pymongo import monitoring
+
+from src.util.clients import getClient
+from src.util.config import getSetting
+from src.util.explain import EXPLAINABLE_COMMANDS, explainCommand, stages
+from src.util.metrics import currentroute
+
+logger = logging.getLogger('edutask.slowlog')
+
+# the part of a command document which determines which documents are read or written
+QUERY_FIELDS = {
+    'find': ['filter', 'projection', 'sort', 'limit'],
+    'aggregate': ['pipeline'],
+    'count': ['query'],
+    'distinct': ['key', 'query'],
+    'findAndModify': ['query', 'sort'],
+    'update': ['updates'],
+    'delete': ['deletes']
+}
+
+def getQuery(command_name: str, document: dict):
+    """Extract the filter or pipeline of a command document (e.g., {'filter': {...}} of a find command)."""
+    query = {field: document[field] for field in QUERY_FIELDS.get(command_name, []) if field in document}
+    # only the filters of bulk updates and deletes are relevant (and the number of statements)
+    if 'updates' in query:
+        query['updates'] = [statement.get('q') for statement in query['updates']]
+    if 'deletes' in query:
+        query['deletes'] = [statement.get('q') for statement in query['deletes']]
+    return query
+
+def getShape(value):
+    """Replace the values of a filter or pipeline with placeholders, such that queries which only differ in their
+    values (e.g., the id of a user) have the same shape, e.g., {'_id': {'$in': [...]}} becomes {'_id': {'$in': '?'}}.
+    Only field names and operators are kept, hence the shape contains no data (e.g., no email addresses).
+    """
+    if isinstance(value, dict):
+        return {key: getShape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        # pipelines and $and/$or are lists of expressions, whereas lists of values (e.g., of $in) are collapsed
+        if value and all(isinstance(item, dict) for item in value):
+            return [getShape(item) for item in value]
+        return '?'
+    return '?'
+
+def getCounts(command_name: str, reply: dict):
+    """Extract the number of returned, matched, or modified documents from the reply of a command."""
+    counts = {}
+    cursor = reply.get('cursor')
+    if isinstance(cursor, dict):
+        counts['returned'] = len(cursor.get('firstBatch', cursor.get('nextBatch', [])))
+    if 'n' in reply:
+        counts['n'] = reply['n']
+    if 'nModified' in reply:
+        counts['modified'] = reply['nModified']
+    if isinstance(reply.get('values'), list):
+        counts['returned'] = len(reply['values'])
+    return counts
+
+class SlowLog(monitoring.CommandListener):
+    def __init__(self, threshold: float, size: int = 100, verbosity: str = 'queryPlanner'):
+        """Instantiate a log of slow database operations. It is a command listener, which records every command that
+        takes at least the threshold into a bounded ring buffer (the oldest operations are dropped first) and writes
+        it to the log 'edutask.slowlog' as a JSON line. The explain plan of a slow query is captured on a background
+        thread, such that the request is not delayed further.
+
+        parameters:
+            threshold -- duration in milliseconds from which a command is considered slow
+            size -- maximum number of operations kept in the ring buffer
+            verbosity -- verbosity of the explain plans ('queryPlanner', 'executionStats', or 'none' to disable them)
+        """
+        self.threshold = threshold
+        self.verbosity = verbosity
+        self.lock = threading.Lock()
+        self.entries = deque(maxlen=size)
+        self.count = 0
+        # the command documents of the commands in progress, by connection and request id
+        self.started_commands = {}
+        # slow queries waiting for their explain plan (queries are dropped while the queue is full)
+        self.explains = queue.Queue(maxsize=size)
+        self.explainer = None
+
+    def started(self, event):
+        if event.command_name in QUERY_FIELDS or event.command_name == 'getMore':
+            self.started_commands[(event.connection_id, event.request_id)] = event.command
+
+    def succeeded(self, event):
+        self.finish(event, event.reply, False)
+
+    def failed(self, event):
+        self.finish(event, {}, True)
+
+    def finish(self, event, reply: dict, failed: bool):
+        document = self.started_commands.pop((event.connection_id, event.request_id), None)
+        duration = event.duration_micros / 1000
+        if duration < self.threshold or event.command_name == 'explain':
+            return
+
+        document = document or {}
+        # only the shape of the query is recorded and logged, since its values may contain personal data
+        shape = getShape(getQuery(event.command_name, document))
+        entry = {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'route': currentroute.get(),
+            'database': event.database_name,
+            'collection': document.get(event.command_name) if event.command_name != 'getMore' else document.get('collection'),
+            'command': event.command_name,
+            'durationMs': round(duration, 3),
+            'failed': failed,
+            'counts': getCounts(event.command_name, reply),
+            'shape': shape,
+            'plan': None
+        }
+        with self.lock:
+            self.count += 1
+            entry['id'] = self.count
+            self.entries.append(entry)
+        logger.warning(json.dumps(entry))
+
+        if self.verbosity != 'none' and event.command_name in EXPLAINABLE_COMMANDS:
+            try:
+                self.explains.put_nowait((entry, event.database_name, event.command_name, document))
+                self.startExplainer()
+            except queue.Full:
+                pass
+
+    def startExplainer(self):
+        if self.explainer is None or not self.explainer.is_alive():
+            with self.lock:
+                if self.explainer is None or not self.explainer.is_alive():
+                    self.explainer = threading.Thread(target=self.explain, name='slowlog-explain', daemon=True)
+                    self.explainer.start()
+
+    def explain(self):
+        """Capture the explain plans of the queued slow queries (executed on the background thread)."""
+        while True:
+            entry, database, command_name, document = self.explains.get()
+            try:
+                plan = explainCommand(getClient()[database], command_name, document, self.verbosity)
+                entry['plan'] = summarizePlan(plan)
+            except Exception as e:
+                entry['plan'] = {'error': f'{e.__class__.__name__}: {e}'}
+            finally:
+                self.explains.task_done()
+
+    def getEntries(self):
+        """Return the recorded slow operations, the slowest first."""
+        with self.lock:
+            return sorted(self.entries, key=lambda entry: entry['durationMs'], reverse=True)
+
+    def getShapes(self):
+        """Group the recorded slow operations by collection, command, and query shape, the shapes with the highest
+        total duration first."""
+        shapes = {}
+        for entry in self.getEntries():
+            key = (entry['collection'], entry['command'], json.dumps(entry['shape'], sort_keys=True))
+            shape = shapes.setdefault(key, {
+                'collection': entry['collection'],
+                'command': entry['command'],
+                'shape': entry['shape'],
+                'routes': [],
+                'count': 0,
+                'totalMs': 0,
+                'maxMs': 0
+            })
+            shape['count'] += 1
+            shape['totalMs'] = round(shape['totalMs'] + entry['durationMs'], 3)
+            shape['maxMs'] = max(shape['maxMs'], entry['durationMs'])
+            if entry['route'] not in shape['routes']:
+                shape['routes'].append(entry['route'])
+        return sorted(shapes.values(), key=lambda shape: shape['totalMs'], reverse=True)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+def summarizePlan(plan: dict):
+    """Reduce an explain output to the stages of the winning plan and, if available, the execution statistics."""
+    summary = {'stages': sorted(stages(plan))}
+    statistics = plan.get('executionStats')
+    if statistics is None:
+        # the statistics of an aggregation are part of its $cursor stage
+        for stage in plan.get('stages', []):
+            statistics = stage.get('$cursor', {}).get('executionStats', statistics)
+    if statistics is not None:
+        for key in ['nReturned', 'totalKeysExamined', 'totalDocsExamined', 'executionTimeMillis']:
+            if key in statistics:
+                summary[key] = statistics[key]
+    return summary
+
+slowlog = None
+lock = threading.Lock()
+
+def getSlowLog():
+    """Obtain the slow operation log of this process as configured by the environment variables SLOW_QUERY_MS
+    (threshold in milliseconds, default 100), SLOW_QUERY_BUFFER (number of kept operations, default 100), and
+    SLOW_QUERY_EXPLAIN (queryPlanner, executionStats, or none). The listener is registered once for all MongoClients
+    created afterwards (see src.util.clients.getClient).
+
+    returns:
+        slowlog -- the SlowLog of this process
+    """
+    global slowlog
+
+    if slowlog is None:
+        with lock:
+            if slowlog is None:
+                slowlog = SlowLog(
+                    threshold=float(getSetting('SLOW_QUERY_MS', 100)),
+                    size=int(getSetting('SLOW_QUERY_BUFFER', 100)),
+                    verbosity=getSetting('SLOW_QUERY_EXPLAIN', 'queryPlanner'))
+                monitoring.register(slowlog)
+    return slowlog
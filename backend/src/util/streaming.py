@@ -0,0 +1,37 @@
+from flask import Response, current_app, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wantsStream(request):
+    """Check whether a request opts in to a streamed response, either by the query parameter stream=ndjson or by
+    accepting newline-delimited JSON (application/x-ndjson) rather than JSON.
+
+    parameters:
+        request -- the flask request
+
+    returns:
+        True -- if the response should be streamed as newline-delimited JSON
+        False -- otherwise
+    """
+    if request.args.get('stream') == 'ndjson':
+        return True
+    return request.accept_mimetypes[NDJSON_MIMETYPE] > request.accept_mimetypes['application/json']
+
+def ndjsonResponse(objs):
+    """Create a response which streams the given objects as newline-delimited JSON (one object per line) while they
+    are produced, such that the response body is never held in memory as a whole.
+
+    parameters:
+        objs -- iterable (e.g., a generator reading from a database cursor) of objects serializable by the JSON provider of the app
+
+    returns:
+        response -- the streamed flask response
+    """
+    # the objects are serialized by the JSON provider of the app, which may accept raw MongoDB documents
+    provider = current_app.json
+
+    def generate():
+        for obj in objs:
+            yield provider.dumps(obj) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
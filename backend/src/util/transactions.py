@@ -0,0 +1,88 @@
+import threading
+
+from pymongo.errors import OperationFailure
+
+from src.util.clients import getClient
+from src.util.config import getSetting
+
+# error code of a transaction on a server which does not support transactions (e.g., a standalone mongod)
+ILLEGAL_OPERATION = 20
+
+# whether the server supports transactions (None until determined by the first transaction)
+supported = None
+lock = threading.Lock()
+
+def transactionsEnabled():
+    """Determine whether operations are executed in transactions, as configured by the environment variable
+    TRANSACTIONS: 'on' (always, failing on servers without transaction support), 'off' (never), or 'auto' (default:
+    use transactions if the server supports them, i.e., if it is a replica set member or a mongos).
+
+    returns:
+        enabled -- True, False, or None if it depends on the server (auto)
+    """
+    mode = getSetting('TRANSACTIONS', 'auto').lower()
+    if mode in ('on', 'true', '1'):
+        return True
+    if mode in ('off', 'false', '0'):
+        return False
+    return supported
+
+def runInTransaction(func):
+    """Execute a function, which performs database operations, in one multi-document transaction. The function is
+    called with a pymongo ClientSession, which it has to pass to every database operation (see the session parameter
+    of src.util.dao.DAO). The transaction is retried as a whole in case of transient errors, hence the function may be
+    called multiple times and must not have side effects other than the operations in the session. Side effects which
+    depend on the writes (e.g., cache invalidations) are deferred until the commit with afterCommit.
+
+    If transactions are disabled or not supported by the server (see transactionsEnabled), the function is called
+    once with the session None instead, such that the operations are executed one after another without transaction.
+
+    parameters:
+        func -- the function, which takes the session (or None) as only parameter
+
+    returns:
+        result -- the return value of the function
+
+    raises:
+        Exception -- in case any database operation fails
+    """
+    global supported
+
+    enabled = transactionsEnabled()
+    if enabled is False:
+        return func(None)
+
+    def attempt(session):
+        # the callbacks of an aborted attempt are discarded together with its writes
+        session.aftercommit = []
+        return func(session)
+
+    try:
+        with getClient().start_session() as session:
+            result = session.with_transaction(attempt)
+            for callback in session.aftercommit:
+                callback()
+            return result
+    except OperationFailure as e:
+        if e.code != ILLEGAL_OPERATION or enabled:
+            raise
+        # the server does not support transactions (the failed transaction did not write anything)
+        with lock:
+            supported = False
+        print(f'Transactions are not supported by the server, continuing without: {e}')
+    return func(None)
+
+def afterCommit(session, callback):
+    """Defer a callback (e.g., the invalidation of cached documents) until the transaction of the given session has
+    been committed by runInTransaction. If the operation is not part of such a transaction (e.g., the session is None),
+    the callback is executed immediately.
+
+    parameters:
+        session -- the pymongo ClientSession of the operation, or None
+        callback -- function without parameters
+    """
+    callbacks = getattr(session, 'aftercommit', None)
+    if callbacks is None:
+        callback()
+    else:
+        callbacks.append(callback)
@@ -0,0 +1,94 @@
+"""
+Integration tests which bound the number of database commands of the task operations (see src/util/querybudget.py),
+such that N+1 query patterns fail the tests. They require the MongoDB configured via MONGO_URL.
+"""
+
+import pytest
+
+from src.app import create_app
+from src.controllers.usercontroller import UserController
+from src.controllers.taskcontroller import TaskController
+from src.util.daos import getDao, warmup
+
+@pytest.fixture
+def controllers():
+    # bootstrap the collections outside of the budgets
+    warmup()
+    usercontroller = UserController(getDao(collection_name='user'))
+    taskcontroller = TaskController(tasks_dao=getDao(collection_name='task'), videos_dao=getDao(collection_name='video'), todos_dao=getDao(collection_name='todo'), users_dao=getDao(collection_name='user'))
+    return usercontroller, taskcontroller
+
+@pytest.fixture
+def user(controllers):
+    usercontroller, taskcontroller = controllers
+    user = usercontroller.create({'firstName': 'Query', 'lastName': 'Budget', 'email': 'query.budget@example.com'})
+    id = user['_id']['$oid']
+    for title in ['Videos', 'Stacks', 'Tips']:
+        taskcontroller.create({'userid': id, 'title': title, 'description': 'Watch', 'url': 'dQw4w9WgXcQ', 'todos': ['Watch video', 'Take notes']})
+
+    yield id
+
+    taskcontroller.delete_of_user(id)
+    usercontroller.delete(id)
+
+@pytest.mark.integration
+def test_create_task(controllers, user, query_budget):
+    # the check of the user, video, todos, task, the reference of the user, and the commit of the transaction (if supported by the server)
+    with query_budget(6):
+        controllers[1].create({'userid': user, 'title': 'Budget', 'description': 'Watch', 'url': 'dQw4w9WgXcQ', 'todos': ['a', 'b', 'c']})
+
+@pytest.mark.integration
+def test_create_task_route(user, query_budget):
+    client = create_app().test_client()
+    # the writes of the task creation and the populated new task, independent of the number of tasks of the user
+    with query_budget(7):
+        response = client.post('/tasks/create', data={'userid': user, 'title': 'Budget', 'description': 'Watch', 'url': 'dQw4w9WgXcQ', 'todos': ['a', 'b']})
+    assert response.status_code == 200
+    assert response.json['title'] == 'Budget'
+    assert [todo['description'] for todo in response.json['todos']] == ['a', 'b']
+
+    response = client.post('/tasks/create?all=true', data={'userid': user, 'title': 'All', 'description': 'Watch', 'url': 'dQw4w9WgXcQ', 'todos': ['a']})
+    assert sorted(task['title'] for task in response.json) == ['All', 'Budget', 'Stacks', 'Tips', 'Videos']
+
+@pytest.mark.integration
+def test_get_tasks_of_user(controllers, user, query_budget):
+    with query_budget(1, explain=True):
+        tasks = controllers[1].get_tasks_of_user(user)
+    assert len(tasks) == 3
+
+@pytest.mark.integration
+def test_get_task(controllers, user, query_budget):
+    taskid = controllers[1].get_tasks_of_user(user)[0]['_id']['$oid']
+    with query_budget(1, explain=True):
+        controllers[1].get(taskid)
+
+@pytest.mark.integration
+def test_delete_of_user(controllers, user, query_budget):
+    # the user, the tasks, and one delete per collection, independent of the number of tasks
+    with query_budget(5, explain=True):
+        assert controllers[1].delete_of_user(user) == 3
+
+@pytest.mark.integration
+def test_tasks_of_user_route(user, query_budget):
+    client = create_app().test_client()
+    # the versions for the entity tag and the populated tasks
+    with query_budget(2):
+        response = client.get(f'/tasks/ofuser/{user}')
+    assert response.status_code == 200
+
+    with query_budget(1):
+        response = client.get(f'/tasks/ofuser/{user}', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+@pytest.mark.integration
+def test_task_route(controllers, user, query_budget):
+    client = create_app().test_client()
+    taskid = controllers[1].get_tasks_of_user(user)[0]['_id']['$oid']
+    # the entity tag is derived from the populated task, which is built by one aggregation
+    with query_budget(1):
+        response = client.get(f'/tasks/byid/{taskid}')
+    assert response.status_code == 200
+
+    with query_budget(1):
+        response = client.get(f'/tasks/byid/{taskid}', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
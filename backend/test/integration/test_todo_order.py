@@ -0,0 +1,37 @@
+"""
+Integration tests for the order of the todos of a task (backend/src/controllers/todocontroller.py and the population of
+tasks in backend/src/controllers/taskcontroller.py) against a running MongoDB.
+"""
+
+import pytest
+
+from src.app import create_app
+from src.controllers.usercontroller import UserController
+from src.controllers.taskcontroller import TaskController
+from src.util.daos import getDao, warmup
+
+@pytest.fixture
+def task():
+    warmup()
+    usercontroller = UserController(getDao(collection_name='user'))
+    taskcontroller = TaskController(tasks_dao=getDao(collection_name='task'), videos_dao=getDao(collection_name='video'), todos_dao=getDao(collection_name='todo'), users_dao=getDao(collection_name='user'))
+    user = usercontroller.create({'firstName': 'Todo', 'lastName': 'Order', 'email': 'todo.order@example.com'})
+    taskid = taskcontroller.create({'userid': user['_id']['$oid'], 'title': 'Order', 'description': 'Watch', 'url': 'dQw4w9WgXcQ', 'todos': ['a', 'b', 'c']})
+    yield user['_id']['$oid'], taskcontroller.get(taskid)
+
+    taskcontroller.delete_of_user(user['_id']['$oid'])
+    usercontroller.delete(user['_id']['$oid'])
+
+@pytest.mark.integration
+def test_reordered_todos_are_read_back_in_order(task):
+    userid, task = task
+    client = create_app().test_client()
+    todos = {todo['description']: todo['_id']['$oid'] for todo in task['todos']}
+
+    response = client.put(f'/todos/oftask/{task["_id"]["$oid"]}/order', data={'ids': ','.join(todos[description] for description in ['c', 'a', 'b'])})
+    assert response.status_code == 200
+
+    task = client.get(f'/tasks/byid/{task["_id"]["$oid"]}').json
+    assert [todo['description'] for todo in task['todos']] == ['c', 'a', 'b']
+    tasks = client.get(f'/tasks/ofuser/{userid}').json
+    assert [todo['description'] for todo in tasks[0]['todos']] == ['c', 'a', 'b']
@@ -0,0 +1,63 @@
+"""
+Integration tests for the deletion of users including their tasks (backend/src/controllers/jobcontroller.py), immediately
+and in the background, against a running MongoDB.
+"""
+
+import time
+
+import pytest
+
+from src.app import create_app
+from src.controllers.usercontroller import UserController
+from src.controllers.taskcontroller import TaskController
+from src.util.daos import getDao, warmup
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+@pytest.fixture
+def user():
+    warmup()
+    usercontroller = UserController(getDao(collection_name='user'))
+    taskcontroller = TaskController(tasks_dao=getDao(collection_name='task'), videos_dao=getDao(collection_name='video'), todos_dao=getDao(collection_name='todo'), users_dao=getDao(collection_name='user'))
+    user = usercontroller.create({'firstName': 'Purge', 'lastName': 'Job', 'email': 'purge.job@example.com'})
+    id = user['_id']['$oid']
+    tasks = [taskcontroller.create({'userid': id, 'title': f'Task {i}', 'description': 'Watch', 'url': 'dQw4w9WgXcQ', 'todos': ['a', 'b']}) for i in range(5)]
+    yield id, tasks
+
+    if usercontroller.dao.findOne(id) is not None:
+        taskcontroller.delete_of_user(id)
+        usercontroller.delete(id)
+
+@pytest.mark.integration
+def test_delete_user(client, user):
+    id, tasks = user
+    response = client.delete(f'/users/{id}')
+
+    assert response.status_code == 200
+    assert getDao(collection_name='user').findOne(id) is None
+    assert getDao(collection_name='task').find(filter={'_id': [{'$oid': task} for task in tasks]}, toid=['_id']) == []
+
+@pytest.mark.integration
+def test_delete_user_in_background(client, user, monkeypatch):
+    monkeypatch.setenv('PURGE_BATCH_SIZE', '2')
+    id, tasks = user
+    response = client.delete(f'/users/{id}?async=true')
+
+    assert response.status_code == 202
+    # the user is hidden immediately
+    assert client.get(f'/users/{id}').json is None
+
+    for _ in range(50):
+        job = client.get(response.headers['Location']).json
+        if job['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.1)
+    assert (job['status'], job['total'], job['deleted']) == ('done', 5, 5)
+    assert getDao(collection_name='user').findOne(id) is None
+    assert getDao(collection_name='task').find(filter={'_id': [{'$oid': task} for task in tasks]}, toid=['_id']) == []
+
+@pytest.mark.integration
+def test_job_not_found(client):
+    assert client.get('/users/jobs/000000000000000000000000').status_code == 404
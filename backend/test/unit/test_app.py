@@ -0,0 +1,58 @@
+"""
+Unit tests for the application factory (backend/src/app.py) and the lazy bootstrapping of the data access objects.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.app import create_app
+from src.util import config, dao as daomodule
+from src.util.dao import DAO
+
+@pytest.mark.unit
+def test_create_app_does_not_connect():
+    with patch.object(daomodule, 'getClient') as getclient:
+        app = create_app()
+        DAO(collection_name='todo')
+    assert 'task_blueprint' in app.blueprints
+    getclient.assert_not_called()
+
+@pytest.mark.unit
+def test_ping_does_not_read_env_file(monkeypatch):
+    monkeypatch.setenv('VERSION', 'v9.9.9')
+    app = create_app()
+    with patch.object(config, 'dotenv_values') as dotenvvalues:
+        response = app.test_client().get('/')
+    assert response.get_json() == {'version': 'v9.9.9'}
+    dotenvvalues.assert_not_called()
+
+@pytest.mark.unit
+def test_collection_is_bootstrapped_once():
+    database = MagicMock()
+    database.list_collection_names.return_value = ['todo']
+    client = MagicMock(edutask=database)
+
+    dao = DAO(collection_name='todo')
+    with patch.object(daomodule, 'getClient', return_value=client), \
+            patch.object(daomodule, 'ensureIndexes', return_value={}) as ensureindexes:
+        assert dao.collection is database['todo']
+        assert dao.collection is database['todo']
+    database.list_collection_names.assert_called_once()
+    database.create_collection.assert_not_called()
+    ensureindexes.assert_called_once()
+
+@pytest.mark.unit
+def test_collection_is_bootstrapped_again_after_fork():
+    dao = DAO.__new__(DAO)
+    dao.collection_name = 'todo'
+    dao.lock = MagicMock()
+    dao.collection = MagicMock()
+    # simulate the access of a forked child process
+    dao._pid = -1
+
+    database = MagicMock()
+    database.list_collection_names.return_value = []
+    with patch.object(daomodule, 'getClient', return_value=MagicMock(edutask=database)), \
+            patch.object(daomodule, 'ensureIndexes', return_value={}):
+        assert dao.collection is database['todo']
+    database.create_collection.assert_called_once()
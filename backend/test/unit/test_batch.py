@@ -0,0 +1,160 @@
+"""
+Unit tests for the batch endpoint (backend/src/blueprints/batchblueprint.py) and the multi-get endpoints with mocked
+controllers.
+"""
+
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from pymongo.errors import WriteError
+
+from src.app import create_app
+from src.blueprints import batchblueprint, todoblueprint
+
+@pytest.fixture
+def app():
+    return create_app()
+
+@pytest.fixture
+def controllers():
+    with patch.object(batchblueprint, 'taskcontroller') as taskcontroller, \
+            patch.object(batchblueprint, 'todocontroller') as todocontroller:
+        yield taskcontroller, todocontroller
+
+@pytest.mark.unit
+def test_operations_are_executed_in_order(app, controllers):
+    taskcontroller, todocontroller = controllers
+    calls = []
+    todocontroller.update_and_get.side_effect = lambda id, data: calls.append('update') or {'_id': id, 'done': True}
+    taskcontroller.get.side_effect = lambda id: calls.append('get') or {'_id': id, 'todos': []}
+
+    response = app.test_client().post('/batch', json={'operations': [
+        {'op': 'todo.update', 'id': '1', 'data': {'$set': {'done': True}}},
+        {'op': 'task.get', 'id': '2'}
+    ]})
+
+    assert calls == ['update', 'get']
+    assert response.get_json()['results'] == [
+        {'status': 200, 'data': {'_id': '1', 'done': True}},
+        {'status': 200, 'data': {'_id': '2', 'todos': []}}
+    ]
+
+@pytest.mark.unit
+def test_results_per_operation(app, controllers):
+    taskcontroller, todocontroller = controllers
+    taskcontroller.get.return_value = None
+    todocontroller.create.side_effect = WriteError('Document failed validation', 121)
+
+    response = app.test_client().post('/batch', data={'operations': json.dumps([
+        {'op': 'task.get', 'id': '1'},
+        {'op': 'todo.create', 'data': {'description': 1}},
+        {'op': 'todo.update', 'id': '1'},
+        {'op': 'user.drop'}
+    ])})
+
+    assert [result['status'] for result in response.get_json()['results']] == [404, 400, 400, 400]
+    assert response.get_json()['results'][2]['error'] == 'Missing fields: data'
+
+@pytest.mark.unit
+def test_errors_do_not_leak_internals(app, controllers):
+    """
+    Invalid fields are rejected with fixed messages, whereas unexpected failures are reported as server errors.
+    """
+    taskcontroller, todocontroller = controllers
+    todocontroller.create.return_value = None
+    taskcontroller.get.side_effect = InvalidId('nope is not a valid ObjectId')
+    taskcontroller.update_and_get.side_effect = TypeError("'NoneType' object is not subscriptable")
+
+    response = app.test_client().post('/batch', json=[
+        {'op': 'todo.create', 'data': {'description': 'a', 'taskid': str(ObjectId())}},
+        {'op': 'task.get', 'id': 'nope'},
+        {'op': 'task.get', 'id': 1},
+        {'op': 'todo.update', 'id': '1', 'data': 'done'},
+        {'op': 'todo.create', 'data': {'description': 'a', 'taskid': 1}},
+        {'op': 'task.update', 'id': '1', 'data': {}}
+    ])
+
+    assert response.get_json()['results'] == [
+        {'status': 404, 'error': 'Not found'},
+        {'status': 400, 'error': 'Error: invalid id'},
+        {'status': 400, 'error': 'Invalid fields: id'},
+        {'status': 400, 'error': 'Invalid fields: data'},
+        {'status': 400, 'error': 'Error: invalid id'},
+        {'status': 500, 'error': 'Unknown server error'}
+    ]
+
+@pytest.mark.unit
+def test_stop_on_error(app, controllers):
+    taskcontroller, todocontroller = controllers
+    taskcontroller.get.return_value = None
+
+    response = app.test_client().post('/batch', json={'stopOnError': True, 'operations': [
+        {'op': 'task.get', 'id': '1'},
+        {'op': 'todo.delete', 'id': '2'}
+    ]})
+
+    assert len(response.get_json()['results']) == 1
+    todocontroller.delete.assert_not_called()
+
+@pytest.mark.unit
+def test_set_done_parses_done(app, controllers):
+    """
+    The operation todo.setdone accepts json booleans and the strings 'true' and 'false', and rejects anything else.
+    """
+    _, todocontroller = controllers
+    todocontroller.set_done.return_value = 1
+    values = [True, False, 'true', 'False', 'no', 'yes', 0, 1, None, []]
+
+    response = app.test_client().post('/batch', json=[{'op': 'todo.setdone', 'taskid': '1', 'done': done} for done in values])
+
+    assert [result['status'] for result in response.get_json()['results']] == [200] * 4 + [400] * 6
+    assert [call.args[1] for call in todocontroller.set_done.call_args_list] == [True, False, True, False]
+
+@pytest.mark.unit
+def test_invalid_batch(app, monkeypatch):
+    monkeypatch.setenv('BATCH_MAX_OPERATIONS', '2')
+    client = app.test_client()
+    assert client.post('/batch', data={'operations': 'nope'}).status_code == 400
+    assert client.post('/batch', json=[{'op': 'task.get', 'id': '1'}] * 3).status_code == 400
+
+@pytest.mark.unit
+def test_todos_by_ids(app):
+    ids = [str(ObjectId()), str(ObjectId())]
+    with patch.object(todoblueprint, 'controller') as controller:
+        controller.get_many.return_value = [{'_id': {'$oid': id}} for id in ids]
+        client = app.test_client()
+
+        response = client.get(f'/todos/byids?ids={ids[0]},{ids[1]}&ids={ids[0]}')
+        assert response.status_code == 200
+        assert controller.get_many.call_args.args[0] == ids
+
+        assert client.get('/todos/byids?ids=nope').status_code == 400
+        assert client.get('/todos/byids').status_code == 400
+
+@pytest.mark.unit
+def test_set_done_route_parses_done(app):
+    """
+    PUT /todos/oftask/<taskid>/done accepts the same done flags as the operation todo.setdone and rejects anything else.
+    """
+    with patch.object(todoblueprint, 'controller') as controller:
+        controller.set_done.return_value = 1
+        client = app.test_client()
+
+        statuses = [client.put('/todos/oftask/1/done', data={'done': done}).status_code for done in ['true', 'False', 'no', 'yes', '1', '']]
+        assert statuses == [200, 200, 400, 400, 400, 400]
+        assert [call.args[1] for call in controller.set_done.call_args_list] == [True, False]
+
+@pytest.mark.unit
+def test_oftask_routes_reject_invalid_ids(app):
+    with patch.object(todoblueprint, 'controller') as controller:
+        controller.set_done.side_effect = InvalidId('nope')
+        controller.clear_completed.side_effect = InvalidId('nope')
+        controller.reorder.side_effect = InvalidId('nope')
+        client = app.test_client()
+
+        assert client.put('/todos/oftask/nope/done', data={'done': 'true'}).status_code == 400
+        assert client.delete('/todos/oftask/nope/completed').status_code == 400
+        assert client.put('/todos/oftask/nope/order', data={'ids': 'a'}).status_code == 400
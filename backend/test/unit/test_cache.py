@@ -0,0 +1,132 @@
+"""
+Unit tests for the document cache (backend/src/util/cache.py) and its use in the data access object.
+"""
+
+import sqlite3
+
+import pytest
+from unittest.mock import MagicMock
+
+from bson.objectid import ObjectId
+
+from src.util.cache import MemoryCache, SQLiteCache
+from src.util.dao import DAO
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryCache(maxsize=2, ttl=60)
+    return SQLiteCache(str(tmp_path / 'cache.sqlite'), maxsize=2, ttl=60)
+
+@pytest.mark.unit
+def test_cache_counts_hits_and_misses(cache):
+    cache.set('user:1', {'firstName': 'Jane'})
+
+    assert cache.get('user:1') == {'firstName': 'Jane'}
+    assert cache.get('user:2') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+@pytest.mark.unit
+def test_cache_evicts_least_recently_used(cache):
+    cache.set('user:1', {'n': 1})
+    cache.set('user:2', {'n': 2})
+    cache.get('user:1')
+    cache.set('user:3', {'n': 3})
+
+    assert cache.get('user:2') is None
+    assert cache.get('user:1') == {'n': 1}
+    assert cache.stats()['size'] == 2
+
+@pytest.mark.unit
+def test_sqlite_hits_do_not_write(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite'), maxsize=2, ttl=60)
+    cache.set('user:1', {'n': 1})
+    changes = cache.connection().total_changes
+
+    assert cache.get('user:1') == {'n': 1}
+    assert cache.connection().total_changes == changes
+
+@pytest.mark.unit
+def test_sqlite_evicts_only_over_capacity(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite'), maxsize=3, ttl=60)
+    for i in range(3):
+        cache.set(f'user:{i}', {'n': i})
+    assert cache.stats()['evictions'] == 0
+
+    cache.set('user:3', {'n': 3})
+    assert cache.stats()['evictions'] == 1
+    assert cache.get('user:0') is None
+
+@pytest.mark.unit
+def test_dao_falls_back_to_database_if_cache_fails():
+    """
+    A failing cache (e.g., a SQLite file locked by another worker) neither fails reads nor writes.
+    """
+    dao = DAO.__new__(DAO)
+    dao.collection = MagicMock()
+    dao.collection_name = 'user'
+    dao.cache = MagicMock()
+    dao.cache.get.side_effect = sqlite3.OperationalError('database is locked')
+    dao.cache.set.side_effect = sqlite3.OperationalError('database is locked')
+    dao.cache.delete.side_effect = sqlite3.OperationalError('database is locked')
+    id = ObjectId()
+    dao.collection.find_one.return_value = {'_id': id, 'firstName': 'Jane'}
+
+    assert dao.findOne(str(id)) == {'_id': {'$oid': str(id)}, 'firstName': 'Jane'}
+    dao.update(str(id), {'$set': {'firstName': 'John'}})
+
+@pytest.mark.unit
+def test_cache_expires_documents():
+    cache = MemoryCache(maxsize=2, ttl=-1)
+    cache.set('user:1', {'n': 1})
+
+    assert cache.get('user:1') is None
+
+@pytest.mark.unit
+def test_cached_documents_are_copies():
+    cache = MemoryCache()
+    document = {'todos': []}
+    cache.set('task:1', document)
+    document['todos'].append('changed')
+
+    cache.get('task:1')['todos'].append('changed')
+    assert cache.get('task:1') == {'todos': []}
+
+@pytest.mark.unit
+def test_dao_reads_through_and_invalidates_on_update():
+    dao = DAO.__new__(DAO)
+    dao.collection = MagicMock()
+    dao.collection_name = 'user'
+    dao.cache = MemoryCache()
+    id = ObjectId()
+    dao.collection.find_one.return_value = {'_id': id, 'firstName': 'Jane'}
+
+    dao.findOne(str(id))
+    dao.findOne(str(id))
+    assert dao.collection.find_one.call_count == 1
+
+    dao.update(str(id), {'$set': {'firstName': 'John'}})
+    dao.findOne(str(id))
+    assert dao.collection.find_one.call_count == 2
+
+@pytest.mark.unit
+def test_dao_invalidates_after_commit_of_transaction():
+    """
+    A document written in a transaction stays cached until the commit, such that a read before the commit cannot cache the previous version again.
+    """
+    dao = DAO.__new__(DAO)
+    dao.collection = MagicMock()
+    dao.collection_name = 'user'
+    dao.cache = MemoryCache()
+    id = ObjectId()
+    dao.collection.find_one.return_value = {'_id': id, 'firstName': 'Jane'}
+    dao.findOne(str(id))
+
+    session = MagicMock(aftercommit=[])
+    dao.update(str(id), {'$set': {'firstName': 'John'}}, session=session)
+    assert dao.cache.get(dao.cache_key(str(id))) is not None
+
+    for callback in session.aftercommit:
+        callback()
+    assert dao.cache.get(dao.cache_key(str(id))) is None
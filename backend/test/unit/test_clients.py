@@ -0,0 +1,74 @@
+"""
+Unit tests for the shared MongoClient manager (backend/src/util/clients.py).
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from src.util import clients
+from src.util.clients import PoolStatsListener, getPoolOptions
+
+@pytest.mark.unit
+def test_pool_options_from_environment(monkeypatch):
+    """
+    The pool options are read from the environment and converted to integers, unset options are omitted.
+    """
+    monkeypatch.setenv('MONGO_MAX_POOL_SIZE', '20')
+    monkeypatch.setenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '500')
+    monkeypatch.delenv('MONGO_MAX_IDLE_TIME_MS', raising=False)
+
+    options = getPoolOptions()
+
+    assert options['maxPoolSize'] == 20
+    assert options['waitQueueTimeoutMS'] == 500
+    assert 'maxIdleTimeMS' not in options
+
+@pytest.mark.unit
+def test_pool_stats_listener_counts_connections():
+    """
+    The listener keeps track of open and checked out connections.
+    """
+    listener = PoolStatsListener()
+    listener.connection_created(None)
+    listener.connection_created(None)
+    listener.connection_checked_out(None)
+    listener.connection_checked_in(None)
+    listener.connection_checked_out(None)
+    listener.connection_closed(None)
+
+    assert listener.stats['open'] == 1
+    assert listener.stats['created'] == 2
+    assert listener.stats['checkedOut'] == 1
+
+@pytest.mark.unit
+@patch('src.util.clients.pymongo.MongoClient', autospec=True)
+def test_client_is_shared(mockedclient):
+    """
+    Every call to getClient returns the same MongoClient instance.
+    """
+    clients.closeClient()
+    try:
+        assert clients.getClient() is clients.getClient()
+        assert mockedclient.call_count == 1
+    finally:
+        clients.closeClient()
+
+@pytest.mark.unit
+def test_forked_child_does_not_inherit_client():
+    """
+    A forked child process (e.g., a worker of a pre-fork server) creates a client of its own.
+    """
+    sentinel = object()
+    clients.client = sentinel
+    try:
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, b'reset' if clients.client is None else b'inherited')
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert os.read(read, 16) == b'reset'
+        assert clients.client is sentinel
+    finally:
+        clients.client = None
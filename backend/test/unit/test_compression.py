@@ -0,0 +1,79 @@
+"""
+Unit tests for the compression of JSON responses (backend/src/util/compression.py).
+"""
+
+import gzip
+import json
+import zlib
+import pytest
+from flask import Flask, jsonify
+
+from src.util.compression import initCompression, compressStream, GzipCompressor
+from src.util.streaming import ndjsonResponse
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('COMPRESSION_MIN_SIZE', '100')
+    app = Flask(__name__)
+    initCompression(app)
+
+    @app.route('/large')
+    def large():
+        response = jsonify([{'_id': {'$oid': '%024d' % i}} for i in range(100)])
+        response.set_etag('abc')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify({'version': 'v1.0.0'})
+
+    @app.route('/stream')
+    def stream():
+        return ndjsonResponse({'_id': {'$oid': '%024d' % i}} for i in range(100))
+
+    return app.test_client()
+
+@pytest.mark.unit
+def test_large_response_is_compressed(client):
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == '"abc-gzip"'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(json.loads(gzip.decompress(response.data))) == 100
+
+@pytest.mark.unit
+def test_small_response_is_not_compressed(client):
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.json == {'version': 'v1.0.0'}
+
+@pytest.mark.unit
+def test_response_is_not_compressed_without_accepted_encoding(client):
+    response = client.get('/large', headers={'Accept-Encoding': 'identity'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.json) == 100
+
+@pytest.mark.unit
+def test_preferred_encoding_is_negotiated(client):
+    brotli = pytest.importorskip('brotli')
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip;q=0.5, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert len(json.loads(brotli.decompress(response.data))) == 100
+
+@pytest.mark.unit
+def test_streamed_response_is_compressed_incrementally(client):
+    response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(gzip.decompress(response.data).decode().splitlines()) == 100
+
+@pytest.mark.unit
+def test_first_chunk_is_flushed():
+    decompressor = zlib.decompressobj(31)
+    chunks = compressStream(iter(['{"a": 1}\n', '{"a": 2}\n']), GzipCompressor(6), flushsize=1024)
+
+    assert decompressor.decompress(next(chunks)) == b'{"a": 1}\n'
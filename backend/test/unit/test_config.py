@@ -0,0 +1,28 @@
+"""
+Unit tests for the configuration snapshot (backend/src/util/config.py).
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.util import config
+
+@pytest.fixture(autouse=True)
+def reload():
+    config.reloadConfig()
+    yield
+    config.reloadConfig()
+
+@pytest.mark.unit
+def test_env_file_is_read_once(monkeypatch):
+    monkeypatch.delenv('COLOR', raising=False)
+    with patch.object(config, 'dotenv_values', return_value={'COLOR': 'blue'}) as dotenvvalues:
+        assert config.getSetting('COLOR') == 'blue'
+        assert config.getSetting('SHAPE', 'circle') == 'circle'
+    dotenvvalues.assert_called_once()
+
+@pytest.mark.unit
+def test_environment_overrides_env_file(monkeypatch):
+    monkeypatch.setenv('COLOR', 'red')
+    with patch.object(config, 'dotenv_values', return_value={'COLOR': 'blue'}):
+        assert config.getSetting('COLOR') == 'red'
@@ -0,0 +1,51 @@
+"""
+Unit tests for the single-pass BSON to JSON converter (backend/src/util/converter.py). The converter must produce
+exactly the same output as the round trip via json_util.dumps and json.loads which it replaces.
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from bson import json_util, Int64, Decimal128
+from bson.objectid import ObjectId
+
+from src.util.converter import toJson
+
+def roundtrip(data):
+    return json.loads(json_util.dumps(data))
+
+@pytest.mark.unit
+@pytest.mark.parametrize('value', [
+    None,
+    'text',
+    True,
+    42,
+    3.5,
+    float('nan'),
+    ObjectId(),
+    datetime(2025, 4, 22, 8, 30),
+    datetime(2025, 4, 22, 8, 30, 15, 123456),
+    datetime(2025, 4, 22, 8, 30, tzinfo=timezone(timedelta(hours=2))),
+    datetime(1960, 1, 1),
+    Int64(7),
+    Decimal128('1.5'),
+    [ObjectId(), 'a', 1]
+])
+def test_values_match_json_util(value):
+    if isinstance(value, float) and value != value:
+        assert toJson(value) == roundtrip(value) == {'$numberDouble': 'NaN'}
+    else:
+        assert toJson(value) == roundtrip(value)
+
+@pytest.mark.unit
+def test_populated_task_matches_json_util():
+    task = {
+        '_id': ObjectId(),
+        'title': 'title',
+        'startdate': datetime.today(),
+        'categories': [],
+        'video': {'_id': ObjectId(), 'url': 'dQw4w9WgXcQ'},
+        'todos': [{'_id': ObjectId(), 'description': 'Watch video', 'done': False}]
+    }
+    assert toJson(task) == roundtrip(task)
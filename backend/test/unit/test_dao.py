@@ -0,0 +1,108 @@
+"""
+Unit tests for the data access object (backend/src/util/dao.py) with a mocked pymongo collection.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
+
+from src.util.dao import DAO
+
+@pytest.fixture
+def collection():
+    return MagicMock()
+
+@pytest.fixture
+def dao(collection):
+    # bypass the constructor, which connects to the database
+    dao = DAO.__new__(DAO)
+    dao.collection = collection
+    return dao
+
+@pytest.mark.unit
+def test_create_does_not_read_back(dao, collection):
+    """
+    The created object is built from the inserted data without a second query.
+    """
+    def insert_one(data, session=None):
+        data['_id'] = ObjectId()
+        return MagicMock(inserted_id=data['_id'])
+    collection.insert_one.side_effect = insert_one
+
+    data = {'description': 'Watch video', 'done': False}
+    result = dao.create(data)
+
+    assert result['description'] == 'Watch video'
+    assert '$oid' in result['_id']
+    assert '_id' not in data
+    collection.find_one.assert_not_called()
+
+@pytest.mark.unit
+def test_find_one_and_update_returns_post_image(dao, collection):
+    """
+    The updated object is returned by the same database operation which performs the update.
+    """
+    id = ObjectId()
+    collection.find_one_and_update.return_value = {'_id': id, 'done': True}
+
+    result = dao.findOneAndUpdate(str(id), {'$set': {'done': True}})
+
+    assert result == {'_id': {'$oid': str(id)}, 'done': True}
+    collection.find_one.assert_not_called()
+
+@pytest.mark.unit
+@pytest.mark.parametrize('ordered, executed', [(True, [0]), (False, [0, 2])])
+def test_create_many_reports_per_item_errors(dao, collection, ordered, executed):
+    """
+    A failing document is reported with its index, the other documents are returned depending on the ordering.
+    """
+    def bulk_write(requests, ordered, session=None):
+        for request in requests:
+            request._doc['_id'] = ObjectId()
+        raise BulkWriteError({'writeErrors': [{'index': 1, 'code': 121, 'errmsg': 'Document failed validation'}]})
+    collection.bulk_write.side_effect = bulk_write
+
+    result = dao.create_many([{'description': 'a'}, {'description': 1}, {'description': 'c'}], ordered=ordered)
+
+    assert result['errors'] == [{'index': 1, 'code': 121, 'message': 'Document failed validation'}]
+    assert [index for index, obj in enumerate(result['results']) if obj is not None] == executed
+
+@pytest.mark.unit
+def test_delete_many_uses_one_operation(dao, collection):
+    ids = [ObjectId(), ObjectId()]
+    collection.delete_many.return_value = MagicMock(deleted_count=2)
+
+    assert dao.delete_many([str(ids[0]), {'$oid': str(ids[1])}]) == 2
+    collection.delete_many.assert_called_once_with({'_id': {'$in': ids}}, session=None)
+
+@pytest.mark.unit
+def test_find_iter_is_lazy(dao, collection):
+    """
+    The objects are converted while iterating over the cursor, with projection, limit and batch size passed to the database.
+    """
+    ids = [ObjectId(), ObjectId()]
+    collection.find.return_value.__enter__.return_value = iter([{'_id': id} for id in ids])
+
+    objs = dao.findIter({'_id': [{'$oid': str(id)} for id in ids]}, toid=['_id'], projection={'_id': 1}, batch_size=1)
+
+    collection.find.assert_not_called()
+    assert next(objs) == {'_id': {'$oid': str(ids[0])}}
+    collection.find.assert_called_once_with({'_id': {'$in': ids}}, {'_id': 1}, limit=0, batch_size=1, session=None)
+
+@pytest.mark.unit
+@pytest.mark.parametrize('count, next', [(3, True), (2, False)])
+def test_find_page_returns_cursor_of_next_page(dao, collection, count, next):
+    """
+    A page continues after the given cursor and returns the id of its last object as the next cursor if there are more objects.
+    """
+    ids = sorted(ObjectId() for _ in range(count))
+    collection.find.return_value = [{'_id': id} for id in ids]
+    after = ObjectId()
+
+    page = dao.findPage(limit=2, after=str(after))
+
+    assert len(page['data']) == 2
+    assert page['next'] == (str(ids[1]) if next else None)
+    collection.find.assert_called_once_with({'_id': {'$gt': after}}, None, sort=[('_id', 1)], limit=3)
@@ -0,0 +1,101 @@
+"""
+Unit tests for the entity tags of conditional GET requests (backend/src/util/etags.py).
+"""
+
+import bson
+import pytest
+from unittest.mock import patch
+from flask import Flask, request
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from src.app import create_app
+from src.blueprints import taskblueprint, userblueprint
+from src.util.etags import computeETag, notModified
+
+app = Flask(__name__)
+
+TASK = [{'_id': {'$oid': '1'}, '_version': 1, 'video': {'_id': {'$oid': '2'}, '_version': 1}, 'todos': [{'_id': {'$oid': '3'}, '_version': 4}]}]
+
+@pytest.mark.unit
+def test_etag_changes_with_nested_versions():
+    changed = [{'_id': {'$oid': '1'}, '_version': 1, 'video': {'_id': {'$oid': '2'}, '_version': 1}, 'todos': [{'_id': {'$oid': '3'}, '_version': 5}]}]
+
+    with app.test_request_context('/tasks/byid/1'):
+        assert computeETag(TASK, request) == computeETag(TASK, request)
+        assert computeETag(TASK, request) != computeETag(changed, request)
+
+@pytest.mark.unit
+def test_etag_depends_on_query():
+    with app.test_request_context('/tasks/ofuser/1'):
+        etag = computeETag(TASK, request)
+    with app.test_request_context('/tasks/ofuser/1?limit=1'):
+        assert computeETag(TASK, request) != etag
+
+@pytest.mark.unit
+def test_not_modified_if_etag_matches():
+    with app.test_request_context('/tasks/byid/1'):
+        etag = computeETag(TASK, request)
+    with app.test_request_context('/tasks/byid/1', headers={'If-None-Match': f'"{etag}"'}):
+        response = notModified(request, etag)
+        assert response.status_code == 304
+        assert response.headers['ETag'] == f'"{etag}"'
+    with app.test_request_context('/tasks/byid/1', headers={'If-None-Match': '"other"'}):
+        assert notModified(request, etag) is None
+
+@pytest.mark.unit
+def test_pages_are_tagged_by_their_own_versions():
+    """
+    The entity tag of a page is computed from the versions of the page only, and streamed responses are not tagged, such that neither scans all versions.
+    """
+    client = create_app().test_client()
+    with patch.object(taskblueprint, 'controller') as taskcontroller, patch.object(userblueprint, 'controller') as usercontroller:
+        taskcontroller.get_tasks_of_user_page_versions.return_value = TASK
+        taskcontroller.get_tasks_of_user_page.return_value = {'data': [], 'next': None}
+        usercontroller.get_page_versions.return_value = TASK
+        usercontroller.get_page.return_value = {'data': [], 'next': None}
+        taskcontroller.get_tasks_of_user_iter.return_value = iter([])
+        usercontroller.get_all_iter.return_value = iter([])
+
+        after = '0' * 24
+        response = client.get(f'/tasks/ofuser/1?limit=2&after={after}')
+        assert 'ETag' in response.headers
+        taskcontroller.get_tasks_of_user_page_versions.assert_called_once_with('1', limit=2, after=after)
+        assert client.get('/users/all?limit=2').headers['ETag'] != ''
+        usercontroller.get_page_versions.assert_called_once_with(limit=2, after=None)
+
+        assert 'ETag' not in client.get('/tasks/ofuser/1?stream=ndjson').headers
+        assert 'ETag' not in client.get('/users/all?stream=ndjson').headers
+
+        taskcontroller.get_tasks_of_user_versions.assert_not_called()
+        usercontroller.get_all_versions.assert_not_called()
+
+@pytest.mark.unit
+def test_single_documents_are_tagged_by_the_returned_document():
+    """
+    The entity tag of a single document is derived from the document of the response, which is read only once (e.g., from the document cache).
+    """
+    client = create_app().test_client()
+    with patch.object(taskblueprint, 'controller') as taskcontroller, patch.object(userblueprint, 'controller') as usercontroller:
+        taskcontroller.get.return_value = TASK[0]
+        usercontroller.get.return_value = {'_id': {'$oid': '1'}, '_version': 1, 'firstName': 'Jane'}
+
+        etag = client.get('/tasks/byid/1').headers['ETag'].strip('"')
+        response = client.get('/tasks/byid/1', headers={'If-None-Match': f'"{etag}"'})
+        assert response.status_code == 304
+        assert taskcontroller.get.call_count == 2
+
+        etag = client.get('/users/1').headers['ETag']
+        usercontroller.get.return_value = dict(usercontroller.get.return_value, _version=2)
+        response = client.get('/users/1', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert usercontroller.get.call_count == 2
+
+@pytest.mark.unit
+def test_etag_of_raw_documents():
+    task = RawBSONDocument(bson.encode({'_id': ObjectId(), '_version': 1, 'todos': [{'_id': ObjectId(), '_version': 4}]}))
+    converted = {'_id': {'$oid': str(task['_id'])}, '_version': 1, 'todos': [{'_id': {'$oid': str(task['todos'][0]['_id'])}, '_version': 4}]}
+
+    with app.test_request_context('/tasks/byid/1'):
+        assert computeETag([task], request) == computeETag([converted], request)
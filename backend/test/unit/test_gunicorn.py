@@ -0,0 +1,35 @@
+"""
+Unit tests for the configuration of the production server (backend/gunicorn.conf.py).
+"""
+
+import os
+import runpy
+import pytest
+
+# the configuration file is located in the backend folder, independent of the working directory of the test run
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'gunicorn.conf.py')
+
+@pytest.mark.unit
+def test_concurrency_from_environment(monkeypatch):
+    monkeypatch.setenv('GUNICORN_WORKERS', '3')
+    monkeypatch.setenv('GUNICORN_THREADS', '8')
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'gevent')
+    monkeypatch.setenv('PORT', '5001')
+
+    config = runpy.run_path(CONFIG)
+
+    assert config['workers'] == 3
+    assert config['threads'] == 8
+    assert config['worker_class'] == 'gevent'
+    assert config['bind'].endswith(':5001')
+
+@pytest.mark.unit
+def test_one_worker_per_core(monkeypatch):
+    monkeypatch.delenv('GUNICORN_WORKERS', raising=False)
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+
+    config = runpy.run_path(CONFIG)
+
+    assert config['workers'] == config['cores']()
+    assert config['worker_class'] == 'gthread'
+    assert config['graceful_timeout'] == 30
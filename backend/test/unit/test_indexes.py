@@ -0,0 +1,43 @@
+"""
+Unit tests for the declarative index definitions (backend/src/util/indexes.py) with a mocked pymongo collection.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.util.indexes import ensureIndexes
+
+SPECS = [
+    {'name': 'email_1', 'keys': [['email', 1]]},
+    {'name': 'expires_1', 'keys': [['expires', 1]], 'expireAfterSeconds': 3600}
+]
+
+@pytest.fixture
+def collection():
+    return MagicMock()
+
+@pytest.mark.unit
+@patch('src.util.indexes.getIndexes', return_value=SPECS)
+def test_missing_indexes_are_created(mockedgetindexes, collection):
+    collection.index_information.return_value = {'_id_': {'key': [('_id', 1)]}}
+
+    report = ensureIndexes(collection, 'user')
+
+    assert report == {'created': ['email_1', 'expires_1'], 'drifted': [], 'undeclared': []}
+    collection.create_index.assert_any_call([('email', 1)], name='email_1')
+    collection.create_index.assert_any_call([('expires', 1)], name='expires_1', expireAfterSeconds=3600)
+
+@pytest.mark.unit
+@patch('src.util.indexes.getIndexes', return_value=SPECS)
+def test_existing_indexes_are_compared(mockedgetindexes, collection):
+    collection.index_information.return_value = {
+        '_id_': {'key': [('_id', 1)]},
+        'email_1': {'key': [('email', 1)]},
+        'expires_1': {'key': [('expires', 1)], 'expireAfterSeconds': 60},
+        'title_1': {'key': [('title', 1)]}
+    }
+
+    report = ensureIndexes(collection, 'user')
+
+    assert report == {'created': [], 'drifted': ['expires_1'], 'undeclared': ['title_1']}
+    collection.create_index.assert_not_called()
@@ -0,0 +1,173 @@
+"""
+Unit tests for the deletion of users in the background (backend/src/controllers/jobcontroller.py) with mocked data access objects.
+"""
+
+import threading
+from datetime import timedelta
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from bson.objectid import ObjectId
+
+from src.controllers.jobcontroller import JobController
+from src.controllers.usercontroller import UserController
+
+@pytest.fixture
+def daos():
+    return {name: MagicMock() for name in ['jobs_dao', 'users_dao', 'taskcontroller']}
+
+@pytest.fixture
+def controller(daos):
+    return JobController(**daos)
+
+@pytest.fixture(autouse=True)
+def session():
+    # execute the writes in a mocked transaction
+    session = MagicMock()
+    with patch('src.controllers.jobcontroller.runInTransaction', side_effect=lambda func: func(session)):
+        yield session
+
+def oid():
+    return {'$oid': str(ObjectId())}
+
+@pytest.mark.unit
+def test_delete_user_in_one_transaction(controller, daos, session):
+    userid = str(ObjectId())
+    daos['users_dao'].findOne.return_value = {'_id': {'$oid': userid}}
+    daos['taskcontroller'].delete_of_user.return_value = 3
+
+    assert controller.delete_user(userid) == 3
+
+    daos['taskcontroller'].delete_of_user.assert_called_once_with(userid, session=session)
+    daos['users_dao'].delete.assert_called_once_with(userid, session=session)
+
+@pytest.mark.unit
+def test_delete_missing_user(controller, daos):
+    daos['users_dao'].findOne.return_value = None
+
+    assert controller.delete_user(str(ObjectId())) is None
+    daos['users_dao'].delete.assert_not_called()
+
+@pytest.mark.unit
+def test_start_user_deletion_marks_user_and_queues_job(controller, daos):
+    """
+    The user is marked as deleted and a job is queued, but no task is deleted before the worker executes the job.
+    """
+    userid = str(ObjectId())
+    job = {'_id': oid()}
+    daos['users_dao'].findOneAndUpdate.return_value = {'_id': {'$oid': userid}, 'tasks': [oid(), oid()]}
+    daos['jobs_dao'].create.return_value = job
+
+    with patch.object(controller, 'startWorker') as startworker:
+        assert controller.start_user_deletion(userid) == job
+
+    assert 'deleted' in daos['users_dao'].findOneAndUpdate.call_args.args[1]['$set']
+    created = daos['jobs_dao'].create.call_args.args[0]
+    assert (created['status'], created['total'], created['deleted']) == ('pending', 2, 0)
+    assert controller.jobs.get_nowait() == job['_id']['$oid']
+    startworker.assert_called_once()
+    daos['taskcontroller'].delete_many.assert_not_called()
+
+@pytest.mark.unit
+def test_start_deletion_of_missing_user(controller, daos):
+    daos['users_dao'].findOneAndUpdate.return_value = None
+
+    assert controller.start_user_deletion(str(ObjectId())) is None
+    daos['jobs_dao'].create.assert_not_called()
+
+@pytest.mark.unit
+def test_purge_deletes_tasks_in_batches(controller, daos, session, monkeypatch):
+    """
+    The tasks are deleted in batches, each together with the removal of its references from the user and the progress of the job.
+    """
+    monkeypatch.setenv('PURGE_BATCH_SIZE', '2')
+    userid = str(ObjectId())
+    jobid = str(ObjectId())
+    batches = [[oid(), oid()], [oid()], []]
+    daos['jobs_dao'].update_many.return_value = 1
+    daos['jobs_dao'].findOne.return_value = {'_id': {'$oid': jobid}, 'target': {'$oid': userid}}
+    daos['users_dao'].findOne.side_effect = [{'_id': {'$oid': userid}, 'tasks': batch} for batch in batches]
+    daos['taskcontroller'].delete_many.side_effect = lambda tasks, session: len(tasks)
+
+    assert controller.purge(jobid) is True
+
+    assert [call.args[0] for call in daos['taskcontroller'].delete_many.call_args_list] == batches[:2]
+    assert daos['users_dao'].findOne.call_args.kwargs['projection']['tasks'] == {'$slice': 2}
+    assert daos['users_dao'].update.call_count == 2
+    daos['users_dao'].delete.assert_called_once_with(userid)
+    updates = daos['jobs_dao'].update.call_args_list
+    assert [call.args[1]['$inc'] for call in updates[:2]] == [{'deleted': 2}, {'deleted': 1}]
+    assert all('heartbeat' in call.args[1]['$set'] and call.kwargs['session'] is session for call in updates[:2])
+    assert updates[2].args[1]['$set']['status'] == 'done'
+
+@pytest.mark.unit
+def test_purge_claims_job_once(controller, daos):
+    daos['jobs_dao'].update_many.return_value = 0
+
+    assert controller.purge(str(ObjectId())) is False
+    daos['taskcontroller'].delete_many.assert_not_called()
+
+@pytest.mark.unit
+def test_purge_claims_pending_and_abandoned_jobs(controller, daos, monkeypatch):
+    """
+    A job can be claimed while it is pending, or while it is running without a renewal of its lease within JOB_LEASE_SECONDS.
+    """
+    monkeypatch.setenv('JOB_LEASE_SECONDS', '30')
+    daos['jobs_dao'].update_many.return_value = 0
+
+    controller.purge(str(ObjectId()))
+
+    update, filter = daos['jobs_dao'].update_many.call_args.args[1], daos['jobs_dao'].update_many.call_args.kwargs['filter']
+    now = update['$set']['heartbeat']
+    assert update['$set']['status'] == 'running'
+    assert filter == {'$or': [{'status': 'pending'}, {'status': 'running', 'heartbeat': {'$lt': now - timedelta(seconds=30)}}]}
+
+@pytest.mark.unit
+def test_recover_queues_claimable_jobs(controller, daos):
+    jobs = [oid(), oid()]
+    daos['jobs_dao'].find.return_value = [{'_id': job} for job in jobs]
+
+    assert controller.recover() == 2
+
+    assert '$or' in daos['jobs_dao'].find.call_args.kwargs['filter']
+    assert [controller.jobs.get_nowait() for _ in jobs] == [job['$oid'] for job in jobs]
+
+@pytest.mark.unit
+def test_worker_recovers_jobs_on_start(controller, daos, monkeypatch):
+    """
+    The worker claims the jobs abandoned by other processes when it starts, without a new deletion request.
+    """
+    monkeypatch.setenv('JOB_LEASE_SECONDS', '0.05')
+    job = oid()
+    abandoned = [[{'_id': job}]]
+    daos['jobs_dao'].find.side_effect = lambda **kwargs: abandoned.pop() if abandoned else []
+    purged = threading.Event()
+
+    with patch.object(controller, 'purge', side_effect=lambda jobid: purged.set()) as purge:
+        controller.startWorker()
+        assert purged.wait(5)
+    purge.assert_called_once_with(job['$oid'])
+
+@pytest.mark.unit
+def test_purge_records_failure(controller, daos):
+    daos['jobs_dao'].update_many.return_value = 1
+    daos['jobs_dao'].findOne.return_value = {'_id': oid(), 'target': oid()}
+    daos['users_dao'].findOne.return_value = {'_id': oid(), 'tasks': [oid()]}
+    daos['taskcontroller'].delete_many.side_effect = RuntimeError('connection lost')
+
+    with pytest.raises(RuntimeError):
+        controller.purge(str(ObjectId()))
+
+    update = daos['jobs_dao'].update.call_args.args[1]['$set']
+    assert (update['status'], update['error']) == ('failed', 'RuntimeError: connection lost')
+
+@pytest.mark.unit
+def test_users_marked_as_deleted_are_hidden():
+    dao = MagicMock()
+    dao.findOne.return_value = {'_id': oid(), 'email': 'deleted@example.com', 'deleted': {'$date': 0}}
+    usercontroller = UserController(dao)
+
+    assert usercontroller.get(str(ObjectId())) is None
+    usercontroller.get_all()
+    assert dao.find.call_args.kwargs['filter'] == {'deleted': {'$exists': False}}
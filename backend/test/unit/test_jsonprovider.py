@@ -0,0 +1,66 @@
+"""
+Unit tests for the JSON provider which serializes raw MongoDB documents (backend/src/util/jsonprovider.py).
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from bson.objectid import ObjectId
+from flask import Flask
+
+from src.util import jsonprovider
+from src.util.converter import toJson
+from src.util.jsonprovider import BSONJSONProvider
+
+DOCUMENT = {
+    '_id': ObjectId('6442b6f4a4f6f2e1c4a1b2c3'),
+    'title': 'Videos',
+    'startdate': datetime(2023, 4, 21, 10, 0, 0, 123000, tzinfo=timezone.utc),
+    'todos': [{'_id': ObjectId('6442b6f4a4f6f2e1c4a1b2c4'), 'done': False, 'points': 1.5}],
+    'video': None
+}
+
+@pytest.fixture
+def app(monkeypatch):
+    def create(mode: str, orjson: bool = True):
+        monkeypatch.setenv('JSON_BSON_MODE', mode)
+        if not orjson:
+            monkeypatch.setattr(jsonprovider, 'orjson', None)
+        app = Flask(__name__)
+        app.json = BSONJSONProvider(app)
+        return app
+    return create
+
+@pytest.mark.unit
+@pytest.mark.parametrize('orjson', [True, False])
+def test_extended_mode_matches_converter(app, orjson):
+    app = app('extended', orjson)
+    with app.app_context():
+        assert json.loads(app.json.dumps(DOCUMENT)) == toJson(DOCUMENT)
+
+@pytest.mark.unit
+@pytest.mark.parametrize('orjson', [True, False])
+def test_native_mode_uses_strings(app, orjson):
+    app = app('native', orjson)
+    with app.app_context():
+        obj = json.loads(app.json.dumps(DOCUMENT))
+    assert obj['_id'] == '6442b6f4a4f6f2e1c4a1b2c3'
+    assert obj['todos'][0]['_id'] == '6442b6f4a4f6f2e1c4a1b2c4'
+    assert obj['startdate'] == '2023-04-21T10:00:00.123000+00:00'
+
+@pytest.mark.unit
+@pytest.mark.parametrize('orjson', [True, False])
+def test_response_of_raw_documents(app, orjson):
+    app = app('extended', orjson)
+    with app.app_context():
+        response = app.json.response([DOCUMENT])
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == [toJson(DOCUMENT)]
+
+@pytest.mark.unit
+def test_converted_documents_are_unchanged(app):
+    app = app('extended')
+    converted = toJson(DOCUMENT)
+    with app.app_context():
+        assert json.loads(app.json.dumps(converted)) == converted
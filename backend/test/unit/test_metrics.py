@@ -0,0 +1,64 @@
+"""
+Unit tests for the request and database command metrics (backend/src/util/metrics.py).
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from flask import Flask, jsonify
+
+from src.util.metrics import Histogram, CommandMetricsListener, getMetrics, initMetrics
+
+@pytest.fixture
+def metrics():
+    metrics = getMetrics()
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+@pytest.fixture
+def client(metrics):
+    app = Flask(__name__)
+    initMetrics(app)
+    listener = CommandMetricsListener(metrics)
+
+    @app.route('/tasks/byid/<id>')
+    def get_task(id):
+        # simulate two database commands executed while serving the request
+        listener.succeeded(MagicMock(command_name='aggregate', duration_micros=1500))
+        listener.failed(MagicMock(command_name='find', duration_micros=500))
+        return jsonify({'id': id})
+
+    return app.test_client()
+
+@pytest.mark.unit
+def test_histogram_is_cumulative():
+    histogram = Histogram(buckets=[0.1, 1])
+    for value in [0.05, 0.1, 0.5, 3]:
+        histogram.observe(value)
+    assert histogram.cumulative() == [(0.1, 2), (1, 3), ('+Inf', 4)]
+    assert histogram.sum == pytest.approx(3.65)
+
+@pytest.mark.unit
+def test_requests_are_recorded_per_route(client, metrics):
+    client.get('/tasks/byid/1')
+    client.get('/tasks/byid/2')
+    client.get('/missing')
+    text = metrics.render()
+
+    assert 'edutask_http_requests_total{method="GET",route="/tasks/byid/<id>",status="200"} 2' in text
+    assert 'edutask_http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'edutask_http_request_duration_seconds_count{method="GET",route="/tasks/byid/<id>"} 2' in text
+
+@pytest.mark.unit
+def test_commands_are_attributed_to_route(client, metrics):
+    client.get('/tasks/byid/1')
+    text = metrics.render()
+
+    assert 'edutask_mongo_commands_total{route="/tasks/byid/<id>",command="aggregate"} 1' in text
+    assert 'edutask_mongo_command_failures_total{route="/tasks/byid/<id>",command="find"} 1' in text
+    assert 'edutask_mongo_command_seconds_total{route="/tasks/byid/<id>",command="aggregate"} 0.0015' in text
+
+@pytest.mark.unit
+def test_commands_outside_requests(metrics):
+    CommandMetricsListener(metrics).succeeded(MagicMock(command_name='ping', duration_micros=100))
+    assert 'edutask_mongo_commands_total{route="none",command="ping"} 1' in metrics.render()
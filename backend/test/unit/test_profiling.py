@@ -0,0 +1,112 @@
+"""
+Unit tests for the opt-in profiling of single requests (backend/src/util/profiling.py).
+"""
+
+import os
+import cProfile
+import threading
+import pytest
+from flask import Flask, jsonify
+
+from src.util import profiling
+from src.util.profiling import initProfiling
+
+def slowsum(n: int):
+    return sum(range(n))
+
+@pytest.fixture
+def create_client(monkeypatch, tmp_path):
+    entered = threading.Event()
+    release = threading.Event()
+
+    def create(enabled: bool = True, token: str = None):
+        monkeypatch.setenv('PROFILING', 'on' if enabled else 'off')
+        monkeypatch.setenv('PROFILING_DIR', str(tmp_path))
+        monkeypatch.setenv('PROFILING_LIMIT', '1000')
+        if token is not None:
+            monkeypatch.setenv('ADMIN_TOKEN', token)
+        else:
+            monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+
+        app = Flask(__name__)
+        initProfiling(app)
+
+        @app.route('/sum')
+        def sync_sum():
+            return jsonify({'sum': slowsum(1000)})
+
+        @app.route('/wait')
+        def wait():
+            # keeps the request in progress until the test releases it
+            entered.set()
+            release.wait(5)
+            return jsonify({'sum': slowsum(1000)})
+
+        client = app.test_client()
+        client.entered, client.release = entered, release
+        return client
+    return create
+
+@pytest.mark.unit
+def test_inline_profile(create_client):
+    client = create_client()
+    response = client.get('/sum', headers={'X-Profile': 'inline'})
+    assert response.mimetype == 'text/plain'
+    assert response.headers['X-Profile-Status'] == '200'
+    assert 'slowsum' in response.get_data(as_text=True)
+
+@pytest.mark.unit
+def test_profile_file(create_client, tmp_path):
+    client = create_client()
+    response = client.get('/sum?profile=file')
+    assert response.get_json() == {'sum': 499500}
+    path = response.headers['X-Profile-File']
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.getsize(path) > 0
+
+@pytest.mark.unit
+def test_concurrent_requests_share_one_profiler(create_client):
+    """
+    While a request is being profiled, another request asking to be profiled is served without profile instead of
+    starting a second profiler, and the profiler is available again afterwards.
+    """
+    client = create_client()
+    responses = []
+    first = threading.Thread(target=lambda: responses.append(client.get('/wait', headers={'X-Profile': 'inline'})))
+    first.start()
+    try:
+        assert client.entered.wait(5)
+        response = client.get('/sum', headers={'X-Profile': 'inline'})
+    finally:
+        client.release.set()
+        first.join(5)
+
+    assert response.get_json() == {'sum': 499500}
+    assert 'X-Profile-Skipped' in response.headers
+    assert responses[0].headers['X-Profile-Status'] == '200'
+    assert client.get('/sum', headers={'X-Profile': 'inline'}).mimetype == 'text/plain'
+
+@pytest.mark.unit
+def test_request_is_served_if_another_profiler_is_active(create_client, monkeypatch):
+    def enable(self):
+        raise ValueError('Another profiling tool is already active')
+    monkeypatch.setattr(profiling.cProfile, 'Profile', type('Profile', (cProfile.Profile,), {'enable': enable}))
+    client = create_client()
+
+    response = client.get('/sum', headers={'X-Profile': 'inline'})
+    assert response.get_json() == {'sum': 499500}
+    assert response.headers['X-Profile-Skipped'] == 'Another profiling tool is already active'
+    assert not profiling.profilerlock.locked()
+
+@pytest.mark.unit
+def test_profiling_disabled(create_client):
+    client = create_client(enabled=False)
+    response = client.get('/sum', headers={'X-Profile': 'inline'})
+    assert response.get_json() == {'sum': 499500}
+    assert 'X-Profile-File' not in response.headers
+
+@pytest.mark.unit
+def test_profiling_requires_admin_token(create_client):
+    client = create_client(token='secret')
+    assert client.get('/sum', headers={'X-Profile': 'inline'}).mimetype == 'application/json'
+    assert client.get('/sum', headers={'X-Profile': 'inline', 'X-Admin-Token': 'secret'}).mimetype == 'text/plain'
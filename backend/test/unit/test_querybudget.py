@@ -0,0 +1,62 @@
+"""
+Unit tests for the query budgets (backend/src/util/querybudget.py) with simulated command events.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.util.querybudget import register, QueryBudgetExceeded
+from src.util.explain import stages
+
+def command(name: str, collection: str = 'task', **fields):
+    return MagicMock(command_name=name, database_name='edutask', command=dict({name: collection, 'lsid': {}, '$db': 'edutask'}, **fields))
+
+@pytest.mark.unit
+def test_within_budget(query_budget):
+    with query_budget(2) as budget:
+        register().started(command('aggregate', 'user'))
+        register().started(command('endSessions'))
+    assert budget.summary() == ['aggregate user']
+
+@pytest.mark.unit
+def test_budget_exceeded(query_budget):
+    with pytest.raises(QueryBudgetExceeded, match='3 database commands issued, but the budget allows 2'):
+        with query_budget(2):
+            for i in range(3):
+                register().started(command('find', filter={'_id': i}))
+
+@pytest.mark.unit
+def test_commands_outside_budget_are_not_recorded(query_budget):
+    register().started(command('find'))
+    with query_budget(0) as budget:
+        pass
+    assert budget.commands == []
+
+@pytest.mark.unit
+def test_collection_scan_fails(query_budget):
+    database = MagicMock()
+    database.command.return_value = {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}, 'rejectedPlans': []}}
+
+    with pytest.raises(QueryBudgetExceeded, match='not backed by an index'):
+        with query_budget(1, explain=True, database=database):
+            register().started(command('find', filter={'description': 'x'}))
+
+    explained = database.command.call_args.args[0]['explain']
+    assert explained == {'find': 'task', 'filter': {'description': 'x'}}
+
+@pytest.mark.unit
+def test_index_scan_passes(query_budget):
+    database = MagicMock()
+    database.command.return_value = {'stages': [{'$cursor': {'queryPlanner': {
+        'winningPlan': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN'}},
+        'rejectedPlans': [{'stage': 'COLLSCAN'}]}}}]}
+
+    with query_budget(1, explain=True, database=database):
+        register().started(command('aggregate', pipeline=[{'$match': {'tasks': 1}}], cursor={}))
+
+    assert database.command.call_args.args[0]['explain']['cursor'] == {}
+
+@pytest.mark.unit
+def test_stages_of_winning_plan_only():
+    plan = {'queryPlanner': {'winningPlan': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN'}}, 'rejectedPlans': [{'stage': 'COLLSCAN'}]}}
+    assert stages(plan) == {'FETCH', 'IXSCAN'}
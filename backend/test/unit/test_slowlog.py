@@ -0,0 +1,109 @@
+"""
+Unit tests for the slow operation log (backend/src/util/slowlog.py) with simulated command events.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from bson.objectid import ObjectId
+from flask import Flask
+
+from src.blueprints.monitorblueprint import monitor_blueprint
+
+from src.util import slowlog as slowlogmodule
+from src.util.slowlog import SlowLog, getShape, summarizePlan
+
+def execute(slowlog, name: str, document: dict, duration: int, reply: dict = None, request_id: int = 1):
+    """Simulate the started and succeeded events of a command taking duration milliseconds."""
+    slowlog.started(MagicMock(command_name=name, connection_id=('localhost', 27017), request_id=request_id, command=document))
+    slowlog.succeeded(MagicMock(command_name=name, connection_id=('localhost', 27017), request_id=request_id,
+        database_name='edutask', duration_micros=duration * 1000, reply=reply or {}))
+
+@pytest.fixture
+def slowlog():
+    return SlowLog(threshold=50, size=3, verbosity='none')
+
+@pytest.mark.unit
+def test_fast_commands_are_not_recorded(slowlog):
+    execute(slowlog, 'find', {'find': 'task', 'filter': {}}, 10)
+    assert slowlog.getEntries() == []
+    assert slowlog.started_commands == {}
+
+@pytest.mark.unit
+def test_slow_command_is_recorded(slowlog):
+    id = ObjectId()
+    execute(slowlog, 'find', {'find': 'task', 'filter': {'_id': {'$in': [id]}}, 'lsid': {}}, 80,
+        reply={'cursor': {'firstBatch': [{}, {}], 'id': 0}})
+
+    entry = slowlog.getEntries()[0]
+    assert entry['collection'] == 'task'
+    assert entry['durationMs'] == 80
+    assert entry['counts'] == {'returned': 2}
+    assert entry['shape'] == {'filter': {'_id': {'$in': '?'}}}
+    assert entry['route'] == 'none'
+
+@pytest.mark.unit
+def test_values_are_not_recorded(slowlog):
+    with patch.object(slowlogmodule, 'logger') as logger:
+        execute(slowlog, 'find', {'find': 'user', 'filter': {'email': 'jane.doe@example.com', 'lastName': '$Doe'}}, 80)
+
+    entry = slowlog.getEntries()[0]
+    assert entry['shape'] == {'filter': {'email': '?', 'lastName': '?'}}
+    assert 'jane.doe' not in str(entry) and 'Doe' not in str(entry)
+    assert 'jane.doe' not in logger.warning.call_args.args[0]
+
+@pytest.mark.unit
+def test_ring_buffer_is_bounded(slowlog):
+    for i in range(5):
+        execute(slowlog, 'find', {'find': 'task', 'filter': {}}, 60 + i, request_id=i)
+    assert [entry['durationMs'] for entry in slowlog.getEntries()] == [64, 63, 62]
+
+@pytest.mark.unit
+def test_shapes_group_by_values(slowlog):
+    execute(slowlog, 'find', {'find': 'user', 'filter': {'email': 'a@b.c'}}, 60, request_id=1)
+    execute(slowlog, 'find', {'find': 'user', 'filter': {'email': 'd@e.f'}}, 70, request_id=2)
+    execute(slowlog, 'aggregate', {'aggregate': 'user', 'pipeline': [{'$match': {'_id': 1}}]}, 100, request_id=3)
+
+    shapes = slowlog.getShapes()
+    assert [(shape['command'], shape['count'], shape['totalMs']) for shape in shapes] == [('find', 2, 130), ('aggregate', 1, 100)]
+    assert shapes[0]['shape'] == {'filter': {'email': '?'}}
+
+@pytest.mark.unit
+def test_explain_is_captured_in_background():
+    slowlog = SlowLog(threshold=50, verbosity='queryPlanner')
+    database = MagicMock()
+    database.command.return_value = {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}}
+
+    with patch.object(slowlogmodule, 'getClient', return_value={'edutask': database}):
+        execute(slowlog, 'find', {'find': 'task', 'filter': {'title': 'x'}}, 60)
+        slowlog.explains.join()
+
+    assert slowlog.getEntries()[0]['plan'] == {'stages': ['COLLSCAN']}
+    assert database.command.call_args.args[0] == {'explain': {'find': 'task', 'filter': {'title': 'x'}}, 'verbosity': 'queryPlanner'}
+
+@pytest.mark.unit
+def test_shape_keeps_structure():
+    pipeline = [{'$match': {'_id': {'$in': [1, 2]}}}, {'$addFields': {'video': {'$arrayElemAt': ['$video', 0]}}}]
+    assert getShape(pipeline) == [{'$match': {'_id': {'$in': '?'}}}, {'$addFields': {'video': {'$arrayElemAt': '?'}}}]
+
+@pytest.mark.unit
+def test_summarize_execution_stats():
+    plan = {'queryPlanner': {'winningPlan': {'stage': 'IXSCAN'}}, 'executionStats': {'nReturned': 1, 'totalDocsExamined': 1, 'totalKeysExamined': 1, 'executionStages': {}}}
+    assert summarizePlan(plan) == {'stages': ['IXSCAN'], 'nReturned': 1, 'totalDocsExamined': 1, 'totalKeysExamined': 1}
+
+@pytest.mark.unit
+@pytest.mark.parametrize('token, header, status', [(None, None, 403), (None, 'secret', 403), ('secret', None, 403), ('secret', 'wrong', 403), ('secret', 'secret', 200)])
+def test_slowops_require_admin_token(token, header, status, monkeypatch):
+    """
+    The slow operations are only listed with the configured admin token, and not at all while no token is configured.
+    """
+    if token is not None:
+        monkeypatch.setenv('ADMIN_TOKEN', token)
+    else:
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    app = Flask(__name__)
+    app.register_blueprint(monitor_blueprint)
+
+    with patch('src.blueprints.monitorblueprint.getSlowLog', return_value=SlowLog(threshold=50, verbosity='none')):
+        response = app.test_client().get('/admin/slowops', headers={'X-Admin-Token': header} if header else {})
+    assert response.status_code == status
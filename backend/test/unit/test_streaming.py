@@ -0,0 +1,40 @@
+"""
+Unit tests for the newline-delimited JSON streaming helpers (backend/src/util/streaming.py).
+"""
+
+import json
+import pytest
+from flask import Flask, request
+
+from src.util.streaming import wantsStream, ndjsonResponse
+
+app = Flask(__name__)
+
+@pytest.mark.unit
+@pytest.mark.parametrize('path, headers, expected', [
+    ('/', {}, False),
+    ('/?stream=ndjson', {}, True),
+    ('/', {'Accept': 'application/x-ndjson'}, True),
+    ('/', {'Accept': 'application/json'}, False),
+    ('/', {'Accept': '*/*'}, False)
+])
+def test_wants_stream(path, headers, expected):
+    with app.test_request_context(path, headers=headers):
+        assert wantsStream(request) == expected
+
+@pytest.mark.unit
+def test_ndjson_response_streams_one_object_per_line():
+    produced = []
+    def objs():
+        for i in range(3):
+            produced.append(i)
+            yield {'_id': {'$oid': str(i)}}
+
+    with app.test_request_context('/'):
+        response = ndjsonResponse(objs())
+        assert produced == []
+
+        lines = ''.join(response.response).splitlines()
+
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line) for line in lines] == [{'_id': {'$oid': str(i)}} for i in range(3)]
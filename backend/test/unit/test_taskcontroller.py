@@ -0,0 +1,221 @@
+"""
+Unit tests for the task controller (backend/src/controllers/taskcontroller.py) with mocked data access objects.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from bson.objectid import ObjectId
+from pymongo.errors import WriteError
+
+from src.app import create_app
+from src.blueprints import taskblueprint
+from src.controllers.taskcontroller import TaskController
+
+@pytest.fixture
+def daos():
+    return {name: MagicMock() for name in ['tasks_dao', 'videos_dao', 'todos_dao', 'users_dao']}
+
+@pytest.fixture
+def controller(daos):
+    return TaskController(**daos)
+
+@pytest.fixture(autouse=True)
+def session():
+    # execute the writes of task creation in a mocked transaction
+    session = MagicMock()
+    with patch('src.controllers.taskcontroller.runInTransaction', side_effect=lambda func: func(session)):
+        yield session
+
+def oid():
+    return {'$oid': str(ObjectId())}
+
+@pytest.mark.unit
+def test_create_inserts_todos_in_bulk(controller, daos):
+    """
+    All todos of a new task are created with one bulk operation.
+    """
+    daos['videos_dao'].create.return_value = {'_id': oid(), 'url': 'dQw4w9WgXcQ'}
+    daos['todos_dao'].create_many.return_value = {'results': [{'_id': oid()}, {'_id': oid()}], 'errors': []}
+    daos['tasks_dao'].create.return_value = {'_id': oid()}
+
+    controller.create({'userid': str(ObjectId()), 'title': 't', 'description': 'd', 'url': 'dQw4w9WgXcQ', 'todos': ['a', 'b']})
+
+    daos['todos_dao'].create_many.assert_called_once()
+    daos['todos_dao'].create.assert_not_called()
+    assert len(daos['tasks_dao'].create.call_args.args[0]['todos']) == 2
+
+@pytest.mark.unit
+def test_create_writes_in_one_transaction(controller, daos, session):
+    """
+    All writes of the task creation are part of the same transaction, and only the id of the new task is returned.
+    """
+    taskid = oid()
+    daos['users_dao'].update_many.return_value = 1
+    daos['videos_dao'].create.return_value = {'_id': oid(), 'url': 'dQw4w9WgXcQ'}
+    daos['todos_dao'].create_many.return_value = {'results': [{'_id': oid()}], 'errors': []}
+    daos['tasks_dao'].create.return_value = {'_id': taskid}
+
+    assert controller.create({'userid': str(ObjectId()), 'title': 't', 'description': 'd', 'url': 'dQw4w9WgXcQ', 'todos': ['a']}) == taskid['$oid']
+
+    for write in [daos['users_dao'].findOne, daos['videos_dao'].create, daos['todos_dao'].create_many, daos['tasks_dao'].create, daos['users_dao'].update_many]:
+        assert write.call_args.kwargs['session'] is session
+    # the task is assigned to the user under the id it is created with
+    assert daos['users_dao'].update_many.call_args.args[1] == {'$push': {'tasks': daos['tasks_dao'].create.call_args.args[0]['_id']}}
+    daos['users_dao'].aggregate.assert_not_called()
+
+@pytest.mark.unit
+def test_create_raises_write_error_of_failing_todo(controller, daos):
+    daos['videos_dao'].create.return_value = {'_id': oid(), 'url': 'dQw4w9WgXcQ'}
+    daos['todos_dao'].create_many.return_value = {'results': [None], 'errors': [{'index': 0, 'code': 121, 'message': 'Document failed validation'}]}
+
+    with pytest.raises(WriteError):
+        controller.create({'userid': str(ObjectId()), 'title': 't', 'description': 'd', 'url': 'dQw4w9WgXcQ', 'todos': ['a']})
+
+@pytest.mark.unit
+def test_delete_of_user_deletes_in_bulk(controller, daos):
+    """
+    Deleting the tasks of a user requires one delete operation per collection, independent of the number of tasks.
+    """
+    tasks = [{'_id': oid(), 'video': oid(), 'todos': [oid(), oid()]} for _ in range(3)]
+    daos['users_dao'].findOne.return_value = {'_id': oid(), 'tasks': [task['_id'] for task in tasks]}
+    daos['tasks_dao'].find.return_value = tasks
+
+    assert controller.delete_of_user(str(ObjectId())) == 3
+
+    assert len(daos['videos_dao'].delete_many.call_args.args[0]) == 3
+    assert len(daos['todos_dao'].delete_many.call_args.args[0]) == 6
+    assert len(daos['tasks_dao'].delete_many.call_args.args[0]) == 3
+    daos['tasks_dao'].delete.assert_not_called()
+
+@pytest.mark.unit
+def test_get_tasks_of_user_is_one_aggregation(controller, daos):
+    """
+    The tasks of a user are populated server-side by one aggregation on the user collection.
+    """
+    daos['users_dao'].aggregate.return_value = [{'_id': oid(), 'video': {'_id': oid(), 'url': 'dQw4w9WgXcQ'}, 'todos': []}]
+
+    tasks = controller.get_tasks_of_user(str(ObjectId()))
+
+    assert tasks == daos['users_dao'].aggregate.return_value
+    pipeline = daos['users_dao'].aggregate.call_args.args[0]
+    assert [stage['$lookup']['as'] for stage in pipeline if '$lookup' in stage] == ['task', 'video', 'todos']
+    daos['videos_dao'].findOne.assert_not_called()
+    daos['todos_dao'].find.assert_not_called()
+
+@pytest.mark.unit
+def test_population_keeps_order_of_todos(controller):
+    """
+    The populated todos are arranged in the order of the todo ids of the task, which $lookup does not preserve.
+    """
+    stages = controller.population_stages()
+
+    assert stages[0] == {'$addFields': {'todoids': {'$ifNull': ['$todos', []]}}}
+    todos = stages[-2]['$addFields']['todos']['$map']
+    assert todos['input']['$filter']['input'] == '$todoids'
+    assert todos['in'] == {'$arrayElemAt': ['$todos', {'$indexOfArray': ['$todos._id', '$$id']}]}
+    assert stages[-1] == {'$unset': 'todoids'}
+
+@pytest.mark.unit
+@pytest.mark.parametrize('user', [None, {'_id': oid(), 'deleted': True}])
+def test_create_for_deleted_user_writes_nothing(controller, daos, user):
+    """
+    A task is only created for a user which exists and is not marked as deleted.
+    """
+    daos['users_dao'].findOne.return_value = user
+
+    assert controller.create({'userid': str(ObjectId()), 'title': 't', 'description': 'd', 'url': 'dQw4w9WgXcQ', 'todos': ['a']}) is None
+
+    daos['videos_dao'].create.assert_not_called()
+    daos['todos_dao'].create_many.assert_not_called()
+    daos['tasks_dao'].create.assert_not_called()
+    daos['users_dao'].update_many.assert_not_called()
+
+@pytest.mark.unit
+def test_create_for_user_deleted_meanwhile_removes_task(controller, daos):
+    """
+    The task is assigned to the user after it has been written, and removed again if the user has been marked as deleted in the meantime.
+    """
+    video, todo, task = oid(), oid(), oid()
+    daos['users_dao'].findOne.return_value = {'_id': oid()}
+    daos['users_dao'].update_many.return_value = 0
+    daos['videos_dao'].create.return_value = {'_id': video, 'url': 'dQw4w9WgXcQ'}
+    daos['todos_dao'].create_many.return_value = {'results': [{'_id': todo}], 'errors': []}
+    daos['tasks_dao'].create.return_value = {'_id': task}
+
+    assert controller.create({'userid': str(ObjectId()), 'title': 't', 'description': 'd', 'url': 'dQw4w9WgXcQ', 'todos': ['a']}) is None
+
+    assert daos['users_dao'].update_many.call_args.kwargs['filter'] == {'deleted': {'$exists': False}}
+    assert daos['videos_dao'].delete_many.call_args.args[0] == [video]
+    assert daos['todos_dao'].delete_many.call_args.args[0] == [todo]
+    assert daos['tasks_dao'].delete_many.call_args.args[0] == [task]
+
+@pytest.mark.unit
+def test_create_without_transaction_removes_partial_task(controller, daos):
+    """
+    Without transaction, the objects written before a failing write are deleted again and the user is not assigned the task.
+    """
+    video, todo = oid(), oid()
+    daos['users_dao'].findOne.return_value = {'_id': oid()}
+    daos['videos_dao'].create.return_value = {'_id': video, 'url': 'dQw4w9WgXcQ'}
+    daos['todos_dao'].create_many.return_value = {'results': [{'_id': todo}, None], 'errors': [{'index': 1, 'code': 121, 'message': 'Document failed validation'}]}
+
+    with patch('src.controllers.taskcontroller.runInTransaction', side_effect=lambda func: func(None)):
+        with pytest.raises(WriteError):
+            controller.create({'userid': str(ObjectId()), 'title': 't', 'description': 'd', 'url': 'dQw4w9WgXcQ', 'todos': ['a', 'b']})
+
+    assert daos['videos_dao'].delete_many.call_args.args[0] == [video]
+    assert daos['todos_dao'].delete_many.call_args.args[0] == [todo]
+    daos['tasks_dao'].create.assert_not_called()
+    daos['users_dao'].update_many.assert_not_called()
+
+@pytest.mark.unit
+@pytest.mark.parametrize('read', ['get_tasks_of_user', 'get_tasks_of_user_versions', 'get_tasks_of_user_iter', 'get_tasks_of_user_page', 'get_tasks_of_user_page_versions'])
+def test_tasks_of_deleted_user_are_not_read(controller, daos, read):
+    id = str(ObjectId())
+    args = {'limit': 2} if 'page' in read else {}
+
+    getattr(controller, read)(id, **args)
+
+    pipeline = (daos['users_dao'].aggregate.call_args or daos['users_dao'].aggregateIter.call_args).args[0]
+    assert pipeline[0] == {'$match': {'_id': ObjectId(id), 'deleted': {'$exists': False}}}
+
+@pytest.mark.unit
+def test_get_tasks_of_user_page_returns_cursor(controller, daos):
+    tasks = [{'_id': oid()} for _ in range(3)]
+    daos['users_dao'].aggregate.return_value = tasks
+
+    page = controller.get_tasks_of_user_page(str(ObjectId()), limit=2, after=str(ObjectId()))
+
+    assert page == {'data': tasks[:2], 'next': tasks[1]['_id']['$oid']}
+    assert {'$limit': 3} in daos['users_dao'].aggregate.call_args.args[0]
+
+@pytest.mark.unit
+def test_get_tasks_of_user_page_versions_are_limited_to_page(controller, daos):
+    controller.get_tasks_of_user_page_versions(str(ObjectId()), limit=2, after=str(ObjectId()))
+
+    pipeline = daos['users_dao'].aggregate.call_args.args[0]
+    assert {'$limit': 3} in pipeline
+    assert '$project' in pipeline[-1]
+
+@pytest.mark.unit
+def test_get_many_in_order_of_ids(controller, daos):
+    """
+    Multiple tasks are populated with one aggregation and returned in the order of the requested ids.
+    """
+    first, second, missing = oid(), oid(), oid()
+    daos['tasks_dao'].aggregate.return_value = [{'_id': second}, {'_id': first}]
+
+    tasks = controller.get_many([first['$oid'], missing['$oid'], second['$oid']])
+
+    assert [task['_id'] for task in tasks] == [first, second]
+    daos['tasks_dao'].aggregate.assert_called_once()
+    match = daos['tasks_dao'].aggregate.call_args.args[0][0]
+    assert match == {'$match': {'_id': {'$in': [ObjectId(first['$oid']), ObjectId(missing['$oid']), ObjectId(second['$oid'])]}}}
+
+@pytest.mark.unit
+def test_create_route_for_deleted_user():
+    with patch.object(taskblueprint, 'controller') as controller:
+        controller.create.return_value = None
+        response = create_app().test_client().post('/tasks/create', data={'userid': str(ObjectId()), 'title': 't', 'description': 'd', 'url': 'dQw4w9WgXcQ'})
+    assert response.status_code == 404
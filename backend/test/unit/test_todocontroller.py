@@ -0,0 +1,91 @@
+"""
+Unit tests for the bulk todo operations of the todo controller (backend/src/controllers/todocontroller.py) with mocked
+data access objects.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from bson.objectid import ObjectId
+
+from src.controllers.todocontroller import TodoController
+
+IDS = [str(ObjectId()) for i in range(3)]
+
+@pytest.fixture
+def daos():
+    daos = {'todo_dao': MagicMock(), 'tasks_dao': MagicMock()}
+    daos['tasks_dao'].findOne.return_value = {'_id': {'$oid': 'task'}, 'todos': [{'$oid': id} for id in IDS]}
+    return daos
+
+@pytest.fixture
+def controller(daos):
+    return TodoController(**daos)
+
+@pytest.mark.unit
+def test_create_for_missing_task(controller, daos):
+    daos['tasks_dao'].findOne.return_value = None
+
+    assert controller.create({'description': 'a', 'taskid': str(ObjectId())}) is None
+    daos['todo_dao'].create.assert_not_called()
+
+@pytest.mark.unit
+def test_set_done_of_all_todos(controller, daos):
+    daos['todo_dao'].update_many.return_value = 2
+
+    assert controller.set_done('task', True) == 2
+    daos['todo_dao'].update_many.assert_called_once_with(IDS, {'$set': {'done': True}}, filter={'done': {'$ne': True}})
+
+@pytest.mark.unit
+def test_set_done_ignores_todos_of_other_tasks(controller, daos):
+    controller.set_done('task', False, ids=[IDS[2], str(ObjectId()), IDS[0]])
+    assert daos['todo_dao'].update_many.call_args.args[0] == [IDS[0], IDS[2]]
+
+@pytest.mark.unit
+def test_set_done_of_missing_task(controller, daos):
+    daos['tasks_dao'].findOne.return_value = None
+    assert controller.set_done('task', True) is None
+    daos['todo_dao'].update_many.assert_not_called()
+
+@pytest.mark.unit
+def test_clear_completed(controller, daos):
+    daos['todo_dao'].find.return_value = [{'_id': {'$oid': IDS[1]}}]
+    daos['todo_dao'].delete_many.return_value = 1
+
+    assert controller.clear_completed('task') == 1
+    assert daos['todo_dao'].find.call_args.kwargs['filter']['done'] is True
+    daos['todo_dao'].delete_many.assert_called_once_with([ObjectId(IDS[1])], filter={'done': True})
+    daos['tasks_dao'].update.assert_called_once_with(id='task', update_data={'$pull': {'todos': {'$in': [ObjectId(IDS[1])]}}})
+
+@pytest.mark.unit
+def test_clear_completed_keeps_todos_marked_as_undone(controller, daos):
+    """
+    A todo marked as undone between finding and deleting the completed todos is neither deleted nor removed from the task.
+    """
+    daos['todo_dao'].find.side_effect = [[{'_id': {'$oid': IDS[0]}}, {'_id': {'$oid': IDS[1]}}], [{'_id': {'$oid': IDS[1]}}]]
+    daos['todo_dao'].delete_many.return_value = 1
+
+    assert controller.clear_completed('task') == 1
+    daos['tasks_dao'].update.assert_called_once_with(id='task', update_data={'$pull': {'todos': {'$in': [ObjectId(IDS[0])]}}})
+
+@pytest.mark.unit
+def test_clear_completed_without_completed_todos(controller, daos):
+    daos['todo_dao'].find.return_value = []
+    assert controller.clear_completed('task') == 0
+    daos['todo_dao'].delete_many.assert_not_called()
+    daos['tasks_dao'].update.assert_not_called()
+
+@pytest.mark.unit
+def test_reorder_is_one_conditional_update(controller, daos):
+    daos['tasks_dao'].update_many.return_value = 1
+    order = [IDS[2], IDS[0], IDS[1]]
+
+    assert controller.reorder('task', order) is True
+    todos = [ObjectId(id) for id in order]
+    daos['tasks_dao'].update_many.assert_called_once_with(['task'], {'$set': {'todos': todos}}, filter={'todos': {'$all': todos, '$size': 3}})
+    daos['tasks_dao'].findOne.assert_not_called()
+
+@pytest.mark.unit
+def test_reorder_rejects_duplicates(controller):
+    with pytest.raises(ValueError):
+        controller.reorder('task', [IDS[0], IDS[0], IDS[1]])
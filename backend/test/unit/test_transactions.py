@@ -0,0 +1,102 @@
+"""
+Unit tests for the execution of operations in transactions (backend/src/util/transactions.py).
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from pymongo.errors import OperationFailure
+
+from src.util import transactions
+
+@pytest.fixture(autouse=True)
+def reset(monkeypatch):
+    monkeypatch.setattr(transactions, 'supported', None)
+    monkeypatch.delenv('TRANSACTIONS', raising=False)
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    session = client.start_session.return_value.__enter__.return_value
+    session.with_transaction.side_effect = lambda callback: callback(session)
+    with patch.object(transactions, 'getClient', return_value=client):
+        yield client
+
+@pytest.mark.unit
+def test_runs_function_with_session(client):
+    session = client.start_session.return_value.__enter__.return_value
+    func = MagicMock(return_value='id')
+
+    assert transactions.runInTransaction(func) == 'id'
+    func.assert_called_once_with(session)
+
+@pytest.mark.unit
+def test_falls_back_without_transaction_support(client):
+    """
+    On a server without transaction support, the function is executed without session, and no further transactions are attempted.
+    """
+    session = client.start_session.return_value.__enter__.return_value
+    session.with_transaction.side_effect = OperationFailure('Transaction numbers are only allowed on a replica set member or mongos', 20)
+    func = MagicMock(return_value='id')
+
+    assert transactions.runInTransaction(func) == 'id'
+    func.assert_called_once_with(None)
+
+    assert transactions.runInTransaction(func) == 'id'
+    client.start_session.assert_called_once()
+
+@pytest.mark.unit
+def test_raises_without_transaction_support_if_required(client, monkeypatch):
+    monkeypatch.setenv('TRANSACTIONS', 'on')
+    session = client.start_session.return_value.__enter__.return_value
+    session.with_transaction.side_effect = OperationFailure('Transaction numbers are only allowed on a replica set member or mongos', 20)
+
+    with pytest.raises(OperationFailure):
+        transactions.runInTransaction(MagicMock())
+
+@pytest.mark.unit
+def test_other_failures_are_raised(client):
+    session = client.start_session.return_value.__enter__.return_value
+    session.with_transaction.side_effect = OperationFailure('Document failed validation', 121)
+
+    with pytest.raises(OperationFailure):
+        transactions.runInTransaction(MagicMock())
+    assert transactions.supported is None
+
+@pytest.mark.unit
+def test_disabled_transactions(client, monkeypatch):
+    monkeypatch.setenv('TRANSACTIONS', 'off')
+    func = MagicMock(return_value='id')
+
+    assert transactions.runInTransaction(func) == 'id'
+    func.assert_called_once_with(None)
+    client.start_session.assert_not_called()
+
+@pytest.mark.unit
+def test_callbacks_run_after_commit(client):
+    """
+    Callbacks deferred within a transaction run after with_transaction has committed, and only those of the committed attempt.
+    """
+    events = []
+    session = client.start_session.return_value.__enter__.return_value
+
+    def with_transaction(callback):
+        # the first attempt is aborted by a transient error and retried
+        callback(session)
+        result = callback(session)
+        events.append('commit')
+        return result
+    session.with_transaction.side_effect = with_transaction
+
+    def func(session):
+        transactions.afterCommit(session, lambda: events.append('invalidate'))
+        return 'id'
+
+    assert transactions.runInTransaction(func) == 'id'
+    assert events == ['commit', 'invalidate']
+
+@pytest.mark.unit
+def test_callbacks_without_transaction_run_immediately():
+    events = []
+    transactions.afterCommit(None, lambda: events.append('invalidate'))
+    assert events == ['invalidate']
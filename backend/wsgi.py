@@ -0,0 +1,8 @@
+# coding=utf-8
+# entry point of production servers, e.g.: gunicorn --config gunicorn.conf.py wsgi:app
+from dotenv import load_dotenv
+load_dotenv()
+
+from src.app import create_app
+
+app = create_app()
@@ -34,29 +34,42 @@ function TaskDetail({ taskid, updateTasks }) {
     }
 
     /**
-     * Add a todo item to the list
-     * @param {*} e Event from the form submit
+     * Execute a todo operation and re-fetch the current task in one request to the batch endpoint
+     * @param {*} operation The todo operation (e.g., {op: 'todo.delete', id: ...})
      */
-    const addTodo = (e) => {
-        e.preventDefault();
-
+    const updateTodos = (operation) => {
         const data = new URLSearchParams();
-        data.append('taskid', task._id);
-        data.append('description', todo);
+        data.append('operations', JSON.stringify([operation, { op: 'task.get', id: task._id }]));
 
-        fetch(`http://localhost:${process.env.REACT_APP_BACKEND_PORT}/todos/create`, {
+        fetch(`http://localhost:${process.env.REACT_APP_BACKEND_PORT}/batch`, {
             method: 'post',
             body: data,
             headers: { 'Cache-Control': 'no-cache' }
         })
             .then(res => res.json())
-            .then(todoobj => updateTask())
+            .then(batch => {
+                const result = batch.results[1];
+                if (result.status === 200) {
+                    let converted = Converter.convertTask(result.data);
+                    setTask(converted);
+                    setTodos(converted.todos);
+                }
+            })
             .then(updateTasks())
             .catch(function (error) {
                 console.error(error)
             });
+    }
+
+    /**
+     * Add a todo item to the list
+     * @param {*} e Event from the form submit
+     */
+    const addTodo = (e) => {
+        e.preventDefault();
+
+        updateTodos({ op: 'todo.create', data: { taskid: task._id, description: todo } });
 
-        
         setTodo("");
     }
 
@@ -65,21 +78,7 @@ function TaskDetail({ taskid, updateTasks }) {
      * @param {*} todo Todo object which is toggled
      */
     const toggleTodo = (todo) => {
-        const data = new URLSearchParams();
-        data.append('data', `{'$set': {'done': ${!todo.done}}}`);
-
-        fetch(`http://localhost:${process.env.REACT_APP_BACKEND_PORT}/todos/byid/${todo._id}`, {
-            method: 'put',
-            body: data,
-            headers: { 'Cache-Control': 'no-cache' }
-        })
-            .then(res => res.json())
-            .then(() => updateTask())
-            .then(updateTasks())
-            .catch(function (error) {
-                console.error(error)
-            });
-
+        updateTodos({ op: 'todo.update', id: todo._id, data: { '$set': { done: !todo.done } } });
     }
 
     /**
@@ -87,17 +86,7 @@ function TaskDetail({ taskid, updateTasks }) {
      * @param {*} todo Todo object which is deleted
      */
     const deleteTodo = (todo) => {
-        fetch(`http://localhost:5001/todos/byid/${todo._id}`, {
-            method: 'delete',
-            headers: { 'Cache-Control': 'no-cache' }
-        })
-            .then(res => res.json())
-            .then(updateTask())
-            .then(updateTasks())
-            .catch(function (error) {
-                console.error(error)
-            });
-
+        updateTodos({ op: 'todo.delete', id: todo._id });
     }
 
     return (